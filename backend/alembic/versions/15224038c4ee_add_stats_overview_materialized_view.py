@@ -0,0 +1,105 @@
+"""add stats overview materialized view
+
+Revision ID: 15224038c4ee
+Revises: 335759c5b85b
+Create Date: 2026-10-19 11:26:05.731942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '15224038c4ee'
+down_revision: Union[str, Sequence[str], None] = '335759c5b85b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATALOG_TABLES = ('faqs', 'tags', 'faq_tags', 'question_variants')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Catalog version: bumped once per writing statement. nextval() is
+    # non-transactional, so concurrent writers never wait on each other.
+    op.execute("CREATE SEQUENCE catalog_version_seq")
+    op.execute("SELECT nextval('catalog_version_seq')")  # last_value is then always the current version
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_catalog_version_trg() RETURNS trigger AS $$
+        BEGIN
+            PERFORM nextval('catalog_version_seq');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in CATALOG_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_catalog_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION bump_catalog_version_trg()
+        """)
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW stats_overview_mv AS
+        SELECT
+            1 AS id,
+            (SELECT last_value FROM catalog_version_seq) AS catalog_version,
+            now() AS refreshed_at,
+            f.total_faqs,
+            f.active_faqs,
+            (SELECT count(*) FROM tags) AS total_tags,
+            (SELECT count(*) FROM question_variants) AS total_variants,
+            (
+                SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                    'tag_id', t.id,
+                    'name', t.name,
+                    'is_active', t.is_active,
+                    'total_faqs', COALESCE(c.total_faqs, 0),
+                    'active_faqs', COALESCE(c.active_faqs, 0),
+                    'inactive_faqs', COALESCE(c.total_faqs, 0) - COALESCE(c.active_faqs, 0)
+                ) ORDER BY t.display_order, t.name), '[]'::jsonb)
+                FROM tags t
+                LEFT JOIN (
+                    SELECT ft.tag_id,
+                           count(*) AS total_faqs,
+                           count(*) FILTER (WHERE fq.is_active) AS active_faqs
+                    FROM faq_tags ft
+                    JOIN faqs fq ON fq.id = ft.faq_id
+                    GROUP BY ft.tag_id
+                ) c ON c.tag_id = t.id
+            ) AS by_tag,
+            (
+                SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                    'id', top.id,
+                    'question', top.question,
+                    'usage_frequency', top.usage_frequency,
+                    'is_active', top.is_active
+                ) ORDER BY top.usage_frequency DESC, top.id), '[]'::jsonb)
+                FROM (
+                    SELECT id, question, usage_frequency, is_active
+                    FROM faqs
+                    ORDER BY usage_frequency DESC, id
+                    LIMIT 50
+                ) top
+            ) AS top_usage
+        FROM (
+            SELECT count(*) AS total_faqs,
+                   count(*) FILTER (WHERE is_active) AS active_faqs
+            FROM faqs
+        ) f
+        WITH DATA
+    """)
+    # Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('ix_stats_overview_mv_id', 'stats_overview_mv', ['id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS stats_overview_mv")
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_catalog_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_version_trg()")
+    op.execute("DROP SEQUENCE IF EXISTS catalog_version_seq")
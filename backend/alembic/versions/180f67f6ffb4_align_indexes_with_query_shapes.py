@@ -0,0 +1,120 @@
+"""align indexes with query shapes
+
+Revision ID: 180f67f6ffb4
+Revises: 15224038c4ee
+Create Date: 2026-10-19 13:04:52.119406
+
+Index audit against the queries in app/api/routes.py:
+
+- list_faqs orders by updated_at (optionally filtered by is_active) and
+  searches question/answer with ILIKE '%...%'; only trigram GIN indexes
+  can serve the latter.
+- the tag filter joins faq_tags on tag_id -> faq_id; selectinload(FAQ.tags)
+  looks up faq_tags by faq_id, which uq_faq_tag (faq_id, tag_id) already covers.
+- list_variants filters by faq_id and orders by is_representative DESC, created_at.
+- ix_*_id duplicate the primary keys, ix_faqs_question / ix_question_variants_question_text
+  are never used by an equality or prefix lookup, and boolean is_active indexes are
+  superseded by the composites below.
+- ix_faqs_usage_frequency is dropped so the usage flusher's UPDATEs can be HOT
+  (no indexed column changes); together with fillfactor 90 this keeps them off
+  every other index on faqs. Top-N by usage is only read by the stats view refresh.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '180f67f6ffb4'
+down_revision: Union[str, Sequence[str], None] = '15224038c4ee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEAD_INDEXES = (
+    ('ix_admin_users_id', 'admin_users'),
+    ('ix_faqs_id', 'faqs'),
+    ('ix_faqs_question', 'faqs'),
+    ('ix_faqs_is_active', 'faqs'),
+    ('ix_faqs_usage_frequency', 'faqs'),
+    ('ix_tags_id', 'tags'),
+    ('ix_tags_is_active', 'tags'),
+    ('ix_faq_tags_id', 'faq_tags'),
+    ('ix_faq_tags_faq_id', 'faq_tags'),
+    ('ix_faq_tags_tag_id', 'faq_tags'),
+    ('ix_question_variants_id', 'question_variants'),
+    ('ix_question_variants_faq_id', 'question_variants'),
+    ('ix_question_variants_question_text', 'question_variants'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("ALTER TABLE faqs SET (fillfactor = 90)")
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_faqs_updated_at', 'faqs', [sa.text('updated_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_faqs_is_active_updated_at', 'faqs',
+            ['is_active', sa.text('updated_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_faqs_question_trgm', 'faqs', ['question'],
+            postgresql_using='gin', postgresql_ops={'question': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_faqs_answer_trgm', 'faqs', ['answer'],
+            postgresql_using='gin', postgresql_ops={'answer': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_faq_tags_tag_id_faq_id', 'faq_tags', ['tag_id', 'faq_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_question_variants_faq_id_order', 'question_variants',
+            ['faq_id', sa.text('is_representative DESC'), 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tags_display_order_name', 'tags', ['display_order', 'name'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+        for index_name, table_name in DEAD_INDEXES:
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_admin_users_id', 'admin_users', ['id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_faqs_id', 'faqs', ['id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_faqs_question', 'faqs', ['question'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_faqs_is_active', 'faqs', ['is_active'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_faqs_usage_frequency', 'faqs', ['usage_frequency'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_tags_id', 'tags', ['id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_tags_is_active', 'tags', ['is_active'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_faq_tags_id', 'faq_tags', ['id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_faq_tags_faq_id', 'faq_tags', ['faq_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_faq_tags_tag_id', 'faq_tags', ['tag_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_question_variants_id', 'question_variants', ['id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_question_variants_faq_id', 'question_variants', ['faq_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_question_variants_question_text', 'question_variants', ['question_text'], unique=False, postgresql_concurrently=True)
+
+        op.drop_index('ix_tags_display_order_name', table_name='tags', postgresql_concurrently=True)
+        op.drop_index('ix_question_variants_faq_id_order', table_name='question_variants', postgresql_concurrently=True)
+        op.drop_index('ix_faq_tags_tag_id_faq_id', table_name='faq_tags', postgresql_concurrently=True)
+        op.drop_index('ix_faqs_answer_trgm', table_name='faqs', postgresql_concurrently=True)
+        op.drop_index('ix_faqs_question_trgm', table_name='faqs', postgresql_concurrently=True)
+        op.drop_index('ix_faqs_is_active_updated_at', table_name='faqs', postgresql_concurrently=True)
+        op.drop_index('ix_faqs_updated_at', table_name='faqs', postgresql_concurrently=True)
+
+    op.execute("ALTER TABLE faqs RESET (fillfactor)")
@@ -0,0 +1,36 @@
+"""add usage flush batches
+
+Revision ID: 335759c5b85b
+Revises: a620ae3fd944
+Create Date: 2026-10-19 10:02:47.518830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '335759c5b85b'
+down_revision: Union[str, Sequence[str], None] = 'a620ae3fd944'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('usage_flush_batches',
+    sa.Column('batch_key', sa.String(length=120), nullable=False, comment='Redis 배치 키'),
+    sa.Column('faq_count', sa.Integer(), nullable=False, comment='반영된 FAQ 수'),
+    sa.Column('hit_count', sa.Integer(), nullable=False, comment='반영된 사용 횟수 합계'),
+    sa.Column('applied_at', sa.DateTime(), nullable=False, comment='반영일시'),
+    sa.PrimaryKeyConstraint('batch_key')
+    )
+    op.create_index(op.f('ix_usage_flush_batches_applied_at'), 'usage_flush_batches', ['applied_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_usage_flush_batches_applied_at'), table_name='usage_flush_batches')
+    op.drop_table('usage_flush_batches')
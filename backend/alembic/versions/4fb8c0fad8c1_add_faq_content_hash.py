@@ -0,0 +1,28 @@
+"""add faq content hash
+
+Revision ID: 4fb8c0fad8c1
+Revises: f2682353b927
+Create Date: 2026-10-19 14:52:31.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4fb8c0fad8c1'
+down_revision: Union[str, Sequence[str], None] = 'f2682353b927'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('faqs', sa.Column('content_hash', sa.String(length=64), nullable=True, comment='임포트 내용 해시 (관리자 수정 시 NULL)'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('faqs', 'content_hash')
@@ -0,0 +1,41 @@
+"""add stats refresh state
+
+Revision ID: 7c3e5b1a9d42
+Revises: a24b6c62d0f2
+Create Date: 2026-10-19 16:12:08.514220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e5b1a9d42'
+down_revision: Union[str, Sequence[str], None] = 'a24b6c62d0f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # catalog_version_seq is bumped before the writer commits, so the version the
+    # view itself reads at refresh time can cover rows the refresh did not see.
+    # The refresher records the version it read before the refresh, and whether
+    # no write transaction was in flight at that point.
+    op.create_table(
+        'stats_refresh_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('catalog_version', sa.BigInteger(), nullable=False, comment='갱신 전에 읽은 카탈로그 버전'),
+        sa.Column('consistent', sa.Boolean(), nullable=False, comment='갱신 시점에 진행 중인 쓰기 트랜잭션이 없었는지'),
+        sa.CheckConstraint('id = 1', name='ck_stats_refresh_state_single_row'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # Not consistent until the refresher has run once
+    op.execute("INSERT INTO stats_refresh_state (id, catalog_version, consistent) VALUES (1, 0, false)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stats_refresh_state')
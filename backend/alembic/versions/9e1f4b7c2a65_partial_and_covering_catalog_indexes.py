@@ -0,0 +1,76 @@
+"""partial and covering catalog indexes
+
+Revision ID: 9e1f4b7c2a65
+Revises: 7c3e5b1a9d42
+Create Date: 2026-10-19 16:40:31.208817
+
+Follow-up to the index audit (180f67f6ffb4):
+
+- The public list (is_active = true ORDER BY updated_at DESC, id DESC) and its
+  count use a partial index on the active rows only, replacing the
+  (is_active, updated_at, id) composite. Inactive listings walk
+  ix_faqs_updated_at and filter. Trending reads by primary key
+  (id IN (...) AND is_active) and needs no extra index.
+- list_variants and selectinload(FAQ.question_variants) read every variant
+  column, so the (faq_id, is_representative DESC, created_at) index now
+  INCLUDEs id and question_text and both become index-only scans.
+- No covering index on faqs: any INCLUDEd column that the usage flusher or
+  admin edits update (usage_frequency, question, updated_by...) would stop
+  those UPDATEs from being HOT. For the same reason usage_frequency stays
+  unindexed (dropped in 180f67f6ffb4); only the stats view refresh sorts by it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1f4b7c2a65'
+down_revision: Union[str, Sequence[str], None] = '7c3e5b1a9d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_faqs_active_updated_at', 'faqs', [sa.text('updated_at DESC'), sa.text('id DESC')],
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_question_variants_faq_id_order_covering', 'question_variants',
+            ['faq_id', sa.text('is_representative DESC'), 'created_at'],
+            postgresql_include=['id', 'question_text'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_faqs_is_active_updated_at', table_name='faqs', postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_question_variants_faq_id_order', table_name='question_variants',
+            postgresql_concurrently=True, if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_question_variants_faq_id_order', 'question_variants',
+            ['faq_id', sa.text('is_representative DESC'), 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_faqs_is_active_updated_at', 'faqs',
+            ['is_active', sa.text('updated_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_question_variants_faq_id_order_covering', table_name='question_variants',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index('ix_faqs_active_updated_at', table_name='faqs', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,33 @@
+"""add rendered answer columns
+
+Revision ID: a24b6c62d0f2
+Revises: d9b099b389fd
+Create Date: 2026-10-19 18:21:05.518342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a24b6c62d0f2'
+down_revision: Union[str, Sequence[str], None] = 'd9b099b389fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows keep render version 0 and are filled in by `python rerender_answers.py`
+    op.add_column('faqs', sa.Column('answer_html', sa.Text(), nullable=True, comment='답변 HTML (저장 시 렌더링, 정제됨)'))
+    op.add_column('faqs', sa.Column('answer_text', sa.Text(), nullable=True, comment='답변 평문 (검색/미리보기용)'))
+    op.add_column('faqs', sa.Column('answer_render_version', sa.Integer(), server_default='0', nullable=False, comment='답변 렌더러 버전 (재렌더링 대상 판별)'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('faqs', 'answer_render_version')
+    op.drop_column('faqs', 'answer_text')
+    op.drop_column('faqs', 'answer_html')
@@ -0,0 +1,88 @@
+"""add trigger maintained counters
+
+Revision ID: a620ae3fd944
+Revises: 66c2c105139c
+Create Date: 2026-10-19 09:12:31.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a620ae3fd944'
+down_revision: Union[str, Sequence[str], None] = '66c2c105139c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tags', sa.Column('faq_count', sa.Integer(), server_default='0', nullable=False, comment='연결된 FAQ 갯수'))
+    op.alter_column('faqs', 'question_count', server_default='0')
+
+    # faqs.question_count <- question_variants
+    op.execute("""
+        CREATE OR REPLACE FUNCTION faqs_question_count_trg() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE faqs SET question_count = question_count + 1 WHERE id = NEW.faq_id;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE faqs SET question_count = GREATEST(question_count - 1, 0) WHERE id = OLD.faq_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_question_variants_count
+        AFTER INSERT OR DELETE OR UPDATE OF faq_id ON question_variants
+        FOR EACH ROW
+        EXECUTE FUNCTION faqs_question_count_trg()
+    """)
+
+    # tags.faq_count <- faq_tags
+    op.execute("""
+        CREATE OR REPLACE FUNCTION tags_faq_count_trg() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE tags SET faq_count = faq_count + 1 WHERE id = NEW.tag_id;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE tags SET faq_count = GREATEST(faq_count - 1, 0) WHERE id = OLD.tag_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_faq_tags_count
+        AFTER INSERT OR DELETE OR UPDATE OF tag_id ON faq_tags
+        FOR EACH ROW
+        EXECUTE FUNCTION tags_faq_count_trg()
+    """)
+
+    # Backfill from the current rows
+    op.execute("""
+        UPDATE faqs f
+        SET question_count = (SELECT count(*) FROM question_variants v WHERE v.faq_id = f.id)
+    """)
+    op.execute("""
+        UPDATE tags t
+        SET faq_count = c.cnt
+        FROM (SELECT tag_id, count(*) AS cnt FROM faq_tags GROUP BY tag_id) c
+        WHERE t.id = c.tag_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_faq_tags_count ON faq_tags")
+    op.execute("DROP FUNCTION IF EXISTS tags_faq_count_trg()")
+    op.execute("DROP TRIGGER IF EXISTS trg_question_variants_count ON question_variants")
+    op.execute("DROP FUNCTION IF EXISTS faqs_question_count_trg()")
+    op.alter_column('faqs', 'question_count', server_default=None)
+    op.drop_column('tags', 'faq_count')
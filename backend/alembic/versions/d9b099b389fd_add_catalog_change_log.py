@@ -0,0 +1,48 @@
+"""add catalog change log
+
+Revision ID: d9b099b389fd
+Revises: 4fb8c0fad8c1
+Create Date: 2026-10-19 15:03:47.402719
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9b099b389fd'
+down_revision: Union[str, Sequence[str], None] = '4fb8c0fad8c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'catalog_changes',
+        sa.Column('seq', sa.BigInteger(), autoincrement=True, nullable=False, comment='변경 순번 (커밋 순서)'),
+        sa.Column('entity', sa.String(length=20), nullable=False, comment='대상 종류 (faq, tag)'),
+        sa.Column('entity_id', sa.Integer(), nullable=False, comment='대상 ID'),
+        sa.Column('op', sa.String(length=10), nullable=False, comment='변경 종류 (upsert, delete)'),
+        sa.Column('changed_at', sa.DateTime(), nullable=False, comment='변경일시'),
+        sa.PrimaryKeyConstraint('seq'),
+    )
+    op.create_index(op.f('ix_catalog_changes_changed_at'), 'catalog_changes', ['changed_at'], unique=False)
+
+    # Seed the log with the current catalog so that since=0 rebuilds a full mirror
+    op.execute("""
+        INSERT INTO catalog_changes (entity, entity_id, op, changed_at)
+        SELECT 'tag', id, 'upsert', now() AT TIME ZONE 'utc' FROM tags ORDER BY id
+    """)
+    op.execute("""
+        INSERT INTO catalog_changes (entity, entity_id, op, changed_at)
+        SELECT 'faq', id, 'upsert', now() AT TIME ZONE 'utc' FROM faqs ORDER BY id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_catalog_changes_changed_at'), table_name='catalog_changes')
+    op.drop_table('catalog_changes')
@@ -0,0 +1,30 @@
+"""add faq external id
+
+Revision ID: f2682353b927
+Revises: 180f67f6ffb4
+Create Date: 2026-10-19 14:40:12.603381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2682353b927'
+down_revision: Union[str, Sequence[str], None] = '180f67f6ffb4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('faqs', sa.Column('external_id', sa.String(length=64), nullable=True, comment='원본 시스템 의도ID'))
+    op.create_unique_constraint('uq_faqs_external_id', 'faqs', ['external_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_faqs_external_id', 'faqs', type_='unique')
+    op.drop_column('faqs', 'external_id')
@@ -0,0 +1,240 @@
+"""Server-Sent Events push of catalog changes.
+
+Each process runs one ``ChangeBroadcaster``. Writers publish a content-free
+hint on a Redis channel after committing; the broadcaster wakes up, reads the
+new entries from the change log once, hydrates and serializes them once, and
+offers the ready-made frames to every connected subscriber. Redis only says
+"something changed", so a lost hint costs at most one poll interval, and an
+idle subscriber is just a bounded queue and a suspended generator.
+
+A subscriber that cannot keep up overflows its queue and its stream is closed;
+the browser's EventSource reconnects with ``Last-Event-ID`` and catches up
+from the change log, so a slow client never blocks the others.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import selectinload
+from sqlalchemy.future import select
+
+from app.api.schemas import ChangeEntry
+from app.core.changes import (
+    CHANGE_CHANNEL, ENTITY_FAQ, ENTITY_TAG, OP_DELETE, OP_UPSERT,
+    ChangeLogExpiredError, get_latest_seq, read_change_page,
+)
+from app.core.redis import redis_connection_pool
+from app.db.session import AsyncSessionLocal
+from app.models.database import FAQ, Tag
+
+logger = logging.getLogger(__name__)
+
+STREAM_PAGE_SIZE = 500  # change log entries read per query while dispatching or catching up
+RETRY_MILLISECONDS = 3000  # EventSource reconnect delay sent to clients
+PUBSUB_TIMEOUT = 1.0  # seconds a pub/sub read blocks its worker thread
+
+Frame = Tuple[int, str]
+
+
+async def hydrate_changes(session, changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attach the current FAQ/tag row to each upsert; rows deleted since become tombstones."""
+    faq_ids = [c["id"] for c in changes if c["entity"] == ENTITY_FAQ and c["op"] == OP_UPSERT]
+    tag_ids = [c["id"] for c in changes if c["entity"] == ENTITY_TAG and c["op"] == OP_UPSERT]
+    faqs = {}
+    if faq_ids:
+        result = await session.execute(
+            select(FAQ)
+            .options(selectinload(FAQ.tags), selectinload(FAQ.question_variants))
+            .where(FAQ.id.in_(faq_ids))
+        )
+        faqs = {faq.id: faq for faq in result.scalars().all()}
+    tags = {}
+    if tag_ids:
+        result = await session.execute(select(Tag).where(Tag.id.in_(tag_ids)))
+        tags = {tag.id: tag for tag in result.scalars().all()}
+
+    for change in changes:
+        if change["op"] != OP_UPSERT:
+            continue
+        row = (faqs if change["entity"] == ENTITY_FAQ else tags).get(change["id"])
+        if row is None:
+            # Deleted by a later change outside this page: send a tombstone now
+            change["op"] = OP_DELETE
+        else:
+            change[change["entity"]] = row
+    return changes
+
+
+def format_event(change: Dict[str, Any]) -> Frame:
+    """Serialize one hydrated change as an SSE frame keyed by its seq."""
+    data = ChangeEntry.model_validate(change).model_dump_json()
+    return change["seq"], f"id: {change['seq']}\nevent: change\ndata: {data}\n\n"
+
+
+async def read_frames(since: int) -> Tuple[List[Frame], int, bool]:
+    """Read, hydrate and serialize one page of changes after ``since``."""
+    async with AsyncSessionLocal() as session:
+        page = await read_change_page(session, since, STREAM_PAGE_SIZE)
+        changes = await hydrate_changes(session, page["changes"])
+        frames = [format_event(change) for change in changes]
+    return frames, page["next_since"], page["has_more"]
+
+
+class Subscriber:
+    """One SSE connection: a bounded queue of frames; ``None`` closes the stream."""
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def offer(self, frames: List[Frame]) -> None:
+        if self.overflowed:
+            return
+        for frame in frames:
+            try:
+                self.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self.close()
+                return
+
+    def close(self) -> None:
+        """Drop pending frames and end the stream; the client resumes from Last-Event-ID."""
+        self.overflowed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class ChangeBroadcaster:
+    """Per-process fan-out of change log entries to SSE subscribers."""
+
+    def __init__(self):
+        self._subscribers: Set[Subscriber] = set()
+        self._wake = asyncio.Event()
+        self.last_seq = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, queue_size: int) -> Subscriber:
+        subscriber = Subscriber(queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    async def _listen(self) -> None:
+        """Turn Redis pub/sub hints into wake-ups (reconnecting on errors)."""
+        while True:
+            pubsub = None
+            try:
+                pubsub = redis_connection_pool.get_connection().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANGE_CHANNEL)
+                while True:
+                    message = await asyncio.to_thread(pubsub.get_message, timeout=PUBSUB_TIMEOUT)
+                    if message is not None:
+                        self._wake.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"변경 알림 수신 오류: {e}")
+                await asyncio.sleep(PUBSUB_TIMEOUT)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    async def dispatch(self) -> None:
+        """Deliver every change after ``last_seq`` to the current subscribers."""
+        if not self._subscribers:
+            # Nobody is listening: just move the cursor so the next subscriber starts fresh
+            async with AsyncSessionLocal() as session:
+                self.last_seq = await get_latest_seq(session)
+            return
+
+        while True:
+            try:
+                frames, next_since, has_more = await read_frames(self.last_seq)
+            except ChangeLogExpiredError:
+                # Far behind a pruned log: every subscriber must reconnect and resync
+                for subscriber in list(self._subscribers):
+                    subscriber.close()
+                async with AsyncSessionLocal() as session:
+                    self.last_seq = await get_latest_seq(session)
+                return
+            if frames:
+                for subscriber in list(self._subscribers):
+                    subscriber.offer(frames)
+            self.last_seq = next_since
+            if not has_more:
+                return
+
+    async def run(self, poll_interval: float) -> None:
+        """Background loop: dispatch on every hint, and at least every ``poll_interval`` seconds."""
+        logger.info(f"✅ 변경 스트림 브로드캐스터 시작 (폴링 주기: {poll_interval}초)")
+        listener = asyncio.create_task(self._listen())
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                try:
+                    await self.dispatch()
+                except Exception as e:
+                    logger.error(f"변경 스트림 전달 오류: {e}")
+        except asyncio.CancelledError:
+            logger.info("🛑 변경 스트림 브로드캐스터 종료")
+            raise
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+
+change_broadcaster = ChangeBroadcaster()
+
+
+async def stream_changes(since: Optional[int], queue_size: int, heartbeat: float):
+    """SSE body: catch up from the change log after ``since``, then follow the broadcaster.
+
+    The subscriber is registered before catching up, so nothing committed in
+    between is missed; frames already sent during the catch-up are skipped.
+    """
+    subscriber = change_broadcaster.subscribe(queue_size)
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        if since is None:
+            async with AsyncSessionLocal() as session:
+                last_sent = await get_latest_seq(session)
+        else:
+            last_sent = since
+            has_more = True
+            while has_more:
+                try:
+                    frames, last_sent, has_more = await read_frames(last_sent)
+                except ChangeLogExpiredError as e:
+                    yield f"event: resync\ndata: {e}\n\n"
+                    return
+                for _, frame in frames:
+                    yield frame
+
+        while True:
+            try:
+                item = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if item is None:
+                return
+            seq, frame = item
+            if seq <= last_sent:
+                continue
+            last_sent = seq
+            yield frame
+    finally:
+        change_broadcaster.unsubscribe(subscriber)
@@ -0,0 +1,118 @@
+"""Streaming catalog export (NDJSON / CSV).
+
+FAQs are read in id order from a server-side cursor (``yield_per``) with tags
+and variants selectin-loaded per batch, serialized, and written straight to
+the response. Memory is bounded by the batch size, and the first bytes go out
+as soon as the first batch is read. The export runs in a read-only
+REPEATABLE READ transaction, so it is a consistent snapshot even while the
+catalog is being edited (not in local SQLite mode, which reads batch by batch).
+"""
+import csv
+import io
+import zlib
+from typing import AsyncIterator, Iterable, List, Optional
+
+from sqlalchemy.orm import selectinload
+from sqlalchemy.future import select
+
+from app.api.schemas import FaqExportRecord
+from app.db.local import is_sqlite
+from app.db.session import AsyncSessionLocal
+from app.models.database import FAQ
+
+EXPORT_BATCH_SIZE = 1000  # FAQs fetched from the server-side cursor at a time
+GZIP_WBITS = 31  # zlib wbits for a gzip header and trailer
+GZIP_LEVEL = 6
+
+CSV_COLUMNS = [
+    "id", "external_id", "question", "answer", "tags", "question_variants", "representative_question",
+    "usage_frequency", "question_count", "is_active", "created_by", "updated_by", "created_at", "updated_at",
+]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def iter_faq_batches(is_active: Optional[bool] = None) -> AsyncIterator[List[FAQ]]:
+    """Yield FAQs (with tags and variants) in batches from a server-side cursor."""
+    async with AsyncSessionLocal() as session:
+        if not is_sqlite(session):
+            await session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+            )
+        stmt = (
+            select(FAQ)
+            .options(selectinload(FAQ.tags), selectinload(FAQ.question_variants))
+            .order_by(FAQ.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        if is_active is not None:
+            stmt = stmt.where(FAQ.is_active == is_active)
+
+        result = await session.stream(stmt)
+        async for batch in result.scalars().partitions():
+            yield batch
+            # Keep exported objects from piling up in the identity map (expunge_all()
+            # would invalidate the map the cursor is still loading into)
+            for faq in batch:
+                for obj in (faq, *faq.tags, *faq.question_variants):
+                    if obj in session:
+                        session.expunge(obj)
+
+
+def _ndjson_lines(faqs: Iterable[FAQ]) -> str:
+    return "".join(FaqExportRecord.model_validate(faq).model_dump_json() + "\n" for faq in faqs)
+
+
+def _csv_rows(faqs: Iterable[FAQ]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for faq in faqs:
+        variants = sorted(faq.question_variants, key=lambda v: (not v.is_representative, v.created_at))
+        representative = next((v.question_text for v in variants if v.is_representative), "")
+        writer.writerow([
+            faq.id,
+            faq.external_id or "",
+            faq.question,
+            faq.answer,
+            "|".join(tag.name for tag in faq.tags),
+            ",".join(v.question_text for v in variants),
+            representative,
+            faq.usage_frequency,
+            faq.question_count,
+            faq.is_active,
+            faq.created_by or "",
+            faq.updated_by or "",
+            faq.created_at.isoformat(),
+            faq.updated_at.isoformat(),
+        ])
+    return buffer.getvalue()
+
+
+async def stream_catalog(fmt: str, compress: bool = False, is_active: Optional[bool] = None) -> AsyncIterator[bytes]:
+    """Yield the catalog as ndjson or csv byte chunks, gzip-compressed on the fly if ``compress``."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, GZIP_WBITS) if compress else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        if not compressor:
+            return data
+        # Sync-flush every batch so compressed output is not held back waiting for more input
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    if fmt == "csv":
+        # BOM so Excel detects UTF-8 (the importer reads utf-8-sig as well)
+        header = io.StringIO()
+        csv.writer(header).writerow(CSV_COLUMNS)
+        yield encode("﻿" + header.getvalue())
+
+    serialize = _csv_rows if fmt == "csv" else _ndjson_lines
+    async for batch in iter_faq_batches(is_active):
+        chunk = encode(serialize(batch))
+        if chunk:
+            yield chunk
+
+    if compressor:
+        yield compressor.flush()
@@ -2,32 +2,64 @@
 from datetime import datetime
 import json
 import os
+import secrets
 import uuid
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlalchemy import text, func, or_
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import text, func, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 from sqlalchemy.future import select
 
 from app.models.user import UserModel
 from app.models.database import Tag, FAQ, QuestionVariant, FaqTag
 from app.core.redis import redis_connection_pool as redis_pool
+from app.core.usage import record_hit
+from app.core.trending import get_trending_ids, record_trending_hit
+from app.core.stats import read_stats_overview
+from app.core import slow_queries
+from app.core.snapshot import MEDIA_TYPES as SNAPSHOT_MEDIA_TYPES, SnapshotUnavailableError, ensure_snapshot, snapshot_file
+from app.core.changes import (
+    ENTITY_FAQ, ENTITY_TAG, OP_DELETE, OP_UPSERT, ChangeLogExpiredError, notify_changes, read_change_page,
+    record_changes,
+)
+from app.core.imports import (
+    STATUS_RUNNING, acquire_import_lock, create_job, get_job, new_job_id, release_import_lock,
+    request_cancel, save_upload, start_job,
+)
 from app.utils.auth import is_valid
+from app.utils.markup import rendered_answer_fields
 from app.utils.middleware import get_user_info_from_request
 from app.config import settings
-from app.db.session import get_db
+from app.db.local import is_sqlite
+from app.db.session import engine, get_db
+from app.api.change_stream import hydrate_changes, stream_changes
+from app.api.export import MEDIA_TYPES, stream_catalog
+from app.api.serializers import (
+    ORJSONResponse, parse_fieldset, serialize_all, serialize_variant, sparse_serializer,
+)
 from app.api.schemas import (
     TagCreate, TagUpdate, TagResponse,
     FaqCreate, FaqUpdate, FaqListResponse, FaqDetailResponse,
     QuestionVariantCreate, QuestionVariantResponse,
-    PaginatedResponse,
+    PaginatedResponse, ChangeFeedResponse,
 )
 
 router = APIRouter(tags=["API"])
 
 
+def clear_content_hash(faq_ids):
+    """Mark FAQs as edited outside the CSV importer so the next import counts them as changed."""
+    return (
+        update(FAQ)
+        .where(FAQ.id.in_(faq_ids))
+        .values(content_hash=None, updated_at=FAQ.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
 @router.get("/")
 async def root() -> Dict[str, Any]:
     """Base endpoint to verify the new service is running."""
@@ -51,7 +83,16 @@ async def health() -> Dict[str, Any]:
 
 @router.get("/db/status")
 async def database_status(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
-    """Validate Postgres connectivity and report metadata."""
+    """Validate database connectivity and report metadata."""
+    if is_sqlite(db):
+        # Local backend mode (SQLite has no current_database())
+        await db.execute(text("SELECT 1"))
+        return {
+            "database": settings.local_sqlite_path,
+            "current_time": datetime.utcnow().isoformat(),
+            "dsn": settings.database_dsn,
+        }
+
     result = await db.execute(text("SELECT current_database(), current_timestamp"))
     database_name, current_time = result.first()
     return {
@@ -219,33 +260,58 @@ def normalize_session_key(session_key: str) -> str:
     return session_key if session_key.startswith("AX:") else f"AX:{session_key}"
 
 
+def faq_detail_query():
+    """Select FAQs with the relationships needed for FaqDetailResponse."""
+    return select(FAQ).options(selectinload(FAQ.tags), selectinload(FAQ.question_variants))
+
+
+def fieldset_options(model, fields, include):
+    """Load only the requested columns and eager-load only the expanded relationships."""
+    return [load_only(*(getattr(model, name) for name in fields))] + [
+        selectinload(getattr(model, name)) for name in include
+    ]
+
+
+FIELDS_QUERY = Query(None, description="Comma-separated fields to return (id is always included; default: all)")
+FAQ_LIST_INCLUDE_QUERY = Query(None, description="Relationships to expand: tags (default: tags; empty for none)")
+FAQ_DETAIL_INCLUDE_QUERY = Query(
+    None, description="Relationships to expand: tags, question_variants (default: both; empty for none)"
+)
+
+
 # ==================== Tag CRUD Endpoints ====================
 
 @router.get("/tags", response_model=List[TagResponse])
 async def list_tags(
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    fields: Optional[str] = FIELDS_QUERY,
     db: AsyncSession = Depends(get_db),
-) -> List[Tag]:
+) -> ORJSONResponse:
     """List all tags."""
-    query = select(Tag).order_by(Tag.display_order, Tag.name)
+    field_names, _ = parse_fieldset(TagResponse, fields)
+    query = select(Tag).options(*fieldset_options(Tag, field_names, ())).order_by(Tag.display_order, Tag.name)
     if is_active is not None:
         query = query.where(Tag.is_active == is_active)
 
     result = await db.execute(query)
-    return result.scalars().all()
+    return ORJSONResponse(serialize_all(sparse_serializer(TagResponse, field_names, ()), result.scalars().all()))
 
 
 @router.get("/tags/{tag_id}", response_model=TagResponse)
 async def get_tag(
     tag_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
     db: AsyncSession = Depends(get_db),
-) -> Tag:
+) -> ORJSONResponse:
     """Get a single tag by ID."""
-    result = await db.execute(select(Tag).where(Tag.id == tag_id))
+    field_names, _ = parse_fieldset(TagResponse, fields)
+    result = await db.execute(
+        select(Tag).options(*fieldset_options(Tag, field_names, ())).where(Tag.id == tag_id)
+    )
     tag = result.scalar_one_or_none()
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
-    return tag
+    return ORJSONResponse(sparse_serializer(TagResponse, field_names, ())(tag))
 
 
 @router.post("/tags", response_model=TagResponse, status_code=201)
@@ -261,7 +327,10 @@ async def create_tag(
 
     tag = Tag(**tag_data.model_dump())
     db.add(tag)
+    await db.flush()
+    await record_changes(db, [(ENTITY_TAG, tag.id, OP_UPSERT)])
     await db.commit()
+    notify_changes()
     await db.refresh(tag)
     return tag
 
@@ -285,10 +354,14 @@ async def update_tag(
             raise HTTPException(status_code=400, detail="Tag name already exists")
 
     update_data = tag_data.model_dump(exclude_unset=True)
+    if "name" in update_data and update_data["name"] != tag.name:
+        await db.execute(clear_content_hash(select(FaqTag.faq_id).where(FaqTag.tag_id == tag_id)))
     for key, value in update_data.items():
         setattr(tag, key, value)
 
+    await record_changes(db, [(ENTITY_TAG, tag_id, OP_UPSERT)])
     await db.commit()
+    notify_changes()
     await db.refresh(tag)
     return tag
 
@@ -304,8 +377,16 @@ async def delete_tag(
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
 
+    # The linked FAQs lose this tag, so mirrors need them again
+    linked = await db.execute(select(FaqTag.faq_id).where(FaqTag.tag_id == tag_id))
+    faq_ids = linked.scalars().all()
+    await db.execute(clear_content_hash(faq_ids))
     await db.delete(tag)
+    await record_changes(
+        db, [(ENTITY_TAG, tag_id, OP_DELETE)] + [(ENTITY_FAQ, faq_id, OP_UPSERT) for faq_id in faq_ids]
+    )
     await db.commit()
+    notify_changes()
     return {"success": True, "message": f"Tag {tag_id} deleted"}
 
 
@@ -318,11 +399,15 @@ async def list_faqs(
     search: Optional[str] = Query(None, description="Search in question and answer"),
     tag_ids: Optional[str] = Query(None, description="Filter by tag IDs (comma-separated)"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = FAQ_LIST_INCLUDE_QUERY,
     db: AsyncSession = Depends(get_db),
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """List FAQs with pagination and filtering."""
-    # Base query with eager loading
-    query = select(FAQ).options(selectinload(FAQ.tags))
+    field_names, relations = parse_fieldset(FaqListResponse, fields, include, default_include=("tags",))
+
+    # Base query: only the requested columns, eager-loading only the expanded relationships
+    query = select(FAQ).options(*fieldset_options(FAQ, field_names, relations))
     count_query = select(func.count(FAQ.id))
 
     # Apply filters
@@ -358,35 +443,121 @@ async def list_faqs(
 
     # Apply pagination
     offset = (page - 1) * page_size
-    query = query.order_by(FAQ.updated_at.desc()).offset(offset).limit(page_size)
+    query = query.order_by(FAQ.updated_at.desc(), FAQ.id.desc()).offset(offset).limit(page_size)
 
     result = await db.execute(query)
     items = result.scalars().unique().all()
 
-    return {
-        "items": [FaqListResponse.model_validate(item) for item in items],
+    return ORJSONResponse({
+        "items": serialize_all(sparse_serializer(FaqListResponse, field_names, relations), items),
         "total": total,
         "page": page,
         "page_size": page_size,
         "total_pages": (total + page_size - 1) // page_size if total > 0 else 1,
+    })
+
+
+@router.get("/faqs/export")
+async def export_faqs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    gzip: bool = Query(False, description="Compress the stream (Content-Encoding: gzip)"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+) -> StreamingResponse:
+    """Stream the whole catalog with tags and variants as NDJSON or CSV."""
+    headers = {
+        "Content-Disposition": f'attachment; filename="faqs.{format}"',
+        "Cache-Control": "no-store",
     }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_catalog(format, compress=gzip, is_active=is_active),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
+
+
+@router.get("/faqs/trending", response_model=List[FaqDetailResponse])
+async def list_trending_faqs(
+    tag_id: Optional[int] = Query(None, description="Restrict to a tag (global ranking if omitted)"),
+    k: int = Query(10, ge=1, le=100, description="Number of FAQs to return"),
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = FAQ_DETAIL_INCLUDE_QUERY,
+    db: AsyncSession = Depends(get_db),
+) -> ORJSONResponse:
+    """List trending FAQs ranked by time-decayed usage."""
+    field_names, relations = parse_fieldset(
+        FaqDetailResponse, fields, include, default_include=("tags", "question_variants")
+    )
+    try:
+        faq_ids = get_trending_ids(tag_id, k)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Trending ranking is not available: {e}")
+    if not faq_ids:
+        return ORJSONResponse([])
+
+    result = await db.execute(
+        select(FAQ)
+        .options(*fieldset_options(FAQ, field_names, relations))
+        .where(FAQ.id.in_(faq_ids), FAQ.is_active == True)
+    )
+    faqs_by_id = {faq.id: faq for faq in result.scalars().all()}
+    serialize = sparse_serializer(FaqDetailResponse, field_names, relations)
+    return ORJSONResponse([serialize(faqs_by_id[faq_id]) for faq_id in faq_ids if faq_id in faqs_by_id])
 
 
 @router.get("/faqs/{faq_id}", response_model=FaqDetailResponse)
 async def get_faq(
     faq_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = FAQ_DETAIL_INCLUDE_QUERY,
     db: AsyncSession = Depends(get_db),
-) -> FAQ:
-    """Get a single FAQ with all related data."""
+) -> ORJSONResponse:
+    """Get a single FAQ with all related data (narrowed by fields/include)."""
+    field_names, relations = parse_fieldset(
+        FaqDetailResponse, fields, include, default_include=("tags", "question_variants")
+    )
     result = await db.execute(
         select(FAQ)
-        .options(selectinload(FAQ.tags), selectinload(FAQ.question_variants))
+        .options(*fieldset_options(FAQ, field_names, relations))
         .where(FAQ.id == faq_id)
     )
     faq = result.scalar_one_or_none()
     if not faq:
         raise HTTPException(status_code=404, detail="FAQ not found")
-    return faq
+
+    if settings.usage_track_on_read:
+        record_hit(faq.id)
+        if "tags" in relations:
+            tag_ids = [tag.id for tag in faq.tags]
+        else:
+            tag_ids = (await db.execute(select(FaqTag.tag_id).where(FaqTag.faq_id == faq_id))).scalars().all()
+        record_trending_hit(faq.id, tag_ids, settings.trending_half_life)
+    return ORJSONResponse(sparse_serializer(FaqDetailResponse, field_names, relations)(faq))
+
+
+@router.post("/faqs/{faq_id}/hits", status_code=202)
+async def record_faq_hit(
+    faq_id: int,
+    db: AsyncSession = Depends(get_db),
+) -> Dict[str, Any]:
+    """Record one use of a FAQ; counts are flushed to usage_frequency in batches."""
+    # One row per tag (a single row with tag_id NULL for untagged FAQs)
+    rows = (await db.execute(
+        select(FAQ.id, FAQ.is_active, FaqTag.tag_id)
+        .outerjoin(FaqTag, FaqTag.faq_id == FAQ.id)
+        .where(FAQ.id == faq_id)
+    )).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="FAQ not found")
+
+    if not record_hit(faq_id):
+        raise HTTPException(status_code=503, detail="Usage tracking is not available")
+    # Inactive FAQs are never listed as trending; keep them out of the size-capped sets
+    if rows[0].is_active:
+        tag_ids = [row.tag_id for row in rows if row.tag_id is not None]
+        record_trending_hit(faq_id, tag_ids, settings.trending_half_life)
+    return {"success": True, "faq_id": faq_id}
 
 
 @router.post("/faqs", response_model=FaqDetailResponse, status_code=201)
@@ -404,10 +575,12 @@ async def create_faq(
     faq_dict = faq_data.model_dump(exclude={"tag_ids", "new_tag_names", "question_variants"})
     faq_dict["created_by"] = user_id
     faq_dict["updated_by"] = user_id
+    faq_dict.update(rendered_answer_fields(faq_dict["answer"]))
 
     faq = FAQ(**faq_dict)
     db.add(faq)
     await db.flush()
+    changes = [(ENTITY_FAQ, faq.id, OP_UPSERT)]
 
     # Create new tags and collect their IDs
     new_tag_ids = []
@@ -426,6 +599,7 @@ async def create_faq(
                 db.add(new_tag)
                 await db.flush()
                 new_tag_ids.append(new_tag.id)
+                changes.append((ENTITY_TAG, new_tag.id, OP_UPSERT))
 
     # Add existing tags
     all_tag_ids = list(faq_data.tag_ids or []) + new_tag_ids
@@ -435,20 +609,22 @@ async def create_faq(
             faq_tag = FaqTag(faq_id=faq.id, tag_id=tag_id)
             db.add(faq_tag)
 
-    # Add question variants
+    # Add question variants (question_count is maintained by a DB trigger)
     if faq_data.question_variants:
         for variant in faq_data.question_variants:
             qv = QuestionVariant(faq_id=faq.id, **variant.model_dump())
             db.add(qv)
-        faq.question_count = len(faq_data.question_variants)
 
+    await db.flush()
+    await record_changes(db, changes)
     await db.commit()
+    notify_changes()
 
-    # Reload with relationships
+    # Reload with relationships (populate_existing picks up trigger-maintained counters)
     result = await db.execute(
-        select(FAQ)
-        .options(selectinload(FAQ.tags), selectinload(FAQ.question_variants))
+        faq_detail_query()
         .where(FAQ.id == faq.id)
+        .execution_options(populate_existing=True)
     )
     return result.scalar_one()
 
@@ -462,8 +638,7 @@ async def update_faq(
 ) -> FAQ:
     """Update a FAQ."""
     result = await db.execute(
-        select(FAQ)
-        .options(selectinload(FAQ.tags), selectinload(FAQ.question_variants))
+        faq_detail_query()
         .where(FAQ.id == faq_id)
     )
     faq = result.scalar_one_or_none()
@@ -476,9 +651,13 @@ async def update_faq(
 
     # Update basic fields
     update_data = faq_data.model_dump(exclude_unset=True, exclude={"tag_ids", "new_tag_names"})
+    if update_data.get("answer") is not None:
+        update_data.update(rendered_answer_fields(update_data["answer"]))
     for key, value in update_data.items():
         setattr(faq, key, value)
     faq.updated_by = user_id
+    faq.content_hash = None
+    changes = [(ENTITY_FAQ, faq_id, OP_UPSERT)]
 
     # Update tags if provided
     if faq_data.tag_ids is not None or faq_data.new_tag_names:
@@ -499,6 +678,7 @@ async def update_faq(
                     db.add(new_tag)
                     await db.flush()
                     new_tag_ids.append(new_tag.id)
+                    changes.append((ENTITY_TAG, new_tag.id, OP_UPSERT))
 
         # Remove existing tags
         await db.execute(
@@ -513,13 +693,16 @@ async def update_faq(
                 faq_tag = FaqTag(faq_id=faq.id, tag_id=tag_id)
                 db.add(faq_tag)
 
+    await db.flush()
+    await record_changes(db, changes)
     await db.commit()
+    notify_changes()
 
-    # Reload with relationships
+    # Reload with relationships (populate_existing picks up trigger-maintained counters)
     result = await db.execute(
-        select(FAQ)
-        .options(selectinload(FAQ.tags), selectinload(FAQ.question_variants))
+        faq_detail_query()
         .where(FAQ.id == faq_id)
+        .execution_options(populate_existing=True)
     )
     return result.scalar_one()
 
@@ -536,7 +719,9 @@ async def delete_faq(
         raise HTTPException(status_code=404, detail="FAQ not found")
 
     await db.delete(faq)
+    await record_changes(db, [(ENTITY_FAQ, faq_id, OP_DELETE)])
     await db.commit()
+    notify_changes()
     return {"success": True, "message": f"FAQ {faq_id} deleted"}
 
 
@@ -546,7 +731,7 @@ async def delete_faq(
 async def list_variants(
     faq_id: int,
     db: AsyncSession = Depends(get_db),
-) -> List[QuestionVariant]:
+) -> ORJSONResponse:
     """List all question variants for a FAQ."""
     # Check FAQ exists
     faq_result = await db.execute(select(FAQ).where(FAQ.id == faq_id))
@@ -558,7 +743,7 @@ async def list_variants(
         .where(QuestionVariant.faq_id == faq_id)
         .order_by(QuestionVariant.is_representative.desc(), QuestionVariant.created_at)
     )
-    return result.scalars().all()
+    return ORJSONResponse(serialize_all(serialize_variant, result.scalars().all()))
 
 
 @router.post("/faqs/{faq_id}/variants", response_model=QuestionVariantResponse, status_code=201)
@@ -569,18 +754,18 @@ async def create_variant(
 ) -> QuestionVariant:
     """Add a question variant to a FAQ."""
     # Check FAQ exists
-    faq_result = await db.execute(select(FAQ).where(FAQ.id == faq_id))
-    faq = faq_result.scalar_one_or_none()
-    if not faq:
+    faq_result = await db.execute(select(FAQ.id).where(FAQ.id == faq_id))
+    if faq_result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="FAQ not found")
 
+    # question_count is maintained by a DB trigger on question_variants
     variant = QuestionVariant(faq_id=faq_id, **variant_data.model_dump())
     db.add(variant)
-
-    # Update question count
-    faq.question_count += 1
+    await db.execute(clear_content_hash([faq_id]))
+    await record_changes(db, [(ENTITY_FAQ, faq_id, OP_UPSERT)])
 
     await db.commit()
+    notify_changes()
     await db.refresh(variant)
     return variant
 
@@ -596,45 +781,210 @@ async def delete_variant(
     if not variant:
         raise HTTPException(status_code=404, detail="Variant not found")
 
-    # Update question count
-    faq_result = await db.execute(select(FAQ).where(FAQ.id == variant.faq_id))
-    faq = faq_result.scalar_one_or_none()
-    if faq:
-        faq.question_count = max(0, faq.question_count - 1)
-
+    # question_count is maintained by a DB trigger on question_variants
     await db.delete(variant)
+    await db.execute(clear_content_hash([variant.faq_id]))
+    await record_changes(db, [(ENTITY_FAQ, variant.faq_id, OP_UPSERT)])
     await db.commit()
+    notify_changes()
     return {"success": True, "message": f"Variant {variant_id} deleted"}
 
 
-# ==================== Statistics Endpoints ====================
+# ==================== Change Feed Endpoints ====================
 
-@router.get("/stats/overview")
-async def get_stats_overview(
+@router.get("/changes", response_model=ChangeFeedResponse)
+async def list_changes(
+    since: int = Query(0, ge=0, description="Last seq the client has applied (0 = from the beginning)"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum change log entries to scan"),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
-    """Get overview statistics for the dashboard."""
-    # Count FAQs
-    faq_count = await db.execute(select(func.count(FAQ.id)))
-    total_faqs = faq_count.scalar()
-
-    # Count active FAQs
-    active_faq_count = await db.execute(
-        select(func.count(FAQ.id)).where(FAQ.is_active == True)
+    """Return catalog upserts and delete tombstones after ``since``, in commit order.
+
+    Pass ``next_since`` back as ``since`` until ``has_more`` is false. A 410
+    means the log was pruned past ``since`` and the client must resync from 0.
+    """
+    limit = min(limit or settings.change_feed_page_size, settings.change_feed_page_size)
+    try:
+        page = await read_change_page(db, since, limit)
+    except ChangeLogExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+    await hydrate_changes(db, page["changes"])
+    return page
+
+
+@router.get("/changes/stream")
+async def stream_catalog_changes(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="Replay changes after this seq before going live"),
+) -> StreamingResponse:
+    """Push catalog changes as Server-Sent Events (``event: change``, ``id`` = seq).
+
+    Reconnects resume after the ``Last-Event-ID`` header; without it or
+    ``since`` only changes committed after connecting are sent. An
+    ``event: resync`` means the log was pruned and the client must reload.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    return StreamingResponse(
+        stream_changes(since, settings.sse_queue_size, settings.sse_heartbeat_interval),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ==================== Snapshot Export Endpoints ====================
+
+@router.get("/exports/snapshot")
+async def get_snapshot_manifest(request: Request) -> Dict[str, Any]:
+    """Get the Parquet/Arrow snapshot of the current catalog content (built on first request)."""
+    try:
+        manifest = await ensure_snapshot(engine, settings.snapshot_dir, settings.snapshot_keep)
+    except SnapshotUnavailableError as e:
+        raise HTTPException(status_code=503, detail=f"Snapshot export is not available: {e}")
+
+    files = {
+        name: {
+            **info,
+            "url": str(request.url_for("download_snapshot_file", directory=manifest["directory"], filename=name)),
+        }
+        for name, info in manifest["files"].items()
+    }
+    return {**manifest, "files": files}
+
+
+@router.get("/exports/snapshot/{directory}/{filename}")
+async def download_snapshot_file(directory: str, filename: str) -> FileResponse:
+    """Download one snapshot file (supports Range requests; cached versions are immutable)."""
+    found = snapshot_file(settings.snapshot_dir, directory, filename)
+    if not found:
+        raise HTTPException(status_code=404, detail="Snapshot file not found (it may have been pruned)")
+    path, manifest = found
+
+    cache_control = "public, max-age=31536000, immutable" if manifest["cached"] else "no-store"
+    return FileResponse(
+        path,
+        media_type=SNAPSHOT_MEDIA_TYPES[path.suffix],
+        filename=f"faq-seq{manifest['change_seq']}-{filename}",
+        headers={"Cache-Control": cache_control},
     )
-    active_faqs = active_faq_count.scalar()
 
-    # Count tags
-    tag_count = await db.execute(select(func.count(Tag.id)))
-    total_tags = tag_count.scalar()
 
-    # Count variants
-    variant_count = await db.execute(select(func.count(QuestionVariant.id)))
-    total_variants = variant_count.scalar()
+# ==================== Import Endpoints ====================
+
+@router.post("/imports", status_code=202)
+async def create_import(
+    file: UploadFile = File(..., description="Intent export CSV (same layout as docs/docs.csv)"),
+    dry_run: bool = Query(False, description="Only classify rows; roll back instead of writing"),
+    delete_missing: bool = Query(True, description="Delete imported FAQs whose external_id is not in the file"),
+    adopt_legacy: bool = Query(False, description="Link pre-external_id FAQs by question text"),
+) -> Dict[str, Any]:
+    """Upload a CSV export and import it in the background; poll GET /imports/{job_id}."""
+    if is_sqlite(engine):
+        raise HTTPException(
+            status_code=501,
+            detail="CSV imports need Postgres; the local backend is seeded from LOCAL_SEED_CSV at startup",
+        )
+    job_id = new_job_id()
+    try:
+        running_job = acquire_import_lock(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Import jobs are not available: {e}")
+    if running_job:
+        raise HTTPException(status_code=409, detail=f"Import {running_job} is already running")
+
+    options = {
+        "dry_run": dry_run,
+        "delete_missing": delete_missing,
+        "adopt_legacy": adopt_legacy,
+        "workers": settings.import_workers,
+    }
+    path = settings.import_upload_dir / f"{job_id}.csv"
+    try:
+        create_job(job_id, file.filename or "upload.csv", options)
+        await save_upload(file, path)
+    except Exception:
+        release_import_lock(job_id)
+        path.unlink(missing_ok=True)
+        raise
+
+    start_job(engine, job_id, str(path), options)
+    return get_job(job_id)
+
+
+@router.get("/imports/{job_id}")
+async def get_import(job_id: str) -> Dict[str, Any]:
+    """Get import progress (percent, rows/sec, errors) and the final diff/stats."""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+@router.post("/imports/{job_id}/cancel", status_code=202)
+async def cancel_import(job_id: str) -> Dict[str, Any]:
+    """Cancel a running import; its transaction is rolled back."""
+    job = request_cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    if job["status"] == STATUS_RUNNING and job.get("phase") == "committing":
+        raise HTTPException(status_code=409, detail="Import is committing and can no longer be cancelled")
+    return job
+
+
+# ==================== Statistics Endpoints ====================
+
+@router.get("/stats/overview")
+async def get_stats_overview(
+    top_n: int = Query(10, ge=1, le=50, description="Number of most used FAQs to include"),
+    db: AsyncSession = Depends(get_db),
+) -> Dict[str, Any]:
+    """Get overview statistics for the dashboard from the materialized stats view."""
+    stats = await read_stats_overview(db)
+    if stats is None:
+        raise HTTPException(status_code=503, detail="Statistics are not available yet")
 
     return {
-        "total_faqs": total_faqs,
-        "active_faqs": active_faqs,
-        "total_tags": total_tags,
-        "total_variants": total_variants,
+        "total_faqs": stats["total_faqs"],
+        "active_faqs": stats["active_faqs"],
+        "inactive_faqs": stats["total_faqs"] - stats["active_faqs"],
+        "total_tags": stats["total_tags"],
+        "total_variants": stats["total_variants"],
+        "by_tag": stats["by_tag"],
+        "top_usage": stats["top_usage"][:top_n],
+        "refreshed_at": stats["refreshed_at"].isoformat(),
+        "catalog_version": stats["catalog_version"],
+        "is_stale": not stats["consistent"] or stats["catalog_version"] < stats["current_version"],
     }
+
+
+# ==================== Debug Endpoints ====================
+
+def require_debug_token(x_debug_token: Optional[str] = Header(None)) -> None:
+    """Allow debug endpoints only with the X-Debug-Token header matching DEBUG_TOKEN (unset = disabled)."""
+    if settings.debug_token is None:
+        raise HTTPException(status_code=404, detail="Debug endpoints are disabled (DEBUG_TOKEN is not set)")
+    if x_debug_token is None or not secrets.compare_digest(x_debug_token, settings.debug_token):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Debug-Token")
+
+
+@router.get("/debug/slow-queries", dependencies=[Depends(require_debug_token)])
+async def get_slow_queries(
+    sort: str = Query("total", pattern="^(total|count|p95|max)$", description="Sort by total time, count, p95 or max"),
+    limit: int = Query(50, ge=1, le=500),
+    include_plan: bool = Query(True, description="Include captured EXPLAIN (ANALYZE, BUFFERS) plans"),
+) -> Dict[str, Any]:
+    """Get slow SQL statements of this worker grouped by shape, with counts, percentiles and plans."""
+    if slow_queries.recorder is None:
+        raise HTTPException(status_code=404, detail="Slow query log is disabled (SLOW_QUERY_MS=0)")
+    return {"pid": os.getpid(), **slow_queries.recorder.report(sort, limit, include_plan)}
+
+
+@router.delete("/debug/slow-queries", dependencies=[Depends(require_debug_token)])
+async def reset_slow_queries() -> Dict[str, Any]:
+    """Clear the slow query report of this worker (e.g. after a deploy)."""
+    if slow_queries.recorder is None:
+        raise HTTPException(status_code=404, detail="Slow query log is disabled (SLOW_QUERY_MS=0)")
+    slow_queries.recorder.reset()
+    return {"pid": os.getpid(), "reset": True}
@@ -32,6 +32,7 @@ class TagUpdate(BaseModel):
 class TagResponse(TagBase):
     """Schema for Tag response."""
     id: int
+    faq_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -91,6 +92,7 @@ class FaqListResponse(BaseModel):
     """Schema for FAQ list response (summary)."""
     id: int
     question: str
+    answer_text: Optional[str] = None
     usage_frequency: int
     question_count: int
     is_active: bool
@@ -105,6 +107,7 @@ class FaqListResponse(BaseModel):
 class FaqDetailResponse(FaqListResponse):
     """Schema for FAQ detail response (full)."""
     answer: str
+    answer_html: Optional[str] = None
     created_by: Optional[str]
     updated_by: Optional[str]
     question_variants: List[QuestionVariantResponse] = []
@@ -113,6 +116,33 @@ class FaqDetailResponse(FaqListResponse):
         from_attributes = True
 
 
+class FaqExportRecord(FaqDetailResponse):
+    """Schema for one FAQ in the NDJSON export."""
+    external_id: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+# ==================== Change Feed Schemas ====================
+
+class ChangeEntry(BaseModel):
+    """One entry of the change feed; upserts carry the current row, deletes are tombstones."""
+    seq: int
+    entity: str
+    id: int
+    op: str
+    faq: Optional[FaqExportRecord] = None
+    tag: Optional[TagResponse] = None
+
+
+class ChangeFeedResponse(BaseModel):
+    """A page of the change feed."""
+    changes: List[ChangeEntry]
+    next_since: int
+    has_more: bool
+
+
 # ==================== Pagination Schemas ====================
 
 class PaginationParams(BaseModel):
@@ -0,0 +1,159 @@
+"""Fast JSON serialization for hot read endpoints.
+
+``response_model=`` makes FastAPI validate every ORM row into the schema and
+then serialize the validated model, and ``list_faqs`` validated each item once
+more before that. The serializers here read the schema's fields straight off
+the ORM row into a plain dict (field lists are taken from the schemas so the
+two cannot drift apart), and ``ORJSONResponse`` encodes the result with
+orjson. Endpoints that return an ``ORJSONResponse`` keep their
+``response_model`` for the OpenAPI docs, but FastAPI skips validation for
+responses that are already ``Response`` objects.
+
+``?fields=`` / ``?include=`` pick a subset of a schema (``parse_fieldset``);
+the routes select only those columns and eager-load only those relationships,
+and ``sparse_serializer`` caches one compiled serializer per fieldset.
+
+Run ``benchmarks/json_encode.py`` to compare the two paths.
+"""
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.api.schemas import (
+    FaqDetailResponse, FaqListResponse, QuestionVariantResponse, TagResponse,
+)
+
+Serializer = Callable[[Any], Dict[str, Any]]
+
+# Naive datetimes are written without an offset, exactly as Pydantic writes them
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain Python data (dicts, lists, datetimes, ...) as JSON bytes."""
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def compile_serializer(
+    schema: Type[BaseModel],
+    nested: Optional[Dict[str, Serializer]] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Serializer:
+    """Build a row-to-dict function for the fields of ``schema``.
+
+    ``nested`` maps list relationship fields to the serializer of their items.
+    ``fields`` restricts the scalar fields (default: every non-relationship
+    field of the schema). Loaded column values are read from the instance
+    ``__dict__`` in one ``itemgetter`` call, which skips the ORM attribute
+    descriptors; a row with an unloaded or expired field falls back to normal
+    attribute access.
+    """
+    nested = nested or {}
+    if fields is None:
+        fields = [name for name in schema.model_fields if name not in nested]
+    fields = list(fields)
+    get_loaded = itemgetter(*fields)
+    get_attributes = attrgetter(*fields)
+    single = len(fields) == 1
+    relations = [(name, attrgetter(name), serializer) for name, serializer in nested.items()]
+
+    def serialize(row: Any) -> Dict[str, Any]:
+        try:
+            values = get_loaded(row.__dict__)
+        except KeyError:
+            values = get_attributes(row)
+        data = {fields[0]: values} if single else dict(zip(fields, values))
+        for name, get_related, serializer in relations:
+            data[name] = [serializer(item) for item in get_related(row)]
+        return data
+
+    serialize.__name__ = f"serialize_{schema.__name__}"
+    return serialize
+
+
+serialize_tag = compile_serializer(TagResponse)
+serialize_variant = compile_serializer(QuestionVariantResponse)
+serialize_faq_list_item = compile_serializer(FaqListResponse, {"tags": serialize_tag})
+serialize_faq_detail = compile_serializer(
+    FaqDetailResponse, {"tags": serialize_tag, "question_variants": serialize_variant}
+)
+
+# Relationships that ?include= may expand, with the serializer of their items
+RELATION_SERIALIZERS: Dict[str, Serializer] = {
+    "tags": serialize_tag,
+    "question_variants": serialize_variant,
+}
+
+
+def serialize_all(serializer: Serializer, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Serialize a sequence of ORM rows."""
+    return [serializer(row) for row in rows]
+
+
+# ==================== Sparse fieldsets ====================
+
+def _split(value: str) -> List[str]:
+    return list(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+
+
+def parse_fieldset(
+    schema: Type[BaseModel],
+    fields: Optional[str],
+    include: Optional[str] = None,
+    default_include: Tuple[str, ...] = (),
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Resolve ``?fields=`` and ``?include=`` against a response schema.
+
+    ``fields`` lists scalar fields (``id`` is always returned; omitted = all),
+    ``include`` lists relationships to expand (omitted = ``default_include``,
+    empty = none). Both come back in schema order.
+
+    Raises:
+        HTTPException: 400 for names the schema does not have
+    """
+    relations = [name for name in schema.model_fields if name in RELATION_SERIALIZERS]
+    scalars = [name for name in schema.model_fields if name not in RELATION_SERIALIZERS]
+
+    if fields is None:
+        selected = scalars
+    else:
+        requested = set(_split(fields))
+        unknown = requested - set(scalars)
+        if unknown:
+            hint = " (use include= for relationships)" if unknown & set(relations) else ""
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}{hint}. Available: {', '.join(scalars)}",
+            )
+        selected = [name for name in scalars if name == "id" or name in requested]
+
+    if include is None:
+        expanded = [name for name in relations if name in default_include]
+    else:
+        requested = set(_split(include))
+        unknown = requested - set(relations)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown include: {', '.join(sorted(unknown))}. Available: {', '.join(relations) or '-'}",
+            )
+        expanded = [name for name in relations if name in requested]
+    return tuple(selected), tuple(expanded)
+
+
+@lru_cache(maxsize=256)
+def sparse_serializer(schema: Type[BaseModel], fields: Tuple[str, ...], include: Tuple[str, ...]) -> Serializer:
+    """Serializer for one fieldset, compiled once per distinct (schema, fields, include)."""
+    return compile_serializer(schema, {name: RELATION_SERIALIZERS[name] for name in include}, fields)
@@ -1,6 +1,7 @@
 """Application configuration."""
 import os
 import sys
+import tempfile
 from pathlib import Path
 from typing import Optional
 from urllib.parse import quote_plus
@@ -170,6 +171,238 @@ class Settings:
         """Get Redis cluster mode."""
         return os.getenv("REDIS_CLUSTER_MODE", "false").lower() == "true"
 
+    # Local Backend Settings
+    @property
+    def local_backend(self) -> bool:
+        """Check whether the app runs on SQLite and an in-process Redis stand-in instead of Postgres and Redis."""
+        return os.getenv("LOCAL_BACKEND", "false").lower() == "true"
+
+    @property
+    def local_sqlite_path(self) -> str:
+        """Get SQLite database file used in local backend mode (':memory:' for a throwaway database)."""
+        raw_path = os.getenv("LOCAL_SQLITE_PATH", "local.db")
+        if raw_path == ":memory:" or Path(raw_path).is_absolute():
+            return raw_path
+        config_dir = Path(__file__).parent.parent  # backend directory
+        return str(config_dir / raw_path)
+
+    @property
+    def local_seed_csv(self) -> Optional[Path]:
+        """Get intent export loaded into an empty local database at startup (empty = no seed)."""
+        raw_path = os.getenv("LOCAL_SEED_CSV", "docs/docs.csv")
+        if not raw_path:
+            return None
+        if Path(raw_path).is_absolute():
+            return Path(raw_path)
+        config_dir = Path(__file__).parent.parent  # backend directory
+        return config_dir / raw_path
+
+    @property
+    def database_dsn(self) -> str:
+        """Get DSN of the app database (SQLite in local backend mode, else PostgreSQL)."""
+        if self.local_backend:
+            return f"sqlite+aiosqlite:///{self.local_sqlite_path}"
+        return self.postgres_dsn
+
+    # Usage Tracking Settings
+    @property
+    def usage_flush_interval(self) -> float:
+        """Get seconds between usage counter flushes to Postgres."""
+        return max(float(os.getenv("USAGE_FLUSH_INTERVAL", "10")), 1.0)
+
+    @property
+    def usage_track_on_read(self) -> bool:
+        """Get whether FAQ detail reads are counted as hits."""
+        return os.getenv("USAGE_TRACK_ON_READ", "false").lower() == "true"
+
+    @property
+    def trending_half_life(self) -> float:
+        """Get trending score half-life in seconds."""
+        hours = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "72"))
+        return max(hours, 0.1) * 3600
+
+    @property
+    def trending_rebalance_interval(self) -> float:
+        """Get seconds between trending score decay/rebalance runs."""
+        return max(float(os.getenv("TRENDING_REBALANCE_INTERVAL", "3600")), 10.0)
+
+    # Statistics Settings
+    @property
+    def stats_refresh_interval(self) -> float:
+        """Get seconds between statistics view freshness checks."""
+        return max(float(os.getenv("STATS_REFRESH_INTERVAL", "30")), 1.0)
+
+    @property
+    def stats_max_age(self) -> float:
+        """Get maximum statistics view age in seconds before a forced refresh."""
+        return max(float(os.getenv("STATS_MAX_AGE", "600")), self.stats_refresh_interval)
+
+    # Import Settings
+    @property
+    def import_upload_dir(self) -> Path:
+        """Get directory where uploaded import CSVs are stored while they are processed."""
+        raw_path = os.getenv("IMPORT_UPLOAD_DIR")
+        if raw_path:
+            return Path(raw_path)
+        return Path(tempfile.gettempdir()) / "officeplus_faq_imports"
+
+    @property
+    def import_workers(self) -> int:
+        """Get number of CSV parser processes used by background imports."""
+        return max(int(os.getenv("IMPORT_WORKERS", "2")), 1)
+
+    # Snapshot Export Settings
+    @property
+    def snapshot_dir(self) -> Path:
+        """Get directory where columnar catalog snapshots are cached per catalog version."""
+        raw_path = os.getenv("SNAPSHOT_DIR")
+        if raw_path:
+            return Path(raw_path)
+        return Path(tempfile.gettempdir()) / "officeplus_faq_snapshots"
+
+    @property
+    def snapshot_keep(self) -> int:
+        """Get number of catalog versions whose snapshots are kept on disk."""
+        return max(int(os.getenv("SNAPSHOT_KEEP", "3")), 1)
+
+    # Change Feed Settings
+    @property
+    def change_log_retention_days(self) -> int:
+        """Get number of days change log entries are kept for incremental sync."""
+        return max(int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "30")), 1)
+
+    @property
+    def change_feed_page_size(self) -> int:
+        """Get maximum number of change log entries returned per /changes page."""
+        return max(int(os.getenv("CHANGE_FEED_PAGE_SIZE", "1000")), 1)
+
+    @property
+    def change_poll_interval(self) -> float:
+        """Get fallback interval (seconds) at which each pod checks the change log without a Redis hint."""
+        return max(float(os.getenv("CHANGE_POLL_INTERVAL", "5")), 0.5)
+
+    @property
+    def sse_queue_size(self) -> int:
+        """Get number of undelivered events buffered per SSE connection before it is dropped."""
+        return max(int(os.getenv("SSE_QUEUE_SIZE", "1000")), 1)
+
+    @property
+    def sse_heartbeat_interval(self) -> float:
+        """Get interval (seconds) of keep-alive comments on idle SSE connections."""
+        return max(float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15")), 1.0)
+
+    # Static Bundle Settings
+    @property
+    def bundle_dir(self) -> Path:
+        """Get directory where the pre-compressed per-tag FAQ bundle is written."""
+        raw_path = os.getenv("BUNDLE_DIR")
+        if raw_path:
+            return Path(raw_path)
+        return Path(tempfile.gettempdir()) / "officeplus_faq_bundle"
+
+    @property
+    def bundle_mount_path(self) -> str:
+        """Get URL prefix where the static FAQ bundle is served."""
+        prefix = os.getenv("BUNDLE_PREFIX", "/p/faq/bundle").strip()
+        return "/" + prefix.strip("/")
+
+    @property
+    def bundle_debounce(self) -> float:
+        """Get quiet period (seconds) after the last catalog change before the bundle is rebuilt."""
+        return max(float(os.getenv("BUNDLE_DEBOUNCE", "5")), 0.5)
+
+    @property
+    def bundle_max_delay(self) -> float:
+        """Get maximum delay (seconds) before a rebuild while changes keep arriving."""
+        return max(float(os.getenv("BUNDLE_MAX_DELAY", "60")), self.bundle_debounce)
+
+    # Metrics Settings
+    @property
+    def metrics_enabled(self) -> bool:
+        """Check whether Prometheus metrics are collected and served at /metrics."""
+        return os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    @property
+    def metrics_multiproc_dir(self) -> Optional[str]:
+        """Get prometheus_client multiprocess directory (set when running several uvicorn workers)."""
+        return os.getenv("PROMETHEUS_MULTIPROC_DIR") or None
+
+    # Request Stats Settings
+    @property
+    def request_stats_enabled(self) -> bool:
+        """Check whether per-request SQL/Redis counts are sent as Server-Timing headers."""
+        return os.getenv("REQUEST_STATS_ENABLED", "true").lower() == "true"
+
+    @property
+    def query_repeat_threshold(self) -> int:
+        """Get how many runs of the same statement shape in one request are logged as a query loop."""
+        return max(int(os.getenv("QUERY_REPEAT_THRESHOLD", "10")), 1)
+
+    # Slow Query Settings
+    @property
+    def slow_query_ms(self) -> float:
+        """Get duration (milliseconds) above which SQL statements are logged as slow (0 = disabled)."""
+        return max(float(os.getenv("SLOW_QUERY_MS", "200")), 0.0)
+
+    @property
+    def slow_query_explain_rate(self) -> float:
+        """Get fraction of slow SELECT statements re-run with EXPLAIN (ANALYZE, BUFFERS) (0 = never)."""
+        return min(max(float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0")), 0.0), 1.0)
+
+    @property
+    def slow_query_explain_interval(self) -> float:
+        """Get minimum interval (seconds) between EXPLAIN captures of the same statement shape."""
+        return max(float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "300")), 0.0)
+
+    @property
+    def slow_query_max_shapes(self) -> int:
+        """Get number of distinct slow statement shapes kept in the /debug/slow-queries report."""
+        return max(int(os.getenv("SLOW_QUERY_MAX_SHAPES", "200")), 1)
+
+    @property
+    def debug_token(self) -> Optional[str]:
+        """Get token required in the X-Debug-Token header by /debug endpoints (unset = endpoints disabled)."""
+        return os.getenv("DEBUG_TOKEN") or None
+
+    # Profiling Settings
+    @property
+    def profiler_token(self) -> Optional[str]:
+        """Get token that enables per-request profiling via the X-Profile-Token header (unset = disabled)."""
+        return os.getenv("PROFILER_TOKEN") or None
+
+    @property
+    def profile_dir(self) -> Path:
+        """Get directory where request and worker profiles are written."""
+        raw_path = os.getenv("PROFILE_DIR")
+        if raw_path:
+            return Path(raw_path)
+        return Path(tempfile.gettempdir()) / "officeplus_faq_profiles"
+
+    @property
+    def profile_interval(self) -> float:
+        """Get sampling interval (seconds) of per-request profiles."""
+        return max(float(os.getenv("PROFILE_INTERVAL", "0.001")), 0.0001)
+
+    @property
+    def profile_sampling_enabled(self) -> bool:
+        """Check whether the whole worker is sampled in the background and written to PROFILE_DIR."""
+        return os.getenv("PROFILE_SAMPLING_ENABLED", "false").lower() == "true"
+
+    @property
+    def profile_sampling_interval(self) -> float:
+        """Get interval (seconds) between background stack samples."""
+        return max(float(os.getenv("PROFILE_SAMPLING_INTERVAL", "0.01")), 0.001)
+
+    @property
+    def profile_sampling_window(self) -> float:
+        """Get length (seconds) of each background profile file."""
+        return max(float(os.getenv("PROFILE_SAMPLING_WINDOW", "60")), 1.0)
+
+    @property
+    def profile_keep(self) -> int:
+        """Get number of request profiles and of worker profiles kept on disk."""
+        return max(int(os.getenv("PROFILE_KEEP", "50")), 1)
+
     # Frontend Settings
     @property
     def frontend_dist(self) -> Path:
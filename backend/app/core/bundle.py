@@ -0,0 +1,245 @@
+"""공개 FAQ 정적 번들 (태그별 JSON 샤드 + manifest)
+
+익명 사용자의 조회는 대부분 "카테고리(태그)별 활성 FAQ" 이므로, 활성 카탈로그를
+태그별 JSON 샤드로 미리 만들어 두고 정적 파일로 서빙합니다. CDN/브라우저가
+캐시하면 공개 FAQ 화면은 백엔드 작업 없이 동작합니다.
+
+- 샤드 파일명에 내용 해시가 들어가므로 (`tag-<id>.<hash>.json`) 한 번 만든 파일은
+  바뀌지 않으며 immutable 캐시 헤더로 서빙합니다. 바뀌지 않은 샤드는 다시 쓰지 않습니다.
+- 각 샤드는 gzip(.gz) 과 brotli(.br, brotli 패키지가 있을 때) 로 미리 압축해 둡니다.
+- `manifest.json` 에 샤드별 파일명/해시/FAQ 수가 있으며, 원자적으로 교체됩니다.
+- 빌드는 변경 로그 순번(`catalog_changes`)이 바뀐 뒤 debounce 하여 실행합니다.
+  사용 빈도 집계처럼 내용이 바뀌지 않는 쓰기에는 다시 만들지 않습니다.
+- 출력이 결정적이므로 Pod 마다 로컬 디렉터리에 만들어도 같은 파일명/내용이 됩니다.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import JSON, DateTime, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.changes import get_latest_seq
+from app.db.local import is_sqlite
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+SHARD_DIR = "shards"
+UNTAGGED_SHARD = "untagged"
+HASH_LENGTH = 16  # 파일명에 넣는 해시 길이 (hex)
+STALE_SHARD_SECONDS = 3600  # 참조되지 않는 샤드를 지우기 전 유예 시간 (이전 manifest 를 가진 클라이언트용)
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+ACTIVE_TAGS_SQL = """
+    SELECT id, name, description, color, display_order
+    FROM tags WHERE is_active ORDER BY display_order, name
+"""
+
+ACTIVE_FAQS_SQL = """
+    SELECT f.id, f.question, f.answer, f.answer_html, f.updated_at,
+           COALESCE(array_agg(DISTINCT ft.tag_id) FILTER (WHERE ft.tag_id IS NOT NULL), '{}') AS tag_ids,
+           COALESCE((
+               SELECT array_agg(qv.question_text ORDER BY qv.is_representative DESC, qv.id)
+               FROM question_variants qv WHERE qv.faq_id = f.id
+           ), '{}') AS variants
+    FROM faqs f
+    LEFT JOIN faq_tags ft ON ft.faq_id = f.id
+    WHERE f.is_active
+    GROUP BY f.id
+    ORDER BY f.usage_frequency DESC, f.id
+"""
+
+# SQLite: array_agg 대신 JSON 배열 (결과 타입을 지정해 list / datetime 으로 받습니다)
+SQLITE_ACTIVE_FAQS_SQL = text("""
+    SELECT f.id, f.question, f.answer, f.answer_html, f.updated_at,
+           (SELECT json_group_array(tag_id) FROM (
+               SELECT DISTINCT ft.tag_id FROM faq_tags ft WHERE ft.faq_id = f.id ORDER BY ft.tag_id
+           )) AS tag_ids,
+           (SELECT json_group_array(question_text) FROM (
+               SELECT qv.question_text FROM question_variants qv
+               WHERE qv.faq_id = f.id ORDER BY qv.is_representative DESC, qv.id
+           )) AS variants
+    FROM faqs f
+    WHERE f.is_active
+    ORDER BY f.usage_frequency DESC, f.id
+""").columns(updated_at=DateTime, tag_ids=JSON, variants=JSON)
+
+
+def _brotli():
+    """brotli 모듈 (없으면 None, .br 파일은 만들지 않음)"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _dumps(payload: Any) -> bytes:
+    """같은 내용이면 항상 같은 바이트가 되도록 직렬화합니다."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _write_shard(shard_dir: Path, key: str, data: bytes) -> Dict[str, Any]:
+    """샤드와 압축본을 씁니다 (같은 해시의 파일이 있으면 건너뜀)."""
+    digest = hashlib.sha256(data).hexdigest()
+    filename = f"{key}.{digest[:HASH_LENGTH]}.json"
+    path = shard_dir / filename
+    if not path.exists():
+        _write_atomic(path.with_name(filename + ".gz"), gzip.compress(data, GZIP_LEVEL, mtime=0))
+        brotli = _brotli()
+        if brotli is not None:
+            _write_atomic(path.with_name(filename + ".br"), brotli.compress(data, quality=BROTLI_QUALITY))
+        # 원본을 마지막에 써서, 원본이 있으면 압축본도 있다고 볼 수 있게 합니다.
+        _write_atomic(path, data)
+    else:
+        # 아직 사용 중인 샤드가 정리되지 않도록 갱신
+        for variant in (path, path.with_name(filename + ".gz"), path.with_name(filename + ".br")):
+            if variant.exists():
+                os.utime(variant)
+    return {"file": f"{SHARD_DIR}/{filename}", "sha256": digest, "bytes": len(data)}
+
+
+def _prune(shard_dir: Path, referenced: set) -> None:
+    """현재 manifest 가 참조하지 않고 오래된 샤드를 삭제합니다."""
+    now = time.time()
+    for path in shard_dir.iterdir():
+        base = path.name
+        for suffix in (".gz", ".br"):
+            if base.endswith(suffix):
+                base = base[: -len(suffix)]
+        if base in referenced:
+            continue
+        try:
+            if now - path.stat().st_mtime > STALE_SHARD_SECONDS:
+                path.unlink()
+        except OSError:
+            pass
+
+
+async def _read_catalog(engine: AsyncEngine) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """활성 태그와 활성 FAQ 를 한 스냅샷에서 읽습니다."""
+    async with engine.connect() as conn:
+        if is_sqlite(conn):
+            # 로컬 모드: 스냅샷 격리 없이 순서대로 읽습니다.
+            faqs_query = SQLITE_ACTIVE_FAQS_SQL
+        else:
+            conn = await conn.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+            faqs_query = text(ACTIVE_FAQS_SQL)
+        tags = [dict(row) for row in (await conn.execute(text(ACTIVE_TAGS_SQL))).mappings().all()]
+        faqs = [dict(row) for row in (await conn.execute(faqs_query)).mappings().all()]
+    return tags, faqs
+
+
+def _render(base_dir: Path, tags: List[Dict[str, Any]], faqs: List[Dict[str, Any]], change_seq: int) -> Dict[str, Any]:
+    """샤드와 manifest 를 디스크에 씁니다 (blocking, 스레드에서 실행)."""
+    shard_dir = base_dir / SHARD_DIR
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    active_tag_ids = {tag["id"] for tag in tags}
+    by_tag: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    for faq in faqs:
+        record = {
+            "id": faq["id"],
+            "question": faq["question"],
+            "answer": faq["answer"],
+            "answer_html": faq["answer_html"],
+            "question_variants": list(faq["variants"]),
+            "tag_ids": sorted(tag_id for tag_id in faq["tag_ids"] if tag_id in active_tag_ids),
+            "updated_at": faq["updated_at"].isoformat(),
+        }
+        keys = record["tag_ids"] or [UNTAGGED_SHARD]
+        for key in keys:
+            by_tag[key].append(record)
+
+    shards = []
+    for tag in tags:
+        items = by_tag.get(tag["id"], [])
+        entry = _write_shard(shard_dir, f"tag-{tag['id']}", _dumps({"tag": tag, "faqs": items}))
+        shards.append({**entry, "tag_id": tag["id"], "name": tag["name"], "count": len(items)})
+    untagged = by_tag.get(UNTAGGED_SHARD, [])
+    if untagged:
+        entry = _write_shard(shard_dir, UNTAGGED_SHARD, _dumps({"tag": None, "faqs": untagged}))
+        shards.append({**entry, "tag_id": None, "name": None, "count": len(untagged)})
+
+    manifest = {
+        "change_seq": change_seq,
+        "generated_at": time.time(),
+        "faq_count": len(faqs),
+        "shards": shards,
+    }
+    manifest_data = json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+    _write_atomic(base_dir / MANIFEST_NAME, manifest_data)
+    _write_atomic(base_dir / (MANIFEST_NAME + ".gz"), gzip.compress(manifest_data, GZIP_LEVEL, mtime=0))
+    _prune(shard_dir, {Path(shard["file"]).name for shard in shards})
+    return manifest
+
+
+def read_bundle_manifest(base_dir: Path) -> Optional[Dict[str, Any]]:
+    """현재 manifest (없으면 None)"""
+    try:
+        return json.loads((base_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+async def build_bundle(engine: AsyncEngine, base_dir: Path) -> Dict[str, Any]:
+    """활성 카탈로그로 번들을 만듭니다. 변경 로그 순번은 스냅샷보다 먼저 읽습니다."""
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        change_seq = await get_latest_seq(conn)
+    tags, faqs = await _read_catalog(engine)
+    manifest = await asyncio.to_thread(_render, base_dir, tags, faqs, change_seq)
+    logger.info(
+        f"✅ FAQ 번들 생성: 샤드 {len(manifest['shards'])}개, FAQ {len(faqs)}개 "
+        f"(seq {change_seq}, {time.perf_counter() - started:.2f}초)"
+    )
+    return manifest
+
+
+async def run_bundle_builder(engine: AsyncEngine, base_dir: Path, debounce: float, max_delay: float) -> None:
+    """변경 로그 순번을 확인하며 번들을 다시 만드는 백그라운드 루프
+
+    변경이 debounce 초 동안 없을 때 빌드하고, 변경이 계속되더라도 max_delay 초 안에는 빌드합니다.
+    """
+    logger.info(f"✅ FAQ 번들 빌드 작업 시작 (debounce: {debounce}초)")
+    manifest = read_bundle_manifest(base_dir)
+    built_seq = manifest["change_seq"] if manifest else None
+    seen_seq = None
+    changed_at = pending_since = 0.0
+    while True:
+        try:
+            await asyncio.sleep(min(debounce, 1.0))
+            async with engine.connect() as conn:
+                latest = await get_latest_seq(conn)
+            now = time.monotonic()
+            if latest == built_seq:
+                pending_since = 0.0
+                continue
+            if latest != seen_seq:
+                seen_seq, changed_at = latest, now
+                pending_since = pending_since or now
+            if now - changed_at < debounce and now - pending_since < max_delay:
+                continue
+            manifest = await build_bundle(engine, base_dir)
+            built_seq, pending_since = manifest["change_seq"], 0.0
+        except asyncio.CancelledError:
+            logger.info("🛑 FAQ 번들 빌드 작업 종료")
+            raise
+        except Exception as e:
+            logger.error(f"FAQ 번들 빌드 오류: {e}")
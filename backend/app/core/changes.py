@@ -0,0 +1,207 @@
+"""카탈로그 변경 로그 (증분 동기화)
+
+FAQ/태그/질의문을 변경하는 모든 트랜잭션은 커밋 직전에 `record_changes` 로
+`catalog_changes` 에 (대상, ID, upsert|delete) 행을 남깁니다. 미러 클라이언트는
+`GET /changes?since=<seq>` 로 마지막으로 받은 순번 이후의 변경만 가져옵니다.
+
+- 로그 INSERT 전에 트랜잭션 advisory lock 을 잡으므로 로그를 쓴 트랜잭션은
+  순번을 받은 순서대로 커밋됩니다. 따라서 읽는 쪽은 항상 빈틈 없는 순번 구간을 보며,
+  커밋이 늦은 트랜잭션의 작은 순번을 건너뛰는 일이 없습니다.
+- 질의문 변경은 상위 FAQ 의 upsert 로 기록합니다 (FAQ 단위로 동기화).
+- 사용 빈도/조회수처럼 자주 바뀌는 카운터는 기록하지 않습니다.
+- 보관 기간이 지난 로그는 백그라운드 작업이 정리하며, 정리된 구간 이전의
+  순번을 요청한 클라이언트는 전체 재동기화(410)가 필요합니다.
+- 커밋 후 `notify_changes` 가 Redis 채널에 알림을 보내 각 Pod 의 SSE 브로드캐스터를 깨웁니다.
+  알림은 힌트일 뿐이며 실제 변경 내용은 항상 로그에서 읽습니다.
+- 로컬 모드(SQLite)는 쓰기 트랜잭션이 데이터베이스 단위로 직렬화되므로 advisory lock 없이 같은 순서가 보장됩니다.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.redis import redis_connection_pool
+from app.db.local import is_sqlite
+
+logger = logging.getLogger(__name__)
+
+# 로그를 쓰는 트랜잭션을 커밋 순서대로 직렬화하는 advisory lock 키
+CHANGE_LOG_LOCK_KEY = 72_037_001
+
+ENTITY_FAQ = "faq"
+ENTITY_TAG = "tag"
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+
+PRUNE_INTERVAL = 3600  # 로그 정리 주기(초)
+
+# 변경 알림 채널 (내용 없는 wake-up 힌트)
+CHANGE_CHANNEL = "{officeplus_faq:changes}:notify"
+
+INSERT_CHANGE_SQL = """
+    INSERT INTO catalog_changes (entity, entity_id, op, changed_at)
+    VALUES (:entity, :entity_id, :op, CAST(:now AS TIMESTAMP))
+"""
+
+# 같은 대상이 한 페이지에 여러 번 나오면 마지막 변경만 남깁니다 (순번 순서 유지).
+READ_PAGE_SQL = """
+    WITH page AS (
+        SELECT seq, entity, entity_id, op
+        FROM catalog_changes
+        WHERE seq > :since
+        ORDER BY seq
+        LIMIT :limit
+    )
+    SELECT seq, entity, entity_id, op, (SELECT max(seq) FROM page) AS last_seq
+    FROM (
+        SELECT DISTINCT ON (entity, entity_id) seq, entity, entity_id, op
+        FROM page
+        ORDER BY entity, entity_id, seq DESC
+    ) latest
+    ORDER BY seq
+"""
+
+# SQLite: DISTINCT ON 대신 대상별 최대 순번
+SQLITE_READ_PAGE_SQL = """
+    WITH page AS (
+        SELECT seq, entity, entity_id, op
+        FROM catalog_changes
+        WHERE seq > :since
+        ORDER BY seq
+        LIMIT :limit
+    )
+    SELECT seq, entity, entity_id, op, (SELECT max(seq) FROM page) AS last_seq
+    FROM page
+    WHERE seq IN (SELECT max(seq) FROM page GROUP BY entity, entity_id)
+    ORDER BY seq
+"""
+
+LOG_BOUNDS_SQL = "SELECT min(seq), max(seq) FROM catalog_changes"
+LATEST_SEQ_SQL = "SELECT COALESCE(max(seq), 0) FROM catalog_changes"
+
+# 보관 기간이 지난 로그를 지우되 마지막 행은 남겨 순번 경계를 확인할 수 있게 합니다.
+PRUNE_SQL = """
+    DELETE FROM catalog_changes
+    WHERE changed_at < CAST(:cutoff AS TIMESTAMP)
+      AND seq < (SELECT max(seq) FROM catalog_changes)
+"""
+
+# SQLite 에서 CAST(... AS TIMESTAMP) 는 숫자로 변환되므로 시각은 DateTime 타입 바인딩으로 넘깁니다.
+SQLITE_INSERT_CHANGE_SQL = """
+    INSERT INTO catalog_changes (entity, entity_id, op, changed_at)
+    VALUES (:entity, :entity_id, :op, :now)
+"""
+
+SQLITE_PRUNE_SQL = """
+    DELETE FROM catalog_changes
+    WHERE changed_at < :cutoff
+      AND seq < (SELECT max(seq) FROM catalog_changes)
+"""
+
+
+class ChangeLogExpiredError(Exception):
+    """요청한 순번 이후의 로그 일부가 이미 정리됨 (전체 재동기화 필요)"""
+
+    def __init__(self, since: int, oldest_seq: int):
+        super().__init__(f"Changes after {since} were pruned; oldest available seq is {oldest_seq}")
+        self.since = since
+        self.oldest_seq = oldest_seq
+
+
+async def record_changes(conn, changes: Iterable[Tuple[str, int, str]]) -> None:
+    """(entity, entity_id, op) 목록을 변경 로그에 기록합니다.
+
+    커밋 순서 보장을 위해 트랜잭션이 끝날 때까지 lock 을 잡으므로,
+    호출 측 트랜잭션에서 커밋 직전에 호출해야 합니다. conn 은 AsyncSession 또는 AsyncConnection.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {"entity": entity, "entity_id": entity_id, "op": op, "now": now}
+        for entity, entity_id, op in dict.fromkeys(changes)
+    ]
+    if not rows:
+        return
+    if is_sqlite(conn):
+        await conn.execute(text(SQLITE_INSERT_CHANGE_SQL).bindparams(bindparam("now", type_=DateTime)), rows)
+        return
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOG_LOCK_KEY})
+    await conn.execute(text(INSERT_CHANGE_SQL), rows)
+
+
+async def lock_change_log(conn) -> None:
+    """집합 단위로 로그를 INSERT 하는 호출자(임포터)용 lock"""
+    if is_sqlite(conn):
+        return
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOG_LOCK_KEY})
+
+
+def notify_changes() -> None:
+    """커밋 후 다른 Pod 의 브로드캐스터를 깨웁니다. 실패해도 폴링으로 전달되므로 경고만 남깁니다."""
+    try:
+        redis_connection_pool.get_connection().publish(CHANGE_CHANNEL, "1")
+    except Exception as e:
+        logger.warning(f"변경 알림 발행 실패: {e}")
+
+
+async def get_latest_seq(conn) -> int:
+    """가장 최근 변경 순번 (로그가 비어 있으면 0)"""
+    return int((await conn.execute(text(LATEST_SEQ_SQL))).scalar())
+
+
+async def read_change_page(conn, since: int, limit: int) -> Dict[str, Any]:
+    """since 이후의 변경을 최대 limit 개 순번 범위에서 읽습니다.
+
+    Returns:
+        dict: changes (seq, entity, id, op 목록), next_since, has_more
+
+    Raises:
+        ChangeLogExpiredError: since 이후의 로그 일부가 이미 정리된 경우
+    """
+    oldest_seq, latest_seq = (await conn.execute(text(LOG_BOUNDS_SQL))).first()
+    if oldest_seq is not None and since < oldest_seq - 1:
+        raise ChangeLogExpiredError(since, oldest_seq)
+
+    sql = SQLITE_READ_PAGE_SQL if is_sqlite(conn) else READ_PAGE_SQL
+    rows = (await conn.execute(text(sql), {"since": since, "limit": limit})).all()
+    changes: List[Dict[str, Any]] = [
+        {"seq": seq, "entity": entity, "id": entity_id, "op": op}
+        for seq, entity, entity_id, op, _ in rows
+    ]
+    next_since = rows[0].last_seq if rows else max(since, 0)
+    return {
+        "changes": changes,
+        "next_since": next_since,
+        "has_more": latest_seq is not None and next_since < latest_seq,
+    }
+
+
+async def prune_change_log(engine: AsyncEngine, retention_days: int) -> int:
+    """보관 기간이 지난 변경 로그를 삭제합니다. 삭제한 행 수를 반환합니다."""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    async with engine.begin() as conn:
+        if is_sqlite(conn):
+            prune = text(SQLITE_PRUNE_SQL).bindparams(bindparam("cutoff", type_=DateTime))
+            result = await conn.execute(prune, {"cutoff": cutoff})
+        else:
+            result = await conn.execute(text(PRUNE_SQL), {"cutoff": cutoff})
+    return result.rowcount
+
+
+async def run_change_log_pruner(engine: AsyncEngine, retention_days: int, interval: Optional[float] = None) -> None:
+    """lifespan 동안 주기적으로 오래된 변경 로그를 정리하는 백그라운드 루프"""
+    interval = interval or PRUNE_INTERVAL
+    logger.info(f"✅ 변경 로그 정리 작업 시작 (보관: {retention_days}일)")
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            deleted = await prune_change_log(engine, retention_days)
+            if deleted:
+                logger.info(f"변경 로그 정리 완료: {deleted}건")
+        except asyncio.CancelledError:
+            logger.info("🛑 변경 로그 정리 작업 종료")
+            raise
+        except Exception as e:
+            logger.error(f"변경 로그 정리 오류: {e}")
@@ -0,0 +1,315 @@
+"""CSV 임포트 백그라운드 작업
+
+`POST /imports` 로 업로드된 CSV 는 디스크에 저장된 뒤, 업로드를 받은 Pod 의
+asyncio task 에서 앱 엔진(settings.postgres_dsn 풀)으로 `import_catalog` 를 실행합니다.
+
+- 진행 상황은 Redis 해시에 기록되므로 어느 Pod 에서든 `GET /imports/{id}` 로 조회할 수 있습니다.
+- 취소 요청은 Redis 플래그로 전달되고, 작업을 실행 중인 Pod 의 watcher 가 task 를 취소합니다.
+  커밋 단계(`committing`)부터는 취소를 받지 않으며, 커밋 도중 도착한 취소는 무시됩니다.
+- 임포트 전체가 한 트랜잭션이므로 취소/실패 시 카탈로그는 변경되지 않습니다.
+- 카탈로그 전체를 병합하므로 동시에 하나의 작업만 실행되도록 Redis 락을 사용합니다.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import UploadFile
+
+from app.core.changes import notify_changes
+from app.core.redis import redis_connection_pool
+from app.importer import import_catalog
+
+logger = logging.getLogger(__name__)
+
+# 모든 키를 같은 hash slot 에 두어 Redis Cluster 에서도 락 해제 스크립트가 동작하도록 합니다.
+IMPORT_KEY_PREFIX = "{officeplus_faq:imports}"
+JOB_KEY_PREFIX = f"{IMPORT_KEY_PREFIX}:job:"
+LOCK_KEY = f"{IMPORT_KEY_PREFIX}:lock"
+
+JOB_TTL_SECONDS = 7 * 24 * 3600  # 작업 기록 보관 기간
+LOCK_TTL_SECONDS = 60  # 실행 중에는 watcher 가 주기적으로 연장
+WATCH_INTERVAL = 1.0  # 취소 플래그 확인 / heartbeat 주기(초)
+PROGRESS_MIN_INTERVAL = 0.5  # 진행 상황 기록 최소 간격(초)
+UPLOAD_CHUNK_SIZE = 1 << 20  # 업로드 파일을 디스크로 복사하는 단위
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+TERMINAL_STATUSES = {STATUS_COMPLETED, STATUS_FAILED, STATUS_CANCELLED}
+
+_JSON_FIELDS = ("options", "errors", "stats")
+_INT_FIELDS = ("bytes_total", "bytes_read", "rows", "faqs", "variants", "error_count")
+_FLOAT_FIELDS = ("created_at", "started_at", "finished_at", "updated_at", "heartbeat_at")
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# 이 Pod 에서 실행 중인 작업
+_local_jobs: Dict[str, asyncio.Task] = {}
+# 커밋 단계에 들어간 이 Pod 의 작업 (watcher 가 취소 플래그를 무시)
+_committing_jobs: Set[str] = set()
+
+
+def job_key(job_id: str) -> str:
+    """작업 상태 해시 키"""
+    return f"{JOB_KEY_PREFIX}{job_id}"
+
+
+def new_job_id() -> str:
+    """새 작업 ID"""
+    return uuid.uuid4().hex
+
+
+async def save_upload(upload: UploadFile, path: Path) -> int:
+    """업로드 파일을 메모리에 모으지 않고 청크 단위로 디스크에 저장합니다. 저장한 바이트 수를 반환합니다.
+
+    큰 파일은 저장에 시간이 걸리므로 그동안 임포트 락을 연장합니다.
+    """
+    redis_conn = redis_connection_pool.get_connection()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    size = 0
+    last_refresh = time.monotonic()
+    with open(path, "wb") as out:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(out.write, chunk)
+            size += len(chunk)
+            if time.monotonic() - last_refresh > WATCH_INTERVAL:
+                redis_conn.expire(LOCK_KEY, LOCK_TTL_SECONDS)
+                last_refresh = time.monotonic()
+    return size
+
+
+def acquire_import_lock(job_id: str) -> Optional[str]:
+    """임포트 락을 잡습니다. 다른 작업이 실행 중이면 그 작업 ID 를 반환합니다."""
+    redis_conn = redis_connection_pool.get_connection()
+    if redis_conn.set(LOCK_KEY, job_id, nx=True, ex=LOCK_TTL_SECONDS):
+        return None
+    return redis_conn.get(LOCK_KEY) or "unknown"
+
+
+def release_import_lock(job_id: str) -> None:
+    """자신이 잡은 락만 해제합니다."""
+    redis_conn = redis_connection_pool.get_connection()
+    release = redis_conn.register_script(_RELEASE_LOCK_SCRIPT)
+    release(keys=[LOCK_KEY], args=[job_id])
+
+
+def _save(job_id: str, fields: Dict[str, Any]) -> None:
+    redis_conn = redis_connection_pool.get_connection()
+    mapping = {
+        key: json.dumps(value, ensure_ascii=False) if key in _JSON_FIELDS else value
+        for key, value in fields.items()
+        if value is not None
+    }
+    pipe = redis_conn.pipeline()
+    pipe.hset(job_key(job_id), mapping=mapping)
+    pipe.expire(job_key(job_id), JOB_TTL_SECONDS)
+    pipe.execute()
+
+
+def create_job(job_id: str, filename: str, options: Dict[str, Any]) -> None:
+    """queued 상태의 작업 기록을 생성합니다."""
+    now = time.time()
+    _save(job_id, {
+        "status": STATUS_QUEUED,
+        "phase": "uploading",
+        "filename": filename,
+        "options": options,
+        "pod": socket.gethostname(),
+        "created_at": now,
+        "updated_at": now,
+        "cancel_requested": 0,
+    })
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """작업 상태를 조회합니다 (진행률, 처리 속도 포함)."""
+    redis_conn = redis_connection_pool.get_connection()
+    raw = redis_conn.hgetall(job_key(job_id))
+    if not raw:
+        return None
+
+    job: Dict[str, Any] = {"id": job_id}
+    for key, value in raw.items():
+        if key in _JSON_FIELDS:
+            job[key] = json.loads(value)
+        elif key in _INT_FIELDS:
+            job[key] = int(value)
+        elif key in _FLOAT_FIELDS:
+            job[key] = float(value)
+        else:
+            job[key] = value
+    job["cancel_requested"] = job.get("cancel_requested") == "1"
+
+    # 실행 Pod 가 heartbeat 없이 사라진 경우
+    now = time.time()
+    if job["status"] == STATUS_RUNNING and now - job.get("heartbeat_at", now) > LOCK_TTL_SECONDS:
+        job["status"] = STATUS_FAILED
+        job["message"] = "Import worker stopped responding"
+
+    bytes_total = job.get("bytes_total") or 0
+    if job["status"] == STATUS_COMPLETED:
+        job["percent"] = 100.0
+    elif bytes_total:
+        job["percent"] = round(min(job.get("bytes_read", 0) / bytes_total, 1.0) * 100, 1)
+    else:
+        job["percent"] = 0.0
+
+    started_at = job.get("started_at")
+    if started_at:
+        elapsed = job.get("finished_at", job.get("updated_at", now)) - started_at
+        job["elapsed_seconds"] = round(elapsed, 2)
+        job["rows_per_sec"] = round(job.get("rows", 0) / elapsed, 1) if elapsed > 0 else 0.0
+    return job
+
+
+def request_cancel(job_id: str) -> Optional[Dict[str, Any]]:
+    """작업 취소를 요청합니다. 실행 중인 Pod 의 watcher 가 플래그를 보고 task 를 취소합니다."""
+    job = get_job(job_id)
+    if job is None or job["status"] in TERMINAL_STATUSES:
+        return job
+    if job.get("phase") == "committing":
+        # 커밋이 시작된 뒤에는 결과가 반영되므로 취소하지 않습니다.
+        return job
+
+    _save(job_id, {"cancel_requested": 1, "updated_at": time.time()})
+    task = _local_jobs.get(job_id)
+    if task and job_id not in _committing_jobs:
+        task.cancel()
+    job["cancel_requested"] = True
+    return job
+
+
+def _progress_writer(job_id: str):
+    """import_catalog 의 progress 콜백 (Redis 쓰기를 PROGRESS_MIN_INTERVAL 로 제한)"""
+    last_write = 0.0
+    last_phase = None
+
+    def write(report: Dict[str, Any]) -> None:
+        nonlocal last_write, last_phase
+        if report["phase"] == "committing":
+            _committing_jobs.add(job_id)
+        now = time.time()
+        if report["phase"] == last_phase and now - last_write < PROGRESS_MIN_INTERVAL:
+            return
+        last_write, last_phase = now, report["phase"]
+        try:
+            _save(job_id, {
+                "phase": report["phase"],
+                "bytes_read": report["bytes_read"],
+                "rows": report["rows"],
+                "faqs": report["faqs"],
+                "variants": report["variants"],
+                "error_count": report["error_count"],
+                "errors": report["errors"],
+                "updated_at": now,
+            })
+        except Exception as e:
+            logger.warning(f"임포트 진행 상황 기록 실패 ({job_id}): {e}")
+
+    return write
+
+
+async def _watch(job_id: str, task: asyncio.Task) -> None:
+    """heartbeat/락 연장 및 다른 Pod 에서 온 취소 요청 감시"""
+    redis_conn = redis_connection_pool.get_connection()
+    while True:
+        await asyncio.sleep(WATCH_INTERVAL)
+        try:
+            pipe = redis_conn.pipeline()
+            pipe.hget(job_key(job_id), "cancel_requested")
+            pipe.hset(job_key(job_id), "heartbeat_at", time.time())
+            pipe.expire(LOCK_KEY, LOCK_TTL_SECONDS)
+            cancel_requested, _, _ = pipe.execute()
+        except Exception as e:
+            logger.warning(f"임포트 작업 상태 확인 실패 ({job_id}): {e}")
+            continue
+        if cancel_requested == "1":
+            if job_id in _committing_jobs:
+                # 커밋 중에는 취소하지 않고 heartbeat/락 연장만 계속합니다.
+                continue
+            logger.info(f"임포트 작업 취소 요청 수신: {job_id}")
+            task.cancel()
+            return
+
+
+async def _run_job(engine: AsyncEngine, job_id: str, path: str, options: Dict[str, Any]) -> None:
+    """작업 본문: import_catalog 실행 후 결과를 기록하고 락/업로드 파일을 정리합니다."""
+    now = time.time()
+    _save(job_id, {
+        "status": STATUS_RUNNING,
+        "phase": "staging",
+        "bytes_total": os.path.getsize(path),
+        "started_at": now,
+        "updated_at": now,
+        "heartbeat_at": now,
+    })
+    watcher = asyncio.create_task(_watch(job_id, asyncio.current_task()))
+    try:
+        report = await import_catalog(engine, path, progress=_progress_writer(job_id), **options)
+        now = time.time()
+        _save(job_id, {
+            "status": STATUS_COMPLETED,
+            "phase": "done",
+            "bytes_read": report["bytes_read"],
+            "rows": report["rows"],
+            "faqs": report["faqs"],
+            "variants": report["variants"],
+            "error_count": report["error_count"],
+            "errors": report["errors"],
+            "stats": report["stats"],
+            "finished_at": now,
+            "updated_at": now,
+        })
+        if not options.get("dry_run"):
+            notify_changes()
+        logger.info(f"✅ CSV 임포트 완료: {job_id}")
+    except asyncio.CancelledError:
+        now = time.time()
+        _save(job_id, {"status": STATUS_CANCELLED, "message": "Cancelled; no changes were applied", "finished_at": now, "updated_at": now})
+        logger.info(f"🛑 CSV 임포트 취소 (롤백됨): {job_id}")
+    except Exception as e:
+        now = time.time()
+        _save(job_id, {"status": STATUS_FAILED, "message": str(e), "finished_at": now, "updated_at": now})
+        logger.error(f"CSV 임포트 실패 ({job_id}): {e}")
+    finally:
+        watcher.cancel()
+        await asyncio.gather(watcher, return_exceptions=True)
+        _local_jobs.pop(job_id, None)
+        _committing_jobs.discard(job_id)
+        try:
+            release_import_lock(job_id)
+        except Exception as e:
+            logger.warning(f"임포트 락 해제 실패 ({job_id}): {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def start_job(engine: AsyncEngine, job_id: str, path: str, options: Dict[str, Any]) -> asyncio.Task:
+    """이 Pod 에서 임포트 작업을 시작합니다 (호출 전에 acquire_import_lock 필요)."""
+    task = asyncio.create_task(_run_job(engine, job_id, path, options))
+    _local_jobs[job_id] = task
+    return task
+
+
+async def cancel_local_jobs() -> None:
+    """종료 시 이 Pod 에서 실행 중인 작업을 취소합니다 (각 작업은 롤백됩니다)."""
+    tasks = list(_local_jobs.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
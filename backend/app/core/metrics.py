@@ -0,0 +1,263 @@
+"""Prometheus 메트릭 (라우트 지연, DB 풀, Redis, 캐시)
+
+`/metrics` 로 다음을 노출합니다.
+
+- HTTP: 라우트 템플릿별 요청 수/응답 시작까지의 지연 (ASGI 미들웨어)
+- DB: 커넥션 풀 checkout 대기 시간과 타임아웃 수, 쿼리 실행 시간 (풀 서브클래스, 커서 이벤트)
+- Redis: 명령별 지연/오류 수 (`execute_command` 래핑), 세션 검증 재시도와 재연결 수
+- 캐시: 캐시별 hit/miss 수
+
+uvicorn 을 여러 워커로 실행할 때는 `PROMETHEUS_MULTIPROC_DIR` 를 지정합니다.
+각 워커는 자기 프로세스의 mmap 파일에만 쓰고 (워커 간 잠금 없음),
+`/metrics` 가 요청 시점에 모든 워커의 파일을 합산합니다. 디렉터리는 서버 시작 전에 비워야 합니다.
+
+라벨 조합별 child 를 미리 캐시해 두므로 요청당 추가 비용은 카운터/히스토그램 갱신
+몇 번 (수 µs) 입니다. prometheus_client 가 없거나 METRICS_ENABLED=false 면
+미들웨어/풀/Redis 계측을 붙이지 않고 기록 함수는 아무 일도 하지 않습니다.
+"""
+import logging
+import os
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "faq"
+UNMATCHED_ROUTE = "unmatched"
+
+# 풀 checkout 은 대부분 수십 µs, 풀이 고갈되면 pool_timeout(30초)까지 기다립니다.
+POOL_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+REDIS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+
+
+def _prometheus():
+    """prometheus_client 모듈 (없거나 비활성화면 None)"""
+    if not settings.metrics_enabled:
+        return None
+    try:
+        import prometheus_client
+    except ImportError:
+        logger.warning("prometheus_client 가 설치되어 있지 않아 메트릭을 수집하지 않습니다")
+        return None
+    return prometheus_client
+
+
+_prom = _prometheus()
+enabled = _prom is not None
+
+if enabled:
+    HTTP_REQUESTS = _prom.Counter(
+        "http_requests", "HTTP requests by route template and status", ["method", "route", "status"],
+        namespace=NAMESPACE,
+    )
+    HTTP_LATENCY = _prom.Histogram(
+        "http_request_duration_seconds", "Time until the response starts, by route template", ["method", "route"],
+        namespace=NAMESPACE,
+    )
+    DB_POOL_WAIT = _prom.Histogram(
+        "db_pool_checkout_seconds", "Time spent waiting for a connection from the SQLAlchemy pool",
+        namespace=NAMESPACE, buckets=POOL_BUCKETS,
+    )
+    DB_POOL_TIMEOUTS = _prom.Counter(
+        "db_pool_timeouts", "Connection checkouts that hit pool_timeout", namespace=NAMESPACE,
+    )
+    DB_QUERY_LATENCY = _prom.Histogram(
+        "db_query_duration_seconds", "Cursor execution time of SQL statements",
+        namespace=NAMESPACE, buckets=QUERY_BUCKETS,
+    )
+    REDIS_LATENCY = _prom.Histogram(
+        "redis_command_duration_seconds", "Redis command latency", ["command"],
+        namespace=NAMESPACE, buckets=REDIS_BUCKETS,
+    )
+    REDIS_ERRORS = _prom.Counter(
+        "redis_command_errors", "Redis commands that raised", ["command"], namespace=NAMESPACE,
+    )
+    REDIS_RETRIES = _prom.Counter(
+        "redis_retries", "Retries after a Redis error (e.g. cluster MOVED during session validation)",
+        ["operation"], namespace=NAMESPACE,
+    )
+    REDIS_RECONNECTS = _prom.Counter(
+        "redis_reconnects", "Redis client re-initializations (refresh_connection)", namespace=NAMESPACE,
+    )
+    CACHE_REQUESTS = _prom.Counter(
+        "cache_requests", "Cache lookups by cache and result (hit/miss)", ["cache", "result"],
+        namespace=NAMESPACE,
+    )
+
+# 라벨 조합별 child 캐시 (labels() 호출 비용 절약, 라벨 값은 라우트 템플릿/명령 이름이라 유한)
+_http_children: Dict[Tuple[str, str, int], Tuple[Any, Any]] = {}
+_redis_children: Dict[str, Tuple[Any, Any]] = {}
+
+
+# ==================== HTTP ====================
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def _observe_request(scope: Scope, status: int, elapsed: float) -> None:
+    key = (scope["method"], _route_template(scope), status)
+    children = _http_children.get(key)
+    if children is None:
+        method, route, _ = key
+        children = (HTTP_REQUESTS.labels(method, route, str(status)), HTTP_LATENCY.labels(method, route))
+        _http_children[key] = children
+    children[0].inc()
+    children[1].observe(elapsed)
+
+
+class MetricsMiddleware:
+    """요청 수와 응답 시작까지의 시간을 라우트 템플릿별로 기록하는 순수 ASGI 미들웨어
+
+    스트리밍 응답(내보내기, SSE)은 첫 바이트까지의 시간을 기록하므로 연결 유지 시간이 섞이지 않습니다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        responded = False
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal responded
+            if message["type"] == "http.response.start":
+                responded = True
+                _observe_request(scope, message["status"], perf_counter() - started)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        except BaseException:
+            if not responded:
+                _observe_request(scope, 500, perf_counter() - started)
+            raise
+
+
+# ==================== Database ====================
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """checkout 대기 시간과 타임아웃을 기록하는 asyncio 커넥션 풀"""
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_WAIT.observe(perf_counter() - started)
+
+
+def pool_class():
+    """create_async_engine 의 poolclass (비활성화면 None = 기본 풀)"""
+    return InstrumentedAsyncPool if enabled else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if starts:
+        DB_QUERY_LATENCY.observe(perf_counter() - starts.pop())
+
+
+def instrument_engine(engine) -> None:
+    """AsyncEngine 의 커서 실행 이벤트에 쿼리 시간 기록을 연결합니다."""
+    if not enabled:
+        return
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ==================== Redis ====================
+
+def _redis_children_for(command: str) -> Tuple[Any, Any]:
+    children = _redis_children.get(command)
+    if children is None:
+        children = (REDIS_LATENCY.labels(command), REDIS_ERRORS.labels(command))
+        _redis_children[command] = children
+    return children
+
+
+def instrument_redis(client) -> None:
+    """Redis 클라이언트의 execute_command 를 감싸 명령별 지연/오류를 기록합니다 (pub/sub, 파이프라인 제외)."""
+    if not enabled or client is None or getattr(client, "_metrics_instrumented", False):
+        return
+    execute_command: Callable[..., Any] = client.execute_command
+
+    def instrumented_execute_command(*args, **options):
+        name = args[0] if args else "UNKNOWN"
+        if isinstance(name, bytes):
+            name = name.decode("ascii", "replace")
+        latency, errors = _redis_children_for(str(name).upper())
+        started = perf_counter()
+        try:
+            return execute_command(*args, **options)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            latency.observe(perf_counter() - started)
+
+    client.execute_command = instrumented_execute_command
+    client._metrics_instrumented = True
+
+
+def record_redis_retry(operation: str) -> None:
+    """Redis 오류 후 재시도 1회를 기록합니다."""
+    if enabled:
+        REDIS_RETRIES.labels(operation).inc()
+
+
+def record_redis_reconnect() -> None:
+    """Redis 클라이언트 재초기화 1회를 기록합니다."""
+    if enabled:
+        REDIS_RECONNECTS.inc()
+
+
+# ==================== Cache ====================
+
+def record_cache(cache: str, hit: bool) -> None:
+    """캐시 조회 결과를 기록합니다."""
+    if enabled:
+        CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+# ==================== Exposition ====================
+
+def render_metrics() -> Tuple[bytes, str]:
+    """/metrics 응답 본문과 Content-Type (멀티프로세스 모드면 모든 워커 합산)"""
+    if settings.metrics_multiproc_dir:
+        from prometheus_client import multiprocess
+
+        registry = _prom.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = _prom.REGISTRY
+    return _prom.generate_latest(registry), _prom.CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: Optional[int] = None) -> None:
+    """워커 종료 시 멀티프로세스 파일 중 살아 있는 프로세스 전용 값(live gauge)을 정리합니다."""
+    if enabled and settings.metrics_multiproc_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,263 @@
+"""요청 단위 프로파일링과 워커 전체 백그라운드 샘플링
+
+p99 가 튈 때 시간이 Pydantic/ORM 하이드레이션/Redis 대기/이벤트 루프 중 어디에 쓰이는지 보기 위한 도구입니다.
+
+- 요청 단위: `X-Profile-Token: <PROFILER_TOKEN>` 헤더가 붙은 요청 하나만 pyinstrument 로 샘플링합니다.
+  async 모드로 실행하므로 같은 워커의 다른 요청은 섞이지 않고, await 로 기다린 시간은
+  `[await]` 로 표시됩니다. 형식은 `X-Profile` 헤더 또는 `?profile=` 로 고릅니다.
+  - `speedscope` (기본): `PROFILE_DIR/requests/` 에 speedscope JSON (플레임 그래프) 을 저장하고
+    응답에 `X-Profile-File` 헤더로 파일 이름을 알려 줍니다. 원래 응답은 그대로 반환됩니다.
+  - `html`: 원래 응답 대신 pyinstrument HTML 보고서를 반환합니다.
+- 백그라운드: `PROFILE_SAMPLING_ENABLED=true` 면 별도 스레드가 `PROFILE_SAMPLING_INTERVAL` 마다
+  워커의 모든 스레드 스택을 `sys._current_frames()` 로 읽어 `PROFILE_SAMPLING_WINDOW` 초마다
+  `PROFILE_DIR/worker/` 에 folded stack 파일 (flamegraph.pl, speedscope 에서 열림) 로 씁니다.
+  디렉터리별로 최근 `PROFILE_KEEP` 개 파일만 남깁니다.
+
+PROFILER_TOKEN 이 없거나 pyinstrument 가 설치되어 있지 않으면 미들웨어를 붙이지 않고,
+백그라운드 샘플링이 꺼져 있으면 스레드를 만들지 않으므로 비활성화 시 요청당 비용은 없습니다.
+"""
+import asyncio
+import logging
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = b"x-profile-token"
+FORMAT_HEADER = b"x-profile"
+FORMAT_QUERY = "profile"
+FILE_HEADER = b"x-profile-file"
+FORMATS = ("speedscope", "html")
+
+REQUEST_DIR = "requests"
+WORKER_DIR = "worker"
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+def _pyinstrument():
+    """pyinstrument 모듈 (없으면 None)"""
+    try:
+        import pyinstrument
+    except ImportError:
+        return None
+    return pyinstrument
+
+
+def _timestamp() -> str:
+    now = time.time()
+    return time.strftime("%Y%m%dT%H%M%S", time.localtime(now)) + f"{int(now % 1 * 1000):03d}"
+
+
+def _prune(directory: Path, pattern: str, keep: int) -> None:
+    """directory 에서 pattern 에 맞는 파일 중 최근 keep 개만 남깁니다."""
+    files = sorted(directory.glob(pattern), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in files[keep:]:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _write_file(directory: Path, name: str, content: str, pattern: str, keep: int) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+    _prune(directory, pattern, keep)
+    return path
+
+
+# ==================== Per-request profiling ====================
+
+class ProfilingMiddleware:
+    """토큰이 맞는 요청 하나를 pyinstrument 로 샘플링하는 순수 ASGI 미들웨어
+
+    토큰이 없는 요청은 헤더 확인 한 번 외에는 그대로 통과합니다.
+    """
+
+    def __init__(self, app: ASGIApp, token: str, profile_dir: Path, interval: float, keep: int):
+        self.app = app
+        self.token = token.encode("latin-1")
+        self.profile_dir = profile_dir / REQUEST_DIR
+        self.interval = interval
+        self.keep = keep
+        self._pyinstrument = _pyinstrument()
+
+    def _requested_format(self, scope: Scope) -> Optional[str]:
+        """프로파일링할 요청이면 출력 형식, 아니면 None"""
+        token = None
+        output = None
+        for name, value in scope.get("headers", ()):
+            if name == TOKEN_HEADER:
+                token = value
+            elif name == FORMAT_HEADER:
+                output = value.decode("latin-1").strip().lower()
+        if token is None or not secrets.compare_digest(token, self.token):
+            return None
+        if not output:
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            output = (query.get(FORMAT_QUERY) or [""])[0].strip().lower()
+        return output if output in FORMATS else FORMATS[0]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        output = self._requested_format(scope)
+        if output is None:
+            await self.app(scope, receive, send)
+            return
+
+        profiler = self._pyinstrument.Profiler(interval=self.interval, async_mode="enabled")
+        if output == "html":
+            await self._profile_to_html(profiler, scope, receive, send)
+        else:
+            await self._profile_to_file(profiler, scope, receive, send)
+
+    async def _profile_to_file(self, profiler, scope: Scope, receive: Receive, send: Send) -> None:
+        """프로파일을 speedscope JSON 으로 저장하고 파일 이름을 응답 헤더에 붙입니다.
+
+        헤더는 응답 시작 시점에 붙여야 하므로 응답 시작 전까지(핸들러 실행 구간)를 프로파일링합니다.
+        """
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        slug = _SLUG_RE.sub("_", scope["path"]).strip("_")[:80] or "root"
+        name = f"{_timestamp()}-{os.getpid()}-{scope['method']}-{slug}.speedscope.json"
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start" and profiler.is_running:
+                session = profiler.stop()
+                content = SpeedscopeRenderer().render(session)
+                await asyncio.to_thread(_write_file, self.profile_dir, name, content, "*.speedscope.json", self.keep)
+                logger.info(f"요청 프로파일 저장: {scope['method']} {scope['path']} -> {self.profile_dir / name}")
+                message["headers"] = list(message.get("headers", [])) + [(FILE_HEADER, name.encode("latin-1"))]
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            if profiler.is_running:
+                profiler.stop()
+
+    async def _profile_to_html(self, profiler, scope: Scope, receive: Receive, send: Send) -> None:
+        """원래 응답을 버리고 응답 전체 구간의 HTML 보고서를 반환합니다."""
+        status = None
+
+        async def discard(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+        body = profiler.output_html().encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/html; charset=utf-8"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"cache-control", b"no-store"),
+                (b"x-profiled-status", str(status).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def request_profiling_available(token: Optional[str]) -> bool:
+    """요청 단위 프로파일링 미들웨어를 붙일 수 있는지 (토큰 설정 + pyinstrument 설치)"""
+    if not token:
+        return False
+    if _pyinstrument() is None:
+        logger.warning("pyinstrument 가 설치되어 있지 않아 요청 프로파일링을 사용하지 않습니다")
+        return False
+    return True
+
+
+# ==================== Background sampling ====================
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class WorkerSampler:
+    """워커 프로세스의 모든 스레드를 주기적으로 샘플링해 folded stack 파일로 쓰는 백그라운드 스레드
+
+    샘플마다 GIL 을 잠깐 잡고 스택을 읽을 뿐 파이썬 함수 호출을 가로채지 않으므로
+    오버헤드는 샘플 간격과 스택 깊이에만 비례합니다.
+    """
+
+    def __init__(self, profile_dir: Path, interval: float, window: float, keep: int):
+        self.profile_dir = profile_dir / WORKER_DIR
+        self.interval = interval
+        self.window = window
+        self.keep = keep
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"✅ 워커 샘플링 시작: {self.interval * 1000:.0f}ms 간격, {self.window:g}초마다 {self.profile_dir} 에 저장"
+        )
+
+    def stop(self) -> None:
+        """샘플링을 멈추고 진행 중인 구간을 저장합니다."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=max(self.interval * 10, 5.0))
+        self._thread = None
+        logger.info("🛑 워커 샘플링 중지")
+
+    def _sample(self, stacks: Counter, own_ident: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            stacks[";".join(reversed(labels))] += 1
+
+    def _flush(self, stacks: Counter) -> None:
+        if not stacks:
+            return
+        name = f"{_timestamp()}-{os.getpid()}.folded"
+        content = "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+        try:
+            _write_file(self.profile_dir, name, content, "*.folded", self.keep)
+        except OSError as e:
+            logger.warning(f"워커 프로파일 저장 실패: {e}")
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        stacks: Counter = Counter()
+        window_end = time.monotonic() + self.window
+        while not self._stop.wait(self.interval):
+            self._sample(stacks, own_ident)
+            if time.monotonic() >= window_end:
+                self._flush(stacks)
+                stacks = Counter()
+                window_end = time.monotonic() + self.window
+        self._flush(stacks)
@@ -8,6 +8,9 @@ import json
 from typing import Optional, Union, List, Dict, Any
 from datetime import datetime
 
+from app.core import request_stats
+from app.core.metrics import instrument_redis, record_redis_reconnect
+
 logger = logging.getLogger(__name__)
 
 MAX_CONNECTION_POOL = 20
@@ -23,6 +26,8 @@ class RedisConfig:
         self.db = int(os.getenv('REDIS_DB', 0))
         self.password = os.getenv('REDIS_PASSWORD', '')
         self.cluster_mode = os.getenv('REDIS_CLUSTER_MODE', 'false').lower() == 'true'
+        # LOCAL_BACKEND=true: 프로세스 안의 인메모리 Redis (fakeredis) 를 사용
+        self.in_memory = os.getenv('LOCAL_BACKEND', 'false').lower() == 'true'
 
         # Redis URL 생성
         if self.password:
@@ -30,11 +35,33 @@ class RedisConfig:
         else:
             self.url = f"redis://{self.host}:{self.port}"
 
-        logger.info(f"Redis 설정: {self.host}:{self.port}, 클러스터 모드: {self.cluster_mode}")
+        if self.in_memory:
+            logger.info("Redis 설정: 인메모리 (LOCAL_BACKEND)")
+        else:
+            logger.info(f"Redis 설정: {self.host}:{self.port}, 클러스터 모드: {self.cluster_mode}")
 
 
 redis_config = RedisConfig()
 
+# 로컬 모드에서 모든 클라이언트(연결 풀, 세션 관리자)가 공유하는 인메모리 서버
+_in_memory_server = None
+
+
+def in_memory_client() -> redis.Redis:
+    """프로세스 안의 인메모리 Redis 클라이언트 (fakeredis)
+
+    같은 프로세스의 클라이언트는 모두 한 서버를 공유하므로 pub/sub, 락, 세션이 그대로 동작합니다.
+    Lua 스크립트(register_script)는 lupa 가 필요합니다 (`pip install 'fakeredis[lua]'`).
+    """
+    global _in_memory_server
+    try:
+        import fakeredis
+    except ImportError as e:
+        raise RuntimeError("LOCAL_BACKEND=true 에는 fakeredis 패키지가 필요합니다 (pip install 'fakeredis[lua]')") from e
+    if _in_memory_server is None:
+        _in_memory_server = fakeredis.FakeServer()
+    return fakeredis.FakeRedis(server=_in_memory_server, decode_responses=True)
+
 
 class RedisConnectionPool:
     """Redis 연결 풀 관리"""
@@ -52,6 +79,14 @@ class RedisConnectionPool:
 
     def _init_connection(self):
         """Redis 연결을 초기화합니다"""
+        if redis_config.in_memory:
+            self._is_cluster = False
+            self._redis_client = in_memory_client()
+            logger.info("Redis 인메모리 연결 초기화 (LOCAL_BACKEND)")
+            instrument_redis(self._redis_client)
+            request_stats.instrument_redis(self._redis_client)
+            return
+
         try:
             if redis_config.cluster_mode:
                 # Redis Cluster 모드
@@ -132,8 +167,12 @@ class RedisConnectionPool:
                 logger.error(f"Redis 폴백 연결도 실패: {fallback_error}")
                 raise
 
+        instrument_redis(self._redis_client)
+        request_stats.instrument_redis(self._redis_client)
+
     def refresh_connection(self):
         """연결을 새로 고침합니다"""
+        record_redis_reconnect()
         try:
             if self._is_cluster and hasattr(self._redis_client, 'reset'):
                 self._redis_client.reset()
@@ -219,7 +258,10 @@ class RedisSessionManager:
     async def startup(self):
         """Redis 연결 초기화"""
         try:
-            if redis_config.cluster_mode:
+            if redis_config.in_memory:
+                self.redis = in_memory_client()
+                logger.info("Redis 인메모리 연결 (LOCAL_BACKEND)")
+            elif redis_config.cluster_mode:
                 self.redis = RedisCluster.from_url(
                     redis_config.url,
                     encoding="utf-8",
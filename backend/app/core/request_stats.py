@@ -0,0 +1,211 @@
+"""요청 단위 SQL/Redis 호출 집계와 반복 쿼리(N+1) 감지
+
+요청마다 SQL 문 수/시간, Redis 명령 수/시간, 문장 형태(shape)별 실행 횟수를 모읍니다.
+
+- `RequestStatsMiddleware` 가 요청마다 집계기를 만들고, 응답 헤더에
+  `Server-Timing: db;dur=..;desc="N queries", redis;dur=..;desc="N commands", app;dur=..` 를 붙입니다.
+- 같은 형태의 문장이 `QUERY_REPEAT_THRESHOLD` 번을 넘게 실행되면 (루프 안의 쿼리)
+  경고 로그를 남기고 Server-Timing 에 `repeat` 항목을 추가합니다.
+- 테스트에서는 `query_budget()` 으로 구간(엔드포인트 호출)의 쿼리 수 상한을 검사할 수 있습니다.
+
+집계기는 contextvar 로 전달되므로 같은 요청(태스크) 안의 호출만 집계됩니다.
+문장 형태는 SQLAlchemy 가 만든 파라미터화된 SQL 에서 공백과 IN 목록의 플레이스홀더 개수를 정규화한 것입니다.
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+SHAPE_LOG_LENGTH = 200  # 로그에 남기는 문장 길이
+
+_PLACEHOLDER_LIST_RE = re.compile(r"(?:\$\d+|%\(\w+\)s|\?)(?:::\w+)?(?:\s*,\s*(?:\$\d+|%\(\w+\)s|\?)(?:::\w+)?)+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """파라미터 개수만 다른 문장을 같은 형태로 봅니다 (IN 목록 등)."""
+    return _PLACEHOLDER_LIST_RE.sub("?, ...", _WHITESPACE_RE.sub(" ", statement).strip())
+
+
+class RequestStats:
+    """한 요청(또는 측정 구간)의 SQL/Redis 호출 집계"""
+
+    __slots__ = ("db_count", "db_time", "redis_count", "redis_time", "shapes")
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_time = 0.0
+        self.redis_count = 0
+        self.redis_time = 0.0
+        self.shapes: Counter = Counter()
+
+    @property
+    def round_trips(self) -> int:
+        return self.db_count + self.redis_count
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """threshold 번을 넘게 실행된 문장 형태 (많은 순)"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def server_timing(self, total: Optional[float] = None, threshold: Optional[int] = None) -> str:
+        """Server-Timing 헤더 값"""
+        parts = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_count} queries"',
+            f'redis;dur={self.redis_time * 1000:.1f};desc="{self.redis_count} commands"',
+        ]
+        if threshold is not None:
+            repeated = self.repeated(threshold)
+            if repeated:
+                parts.append(f'repeat;desc="{repeated[0][1]}x same statement"')
+        if total is not None:
+            parts.append(f"app;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+# 현재 활성화된 집계기들 (요청 미들웨어 + 테스트의 query_budget 이 겹칠 수 있음)
+_active: ContextVar[Tuple[RequestStats, ...]] = ContextVar("request_stats", default=())
+
+
+@contextmanager
+def collect_stats() -> Iterator[RequestStats]:
+    """이 구간에서 실행된 SQL/Redis 호출을 집계합니다."""
+    stats = RequestStats()
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+# ==================== Hooks ====================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active.get():
+        conn.info.setdefault("request_stats_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _active.get()
+    starts = conn.info.get("request_stats_start")
+    if not collectors or not starts:
+        return
+    elapsed = perf_counter() - starts.pop()
+    shape = statement_shape(statement)
+    for stats in collectors:
+        stats.db_count += 1
+        stats.db_time += elapsed
+        stats.shapes[shape] += 1
+
+
+def instrument_engine(engine) -> None:
+    """AsyncEngine 의 커서 실행 이벤트에 요청 집계를 연결합니다."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def instrument_redis(client) -> None:
+    """Redis 클라이언트의 execute_command 를 감싸 요청별 명령 수/시간을 집계합니다."""
+    if client is None or getattr(client, "_request_stats_instrumented", False):
+        return
+    execute_command: Callable[..., Any] = client.execute_command
+
+    def counted_execute_command(*args, **options):
+        collectors = _active.get()
+        if not collectors:
+            return execute_command(*args, **options)
+        started = perf_counter()
+        try:
+            return execute_command(*args, **options)
+        finally:
+            elapsed = perf_counter() - started
+            for stats in collectors:
+                stats.redis_count += 1
+                stats.redis_time += elapsed
+
+    client.execute_command = counted_execute_command
+    client._request_stats_instrumented = True
+
+
+# ==================== Middleware ====================
+
+class RequestStatsMiddleware:
+    """요청별 SQL/Redis 집계를 Server-Timing 헤더로 내보내고 반복 쿼리를 경고하는 순수 ASGI 미들웨어"""
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        with collect_stats() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    timing = stats.server_timing(perf_counter() - started, self.repeat_threshold)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", timing.encode("latin-1"))
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                for shape, count in stats.repeated(self.repeat_threshold):
+                    logger.warning(
+                        f"반복 쿼리 감지: {scope['method']} {scope['path']} - 같은 문장 {count}회 "
+                        f"(전체 {stats.db_count}회): {shape[:SHAPE_LOG_LENGTH]}"
+                    )
+
+
+# ==================== Test helpers ====================
+
+class QueryBudgetExceeded(AssertionError):
+    """query_budget 구간의 호출 수가 상한을 넘음"""
+
+
+@contextmanager
+def query_budget(
+    max_queries: Optional[int] = None,
+    max_redis: Optional[int] = None,
+    max_repeats: Optional[int] = None,
+) -> Iterator[RequestStats]:
+    """구간 안의 SQL 문/Redis 명령 수와 같은 문장 반복 횟수의 상한을 검사합니다.
+
+    예::
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            with query_budget(max_queries=3, max_repeats=1):
+                await client.get("/p/faq/apis/faqs/1")
+
+    ASGITransport 는 앱을 같은 태스크에서 실행하므로 요청 안의 호출이 함께 집계됩니다.
+
+    Raises:
+        QueryBudgetExceeded: 상한을 넘은 경우 (AssertionError 하위 클래스)
+    """
+    with collect_stats() as stats:
+        yield stats
+    problems = []
+    if max_queries is not None and stats.db_count > max_queries:
+        problems.append(f"{stats.db_count} SQL statements (budget {max_queries})")
+    if max_redis is not None and stats.redis_count > max_redis:
+        problems.append(f"{stats.redis_count} Redis commands (budget {max_redis})")
+    if max_repeats is not None:
+        for shape, count in stats.repeated(max_repeats):
+            problems.append(f"{count}x {shape[:SHAPE_LOG_LENGTH]}")
+    if problems:
+        raise QueryBudgetExceeded("Query budget exceeded: " + "; ".join(problems))
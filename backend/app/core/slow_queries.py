@@ -0,0 +1,295 @@
+"""느린 SQL 문 기록과 EXPLAIN ANALYZE 수집
+
+`SLOW_QUERY_MS` 보다 오래 걸린 문장을 다음 정보와 함께 경고 로그로 남기고 형태(shape)별로 집계합니다.
+
+- 정규화된 문장 형태 (`request_stats.statement_shape`, IN 목록 길이만 다른 문장은 같은 형태)
+- 바인드 파라미터 요약 (숫자/불리언/None 은 값, 문자열은 길이만 - 검색어 등 원문은 남기지 않음)
+- 실행한 라우트 템플릿 (`SlowQueryMiddleware` 가 요청 scope 를 contextvar 로 전달, 요청 밖은 `background`)
+
+`SLOW_QUERY_EXPLAIN_RATE` 가 0 보다 크면 느린 SELECT 문 중 일부를 골라 같은 문장/파라미터로
+`EXPLAIN (ANALYZE, BUFFERS)` 를 별도 커넥션의 READ ONLY 트랜잭션에서 다시 실행하고 계획을 보관합니다.
+쓰기 문장은 EXPLAIN ANALYZE 가 실제로 실행하므로 계획을 수집하지 않으며, 같은 형태는
+`SLOW_QUERY_EXPLAIN_INTERVAL` 초에 한 번만 수집합니다.
+
+집계는 워커 프로세스별 메모리에 있고 `/debug/slow-queries` 가 형태별 횟수와 백분위수를 보여 줍니다.
+커서 이벤트는 이벤트 루프 스레드에서만 실행되므로 잠금 없이 갱신합니다.
+"""
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.core.request_stats import SHAPE_LOG_LENGTH, statement_shape
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_ROUTE = "background"
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS) "
+EXPLAIN_TIMEOUT_MS = 30000
+MAX_SUMMARY_PARAMS = 20
+MAX_ROUTES_PER_SHAPE = 20
+
+# 현재 요청의 ASGI scope (라우팅 후 scope["route"] 가 채워짐)
+_current_scope: ContextVar[Optional[Scope]] = ContextVar("slow_query_scope", default=None)
+# EXPLAIN 태스크 안에서 실행되는 문장은 다시 기록하지 않음
+_explaining: ContextVar[bool] = ContextVar("slow_query_explaining", default=False)
+
+
+def summarize_parameters(parameters: Any, executemany: bool = False) -> str:
+    """바인드 파라미터의 요약 (원문 문자열은 남기지 않음)"""
+    if executemany:
+        return f"executemany x{len(parameters)}"
+    if isinstance(parameters, dict):
+        items = list(parameters.values())
+    elif isinstance(parameters, (list, tuple)):
+        items = list(parameters)
+    else:
+        return ""
+
+    parts = []
+    for value in items[:MAX_SUMMARY_PARAMS]:
+        if value is None or isinstance(value, (bool, int, float)):
+            parts.append(repr(value))
+        elif isinstance(value, (str, bytes, list, tuple, set)):
+            parts.append(f"{type(value).__name__}({len(value)})")
+        else:
+            parts.append(type(value).__name__)
+    if len(items) > MAX_SUMMARY_PARAMS:
+        parts.append(f"... +{len(items) - MAX_SUMMARY_PARAMS}")
+    return ", ".join(parts)
+
+
+def _current_route() -> str:
+    scope = _current_scope.get()
+    if scope is None:
+        return BACKGROUND_ROUTE
+    route = getattr(scope.get("route"), "path", None)
+    return f"{scope.get('method', '')} {route or scope.get('path', '')}".strip()
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """정렬된 값의 nearest-rank 백분위수"""
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class ShapeStats:
+    """한 문장 형태의 느린 실행 집계"""
+
+    __slots__ = (
+        "shape", "count", "total", "max", "durations", "routes",
+        "last_params", "last_seen", "plan", "plan_captured_at", "plan_duration", "next_explain",
+    )
+
+    def __init__(self, shape: str, samples: int):
+        self.shape = shape
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.durations: Deque[float] = deque(maxlen=samples)
+        self.routes: Counter = Counter()
+        self.last_params = ""
+        self.last_seen: Optional[datetime] = None
+        self.plan: Optional[str] = None
+        self.plan_captured_at: Optional[datetime] = None
+        self.plan_duration: Optional[float] = None
+        self.next_explain = 0.0
+
+    def to_dict(self, include_plan: bool = True) -> Dict[str, Any]:
+        ordered = sorted(self.durations)
+        data = {
+            "shape": self.shape,
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 1),
+            "mean_ms": round(self.total / self.count * 1000, 1),
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 1),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 1),
+            "p99_ms": round(_percentile(ordered, 0.99) * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+            "routes": dict(self.routes.most_common()),
+            "last_params": self.last_params,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+        }
+        if include_plan:
+            data["plan"] = self.plan
+            data["plan_captured_at"] = self.plan_captured_at.isoformat() if self.plan_captured_at else None
+            data["plan_duration_ms"] = round(self.plan_duration * 1000, 1) if self.plan_duration is not None else None
+        return data
+
+
+class SlowQueryRecorder:
+    """AsyncEngine 의 커서 이벤트에서 느린 문장을 기록하고 형태별로 집계합니다."""
+
+    def __init__(
+        self,
+        threshold: float,
+        explain_rate: float = 0.0,
+        explain_interval: float = 300.0,
+        max_shapes: int = 200,
+        samples: int = 500,
+    ):
+        self.threshold = threshold
+        self.explain_rate = explain_rate
+        self.explain_interval = explain_interval
+        self.max_shapes = max_shapes
+        self.samples = samples
+        self.shapes: Dict[str, ShapeStats] = {}
+        self.started_at = datetime.now()
+        self._engine = None
+        self._explain_tasks: set = set()
+
+    # ---------- hooks ----------
+
+    def instrument(self, engine) -> None:
+        """커서 실행 이벤트를 연결합니다. EXPLAIN 은 같은 엔진의 별도 커넥션으로 실행합니다."""
+        # EXPLAIN (ANALYZE, BUFFERS) 는 Postgres 전용이므로 로컬 모드(SQLite)에서는 계획을 수집하지 않습니다.
+        self._engine = None if engine.dialect.name == "sqlite" else engine
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("slow_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        if elapsed >= self.threshold and not _explaining.get():
+            self.record(statement, parameters, executemany, elapsed)
+
+    # ---------- aggregation ----------
+
+    def record(self, statement: str, parameters: Any, executemany: bool, elapsed: float) -> None:
+        """느린 실행 1회를 로그로 남기고 집계합니다."""
+        shape = statement_shape(statement)
+        route = _current_route()
+        params = summarize_parameters(parameters, executemany)
+        logger.warning(
+            f"느린 쿼리 {elapsed * 1000:.0f}ms [{route}] {shape[:SHAPE_LOG_LENGTH]} params=({params})"
+        )
+
+        stats = self.shapes.get(shape)
+        if stats is None:
+            if len(self.shapes) >= self.max_shapes:
+                # 가장 적게 느렸던 형태를 버림
+                evicted = min(self.shapes.values(), key=lambda item: (item.count, item.total))
+                del self.shapes[evicted.shape]
+            stats = ShapeStats(shape, self.samples)
+            self.shapes[shape] = stats
+        stats.count += 1
+        stats.total += elapsed
+        stats.max = max(stats.max, elapsed)
+        stats.durations.append(elapsed)
+        if route in stats.routes or len(stats.routes) < MAX_ROUTES_PER_SHAPE:
+            stats.routes[route] += 1
+        stats.last_params = params
+        stats.last_seen = datetime.now()
+
+        if not executemany and self._should_explain(stats, statement):
+            self._schedule_explain(stats, statement, parameters)
+
+    def report(self, sort: str = "total", limit: int = 50, include_plan: bool = True) -> Dict[str, Any]:
+        """형태별 집계 (sort: total, count, p95, max)"""
+        items = [stats.to_dict(include_plan) for stats in self.shapes.values()]
+        sort_key = {"total": "total_ms", "count": "count", "p95": "p95_ms", "max": "max_ms"}[sort]
+        items.sort(key=lambda item: item[sort_key], reverse=True)
+        return {
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "explain_rate": self.explain_rate,
+            "since": self.started_at.isoformat(),
+            "shapes": len(items),
+            "items": items[:limit],
+        }
+
+    def reset(self) -> None:
+        self.shapes.clear()
+        self.started_at = datetime.now()
+
+    # ---------- EXPLAIN ----------
+
+    def _should_explain(self, stats: ShapeStats, statement: str) -> bool:
+        if self.explain_rate <= 0 or self._engine is None:
+            return False
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return False
+        now = time.monotonic()
+        if now < stats.next_explain or random.random() >= self.explain_rate:
+            return False
+        stats.next_explain = now + self.explain_interval
+        return True
+
+    def _schedule_explain(self, stats: ShapeStats, statement: str, parameters: Any) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 동기 스크립트 등 이벤트 루프 밖
+        # 요청 컨텍스트(요청별 쿼리 집계, 라우트)를 물려받지 않도록 빈 컨텍스트에서 실행
+        task = loop.create_task(self._explain(stats, statement, parameters), context=contextvars.Context())
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, stats: ShapeStats, statement: str, parameters: Any) -> None:
+        """같은 문장을 READ ONLY 트랜잭션에서 EXPLAIN (ANALYZE, BUFFERS) 로 다시 실행합니다."""
+        _explaining.set(True)
+        started = time.perf_counter()
+        try:
+            async with self._engine.connect() as conn:
+                conn = await conn.execution_options(postgresql_readonly=True)
+                await conn.exec_driver_sql(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+                result = await conn.exec_driver_sql(EXPLAIN_PREFIX + statement, parameters)
+                plan = "\n".join(row[0] for row in result.all())
+                await conn.rollback()
+        except Exception as e:
+            logger.warning(f"느린 쿼리 EXPLAIN 실패: {stats.shape[:SHAPE_LOG_LENGTH]}: {e}")
+            return
+        stats.plan = plan
+        stats.plan_captured_at = datetime.now()
+        stats.plan_duration = time.perf_counter() - started
+        logger.info(f"느린 쿼리 실행 계획 수집: {stats.shape[:SHAPE_LOG_LENGTH]}\n{plan}")
+
+
+# ==================== Middleware ====================
+
+class SlowQueryMiddleware:
+    """느린 쿼리에 라우트를 붙일 수 있도록 요청 scope 를 contextvar 에 담는 순수 ASGI 미들웨어"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+
+recorder: Optional[SlowQueryRecorder] = None
+
+
+def instrument_engine(engine) -> None:
+    """설정이 켜져 있으면 엔진에 느린 쿼리 기록을 연결합니다."""
+    global recorder
+    if settings.slow_query_ms <= 0:
+        return
+    recorder = SlowQueryRecorder(
+        threshold=settings.slow_query_ms / 1000,
+        explain_rate=settings.slow_query_explain_rate,
+        explain_interval=settings.slow_query_explain_interval,
+        max_shapes=settings.slow_query_max_shapes,
+    )
+    recorder.instrument(engine)
@@ -0,0 +1,275 @@
+"""카탈로그 컬럼형 스냅샷 (Parquet / Arrow IPC)
+
+분석/NLU 학습 파이프라인이 매일 전체 FAQ·질의문·태그 연결을 가져가므로,
+내용 변경 순번(`catalog_changes` 의 최신 seq, bundle.py 와 같은 기준)별로 스냅샷 파일을
+한 번만 만들어 디스크에 캐시합니다. 같은 순번을 다시 받을 때는 DB 작업 없이 파일만
+전송합니다 (Range 요청 지원).
+
+- 데이터는 REPEATABLE READ 읽기 전용 트랜잭션에서 서버 측 커서로 배치 단위로 읽어
+  Arrow RecordBatch 로 변환한 뒤 Parquet / Arrow IPC 파일에 바로 씁니다.
+- 태그명 컬럼은 전체 태그 목록으로 만든 고정 사전으로 dictionary 인코딩합니다.
+- 순번은 스냅샷의 첫 문장에서 읽습니다. 변경 로그는 내용과 같은 트랜잭션에서 커밋 순서대로
+  기록되므로, 스냅샷에 보이는 최신 순번이 곧 스냅샷에 담긴 내용을 가리킵니다.
+- 사용 빈도 반영(usage flush)은 변경 로그에 기록되지 않으므로 캐시를 무효화하지 않습니다.
+  스냅샷의 `usage_frequency` 는 생성 시점(`generated_at`)의 값입니다.
+
+pyarrow 는 이 기능에만 필요하므로 모듈 로드 시가 아니라 사용 시점에 import 합니다.
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Boolean, DateTime, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.changes import get_latest_seq
+from app.core.metrics import record_cache
+from app.db.local import is_sqlite
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_BATCH_SIZE = 10_000  # 서버 측 커서에서 한 번에 가져오는 행 수
+MANIFEST_NAME = "manifest.json"
+MEDIA_TYPES = {
+    ".parquet": "application/vnd.apache.parquet",
+    ".arrow": "application/vnd.apache.arrow.file",
+}
+
+DATASET_QUERIES = {
+    "faqs": """
+        SELECT id, external_id, question, answer, usage_frequency, question_count, is_active,
+               created_by, updated_by, created_at, updated_at
+        FROM faqs ORDER BY id
+    """,
+    "variants": """
+        SELECT id, faq_id, question_text, is_representative, created_at
+        FROM question_variants ORDER BY faq_id, id
+    """,
+    "faq_tags": """
+        SELECT faq_id, tag_id FROM faq_tags ORDER BY faq_id, tag_id
+    """,
+}
+
+# 결과 타입 (로컬 모드의 SQLite 는 불리언/시각을 정수/문자열로 반환)
+DATASET_COLUMN_TYPES = {
+    "faqs": {"is_active": Boolean, "created_at": DateTime, "updated_at": DateTime},
+    "variants": {"is_representative": Boolean, "created_at": DateTime},
+    "faq_tags": {},
+}
+
+# 같은 프로세스에서 같은 버전을 동시에 만들지 않도록 합니다.
+_build_lock = asyncio.Lock()
+
+
+class SnapshotUnavailableError(RuntimeError):
+    """pyarrow 가 설치되지 않아 스냅샷을 만들 수 없음"""
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise SnapshotUnavailableError("pyarrow is not installed") from e
+    return pa
+
+
+def _schemas(pa, tag_type) -> Dict[str, Any]:
+    timestamp = pa.timestamp("us")
+    return {
+        "faqs": pa.schema([
+            ("id", pa.int32()),
+            ("external_id", pa.string()),
+            ("question", pa.string()),
+            ("answer", pa.string()),
+            ("usage_frequency", pa.int32()),
+            ("question_count", pa.int32()),
+            ("is_active", pa.bool_()),
+            ("created_by", pa.string()),
+            ("updated_by", pa.string()),
+            ("created_at", timestamp),
+            ("updated_at", timestamp),
+        ]),
+        "variants": pa.schema([
+            ("id", pa.int32()),
+            ("faq_id", pa.int32()),
+            ("question_text", pa.string()),
+            ("is_representative", pa.bool_()),
+            ("created_at", timestamp),
+        ]),
+        "faq_tags": pa.schema([
+            ("faq_id", pa.int32()),
+            ("tag_id", pa.int32()),
+            ("tag_name", tag_type),
+        ]),
+    }
+
+
+def _to_batch(pa, schema, dataset: str, rows: List[tuple], tag_dictionary, tag_index: Dict[int, int]):
+    """DB 행 목록을 RecordBatch 로 변환합니다."""
+    columns = list(zip(*rows))
+    if dataset == "faq_tags":
+        faq_ids, tag_ids = columns
+        arrays = [
+            pa.array(faq_ids, type=pa.int32()),
+            pa.array(tag_ids, type=pa.int32()),
+            pa.DictionaryArray.from_arrays(
+                pa.array([tag_index[tag_id] for tag_id in tag_ids], type=pa.int32()), tag_dictionary
+            ),
+        ]
+    else:
+        arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _directory_name(change_seq: int) -> str:
+    return f"seq-{change_seq}"
+
+
+def _is_snapshot_directory(directory: str) -> bool:
+    """순번 디렉터리(seq-<숫자>) 또는 캐시하지 않은 임시 디렉터리(tmp-<hex>)만 허용합니다."""
+    prefix, _, suffix = directory.partition("-")
+    if prefix == "seq":
+        return suffix.isdigit()
+    return prefix == "tmp" and len(suffix) == 32 and all(c in "0123456789abcdef" for c in suffix)
+
+
+def read_manifest(base_dir: Path, directory: str) -> Optional[Dict[str, Any]]:
+    """스냅샷 디렉터리의 manifest 를 읽습니다 (없으면 None)."""
+    if not _is_snapshot_directory(directory):
+        return None
+    try:
+        return json.loads((base_dir / directory / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def snapshot_file(base_dir: Path, directory: str, filename: str) -> Optional[Tuple[Path, Dict[str, Any]]]:
+    """스냅샷 파일 경로와 manifest (manifest 에 있는 파일만 허용)."""
+    manifest = read_manifest(base_dir, directory)
+    if not manifest or filename not in manifest["files"]:
+        return None
+    return base_dir / directory / filename, manifest
+
+
+def _prune(base_dir: Path, keep: int) -> None:
+    """최근 keep 개 순번만 남기고 오래된 스냅샷/임시 디렉터리를 삭제합니다."""
+    seqs = sorted(
+        (int(p.name[4:]) for p in base_dir.glob("seq-*") if _is_snapshot_directory(p.name)), reverse=True
+    )
+    for change_seq in seqs[keep:]:
+        shutil.rmtree(base_dir / _directory_name(change_seq), ignore_errors=True)
+    # catalog_version_seq 기준으로 캐시하던 이전 형식 (숫자 디렉터리)
+    for path in base_dir.iterdir():
+        if path.name.isdigit():
+            shutil.rmtree(path, ignore_errors=True)
+    # 1시간 이상 지난 임시 디렉터리 (캐시하지 않은 스냅샷, 중단된 생성)
+    for path in base_dir.glob("tmp-*"):
+        if time.time() - path.stat().st_mtime > 3600:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+async def _write_snapshot(engine: AsyncEngine, pa, work_dir: Path) -> Tuple[Dict[str, Any], int, bool]:
+    """한 스냅샷 트랜잭션에서 모든 데이터셋을 work_dir 에 씁니다. (파일 정보, 변경 순번, 캐시 가능 여부) 반환."""
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    files: Dict[str, Any] = {}
+    async with engine.connect() as conn:
+        sqlite = is_sqlite(conn)
+        if not sqlite:
+            conn = await conn.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        # Postgres 는 첫 문장에서 스냅샷이 고정되므로 이 순번이 스냅샷 내용과 정확히 일치합니다.
+        change_seq = await get_latest_seq(conn)
+
+        tag_rows = (await conn.execute(text("SELECT id, name FROM tags ORDER BY id"))).all()
+        tag_index = {tag_id: i for i, (tag_id, _) in enumerate(tag_rows)}
+        tag_dictionary = pa.array([name for _, name in tag_rows], type=pa.string())
+        schemas = _schemas(pa, pa.dictionary(pa.int32(), pa.string()))
+
+        for dataset, query in DATASET_QUERIES.items():
+            schema = schemas[dataset]
+            parquet_name, arrow_name = f"{dataset}.parquet", f"{dataset}.arrow"
+            parquet_writer = pq.ParquetWriter(str(work_dir / parquet_name), schema, compression="zstd")
+            arrow_sink = pa.OSFile(str(work_dir / arrow_name), "wb")
+            arrow_writer = ipc.new_file(arrow_sink, schema)
+            rows_written = 0
+            try:
+                statement = text(query).columns(**DATASET_COLUMN_TYPES[dataset])
+                result = await conn.stream(statement.execution_options(yield_per=SNAPSHOT_BATCH_SIZE))
+                async for rows in result.partitions():
+                    batch = _to_batch(pa, schema, dataset, rows, tag_dictionary, tag_index)
+                    await asyncio.to_thread(parquet_writer.write_batch, batch)
+                    await asyncio.to_thread(arrow_writer.write_batch, batch)
+                    rows_written += len(rows)
+            finally:
+                parquet_writer.close()
+                arrow_writer.close()
+                arrow_sink.close()
+
+            for name in (parquet_name, arrow_name):
+                files[name] = {"dataset": dataset, "rows": rows_written, "bytes": (work_dir / name).stat().st_size}
+
+        # 로컬 모드(SQLite)는 스냅샷 격리 없이 읽으므로, 읽는 동안 순번이 바뀌지 않았을 때만 캐시합니다.
+        cacheable = not sqlite or await get_latest_seq(conn) == change_seq
+
+    return files, change_seq, cacheable
+
+
+async def ensure_snapshot(engine: AsyncEngine, base_dir: Path, keep: int = 3) -> Dict[str, Any]:
+    """현재 변경 순번의 스냅샷 manifest 를 반환합니다. 캐시에 없으면 생성합니다.
+
+    로컬 모드에서 읽는 도중 카탈로그가 바뀌어 캐시할 수 없는 스냅샷은 임시 디렉터리에 남고
+    manifest 의 ``cached`` 가 False 가 됩니다 (다음 요청에서 다시 생성).
+    """
+    async with engine.connect() as conn:
+        change_seq = await get_latest_seq(conn)
+
+    manifest = read_manifest(base_dir, _directory_name(change_seq))
+    record_cache("snapshot", manifest is not None)
+    if manifest:
+        return manifest
+
+    pa = _import_pyarrow()
+    async with _build_lock:
+        manifest = read_manifest(base_dir, _directory_name(change_seq))
+        if manifest:
+            return manifest
+
+        base_dir.mkdir(parents=True, exist_ok=True)
+        work_dir = base_dir / f"tmp-{uuid.uuid4().hex}"
+        work_dir.mkdir()
+        started = time.monotonic()
+        try:
+            files, change_seq, cacheable = await _write_snapshot(engine, pa, work_dir)
+        except BaseException:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise
+
+        directory = _directory_name(change_seq)
+        manifest = {
+            "change_seq": change_seq,
+            "generated_at": time.time(),
+            "cached": cacheable,
+            "directory": directory if cacheable else work_dir.name,
+            "files": files,
+        }
+        (work_dir / MANIFEST_NAME).write_text(json.dumps(manifest))
+        logger.info(f"✅ 카탈로그 스냅샷 생성: seq {change_seq} ({time.monotonic() - started:.2f}초, 캐시: {cacheable})")
+
+        if cacheable:
+            try:
+                os.rename(work_dir, base_dir / directory)
+            except OSError:
+                # 다른 프로세스가 같은 순번을 먼저 만든 경우
+                shutil.rmtree(work_dir, ignore_errors=True)
+                manifest = read_manifest(base_dir, directory) or manifest
+        await asyncio.to_thread(_prune, base_dir, keep)
+        return manifest
@@ -0,0 +1,133 @@
+"""대시보드 통계 (Materialized View) 관리
+
+`stats_overview_mv` 는 전체/활성 FAQ 수, 태그/질의문 수, 태그별 분포,
+사용 빈도 상위 FAQ 를 한 행에 담고 있어 통계 API 는 한 행만 읽습니다.
+카탈로그 테이블에 쓰기가 발생하면 문장 단위 트리거가 `catalog_version_seq` 를
+증가시키고, 백그라운드 작업이 버전 변화를 감지해 뷰를 CONCURRENTLY 갱신합니다.
+
+시퀀스는 트랜잭션과 무관하게 커밋 전에 증가하므로, 뷰가 갱신 시점에 읽는 버전에는
+아직 커밋되지 않은 쓰기가 포함될 수 있습니다. 그래서 REFRESH 전에 버전을 읽으면서
+`txid_snapshot_xip(txid_current_snapshot())` 로 그 시점에 진행 중인 트랜잭션이 있었는지를
+함께 확인해 `stats_refresh_state` 에 기록하고, 진행 중인 트랜잭션이 있었으면 버전이 같아도
+다음 주기에 다시 갱신합니다.
+
+로컬 모드(SQLite)의 `stats_overview_mv` 는 읽을 때마다 계산하는 일반 뷰이므로 갱신하지 않습니다.
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.db.local import is_sqlite
+
+logger = logging.getLogger(__name__)
+
+# 여러 Pod 가 동시에 REFRESH 하지 않도록 사용하는 advisory lock 키
+STATS_REFRESH_LOCK_KEY = 72_029_001
+
+
+async def get_catalog_version(conn) -> int:
+    """현재 카탈로그 버전을 반환합니다 (O(1))."""
+    result = await conn.execute(text("SELECT last_value FROM catalog_version_seq"))
+    return int(result.scalar())
+
+
+async def read_stats_overview(db: AsyncSession) -> Optional[Dict[str, Any]]:
+    """Materialized View 의 통계 행과 현재 카탈로그 버전을 함께 읽습니다.
+
+    ``catalog_version`` 은 뷰가 반영한 것이 확실한 버전(갱신 전에 읽은 값)이고,
+    ``consistent`` 가 False 면 같은 버전이라도 최신이라고 볼 수 없습니다.
+    """
+    if is_sqlite(db):
+        # 로컬 모드의 뷰는 읽을 때마다 계산되므로 항상 최신입니다.
+        query = (
+            "SELECT mv.*, mv.catalog_version AS current_version, 1 AS consistent "
+            "FROM stats_overview_mv mv"
+        )
+    else:
+        query = (
+            "SELECT mv.refreshed_at, mv.total_faqs, mv.active_faqs, mv.total_tags, mv.total_variants, "
+            "mv.by_tag, mv.top_usage, s.catalog_version, s.consistent, "
+            "(SELECT last_value FROM catalog_version_seq) AS current_version "
+            "FROM stats_overview_mv mv CROSS JOIN stats_refresh_state s"
+        )
+    row = (await db.execute(text(query))).mappings().first()
+    if row is None:
+        return None
+    stats = dict(row)
+    stats["consistent"] = bool(stats["consistent"])
+    if is_sqlite(db):
+        # SQLite 뷰는 JSON 과 시각을 문자열로 반환합니다.
+        stats["by_tag"] = json.loads(stats["by_tag"])
+        stats["top_usage"] = json.loads(stats["top_usage"])
+        stats["refreshed_at"] = datetime.fromisoformat(stats["refreshed_at"])
+    return stats
+
+
+async def refresh_stats(engine: AsyncEngine, max_age: float, force: bool = False) -> bool:
+    """카탈로그가 바뀌었거나, 지난 갱신이 진행 중인 쓰기와 겹쳤거나, max_age 가 지났으면 통계 뷰를 갱신합니다.
+
+    Returns:
+        bool: 이번 호출에서 갱신했는지 여부
+    """
+    if is_sqlite(engine):
+        return False
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT s.catalog_version, s.consistent, "
+                "EXTRACT(EPOCH FROM (now() - mv.refreshed_at)) AS age, "
+                "(SELECT last_value FROM catalog_version_seq) AS current_version "
+                "FROM stats_overview_mv mv CROSS JOIN stats_refresh_state s"
+            )
+        )
+        row = result.first()
+        if not force and row is not None:
+            mv_version, consistent, age, current_version = row
+            if consistent and mv_version >= current_version and age < max_age:
+                return False
+
+        locked = await conn.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": STATS_REFRESH_LOCK_KEY}
+        )
+        if not locked.scalar():
+            return False
+
+        # 갱신 전에 버전을 읽습니다. 이때 진행 중인 쓰기가 없으면 이 버전까지의 쓰기는 모두
+        # 커밋되어 있으므로, 더 늦게 잡히는 REFRESH 의 스냅샷에 포함됩니다.
+        version, in_progress = (await conn.execute(
+            text(
+                "SELECT last_value, (SELECT count(*) FROM txid_snapshot_xip(txid_current_snapshot())) "
+                "FROM catalog_version_seq"
+            )
+        )).first()
+        await conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY stats_overview_mv"))
+        await conn.execute(
+            text("UPDATE stats_refresh_state SET catalog_version = :version, consistent = :consistent"),
+            {"version": version, "consistent": in_progress == 0},
+        )
+    return True
+
+
+async def run_stats_refresher(engine: AsyncEngine, interval: float, max_age: float) -> None:
+    """lifespan 동안 카탈로그 버전을 확인하며 통계 뷰를 갱신하는 백그라운드 루프
+
+    쓰기가 연속으로 발생해도 interval 당 최대 한 번만 갱신되므로 자연스럽게 debounce 됩니다.
+    """
+    logger.info(f"✅ 통계 갱신 작업 시작 (주기: {interval}초)")
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            started = time.perf_counter()
+            if await refresh_stats(engine, max_age):
+                logger.info(f"통계 뷰 갱신 완료 ({time.perf_counter() - started:.2f}초)")
+        except asyncio.CancelledError:
+            logger.info("🛑 통계 갱신 작업 종료")
+            raise
+        except Exception as e:
+            logger.error(f"통계 뷰 갱신 오류: {e}")
@@ -0,0 +1,128 @@
+"""시간 감쇠 기반 인기 FAQ 집계 (Redis Sorted Set)
+
+전체/태그별 Sorted Set 에 FAQ 사용을 지수 감쇠 점수로 누적합니다.
+모든 점수를 매번 감쇠시키는 대신, 기준 시각(epoch) 이후 경과 시간에 비례해
+커지는 가중치 2^((now - epoch) / half_life) 를 더하고, 백그라운드 작업이
+주기적으로 전체 점수에 감쇠 계수를 곱한 뒤 epoch 를 현재 시각으로 옮깁니다.
+두 방식은 같은 순위를 만들며, 요청 경로에는 ZINCRBY 만 남습니다.
+"""
+import asyncio
+import logging
+import time
+from typing import Iterable, List, Optional
+
+from app.core.redis import redis_connection_pool
+
+logger = logging.getLogger(__name__)
+
+# 리밸런스 스크립트가 모든 키를 한 번에 다룰 수 있도록 같은 hash slot 을 사용합니다.
+TRENDING_KEY_PREFIX = "{officeplus_faq:trending}"
+EPOCH_KEY = f"{TRENDING_KEY_PREFIX}:epoch"
+INDEX_KEY = f"{TRENDING_KEY_PREFIX}:keys"
+GLOBAL_KEY = f"{TRENDING_KEY_PREFIX}:global"
+REBALANCE_LOCK_KEY = f"{TRENDING_KEY_PREFIX}:rebalance_lock"
+
+MAX_SET_SIZE = 1000  # Sorted Set 당 유지할 최대 FAQ 수
+MIN_SCORE = 0.01  # 리밸런스 후 이 점수 미만은 제거
+
+_HIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local epoch = tonumber(redis.call('GET', KEYS[1]))
+if not epoch then
+    epoch = now
+    redis.call('SET', KEYS[1], ARGV[1])
+end
+local weight = math.pow(2, (now - epoch) / tonumber(ARGV[2]))
+for i = 3, #KEYS do
+    redis.call('ZINCRBY', KEYS[i], weight, ARGV[3])
+    redis.call('SADD', KEYS[2], KEYS[i])
+end
+return 1
+"""
+
+# 인덱스 Set 에 등록된 키들은 모두 같은 hash slot 에 있으므로 스크립트 안에서 접근해도 안전합니다.
+_REBALANCE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local epoch = tonumber(redis.call('GET', KEYS[1]))
+if not epoch then
+    redis.call('SET', KEYS[1], ARGV[1])
+    return 0
+end
+local factor = math.pow(2, -(now - epoch) / tonumber(ARGV[2]))
+local max_size = tonumber(ARGV[3])
+local keys = redis.call('SMEMBERS', KEYS[2])
+for _, key in ipairs(keys) do
+    redis.call('ZUNIONSTORE', key, 1, key, 'WEIGHTS', tostring(factor))
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', '(' .. ARGV[4])
+    local size = redis.call('ZCARD', key)
+    if size > max_size then
+        redis.call('ZREMRANGEBYRANK', key, 0, size - max_size - 1)
+    elseif size == 0 then
+        redis.call('SREM', KEYS[2], key)
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1])
+return #keys
+"""
+
+
+def tag_key(tag_id: int) -> str:
+    """태그별 Sorted Set 키"""
+    return f"{TRENDING_KEY_PREFIX}:tag:{tag_id}"
+
+
+def record_trending_hit(faq_id: int, tag_ids: Iterable[int], half_life: float) -> bool:
+    """FAQ 사용 1회를 전체/태그별 인기 점수에 반영합니다.
+
+    Returns:
+        bool: 기록 성공 여부. Redis 장애 시 요청을 실패시키지 않고 False 를 반환합니다.
+    """
+    try:
+        redis_conn = redis_connection_pool.get_connection()
+        script = redis_conn.register_script(_HIT_SCRIPT)
+        keys = [EPOCH_KEY, INDEX_KEY, GLOBAL_KEY] + [tag_key(tag_id) for tag_id in tag_ids]
+        script(keys=keys, args=[time.time(), half_life, str(faq_id)])
+        return True
+    except Exception as e:
+        logger.warning(f"인기 점수 기록 실패 (faq_id={faq_id}): {e}")
+        return False
+
+
+def get_trending_ids(tag_id: Optional[int], k: int) -> List[int]:
+    """점수가 높은 순으로 FAQ ID 목록을 반환합니다."""
+    redis_conn = redis_connection_pool.get_connection()
+    key = tag_key(tag_id) if tag_id is not None else GLOBAL_KEY
+    return [int(member) for member in redis_conn.zrevrange(key, 0, k - 1)]
+
+
+def rebalance(half_life: float) -> int:
+    """누적 점수에 감쇠를 적용하고 epoch 를 현재 시각으로 옮깁니다.
+
+    Returns:
+        int: 리밸런스한 Sorted Set 수
+    """
+    redis_conn = redis_connection_pool.get_connection()
+    script = redis_conn.register_script(_REBALANCE_SCRIPT)
+    return int(script(keys=[EPOCH_KEY, INDEX_KEY], args=[time.time(), half_life, MAX_SET_SIZE, MIN_SCORE]) or 0)
+
+
+async def run_trending_rebalancer(half_life: float, interval: float) -> None:
+    """lifespan 동안 주기적으로 감쇠/정리를 수행하는 백그라운드 루프
+
+    여러 Pod 가 같은 주기에 중복으로 감쇠를 적용하지 않도록 Redis 락을 사용합니다.
+    """
+    logger.info(f"✅ 인기 FAQ 리밸런서 시작 (주기: {interval}초, 반감기: {half_life}초)")
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            redis_conn = redis_connection_pool.get_connection()
+            lock_ttl = max(int(interval) - 1, 1)
+            if not redis_conn.set(REBALANCE_LOCK_KEY, "1", nx=True, ex=lock_ttl):
+                continue
+            count = rebalance(half_life)
+            logger.debug(f"인기 FAQ 리밸런스 완료: {count}개 Sorted Set")
+        except asyncio.CancelledError:
+            logger.info("🛑 인기 FAQ 리밸런서 종료")
+            raise
+        except Exception as e:
+            logger.error(f"인기 FAQ 리밸런스 오류: {e}")
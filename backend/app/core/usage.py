@@ -0,0 +1,215 @@
+"""FAQ 사용 빈도 write-behind 집계
+
+조회 요청마다 Postgres 행을 갱신하면 인기 FAQ 행에 잠금 경합이 생기므로,
+요청 경로에서는 Redis 해시에 HINCRBY 만 수행하고 백그라운드 flusher 가
+주기적으로 누적치를 모아 `faqs.usage_frequency` 에 일괄 반영합니다.
+
+여러 Pod 에서 동시에 flush 해도 안전하도록:
+1. pending 해시를 고유한 배치 키로 원자적으로 RENAME 하여 선점합니다.
+2. 배치 키는 `usage_flush_batches` 테이블에 UPDATE 와 같은 트랜잭션으로 기록되어
+   같은 배치가 두 번 반영되지 않습니다.
+3. 반영 도중 Pod 가 종료되어 남은 배치는 lease 가 만료된 뒤 다른 Pod 가 다시 처리합니다.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.redis import redis_connection_pool
+from app.db.local import is_sqlite
+
+logger = logging.getLogger(__name__)
+
+# 모든 키를 같은 hash slot 에 두어 Redis Cluster 에서도 RENAME/스크립트가 동작하도록 합니다.
+USAGE_KEY_PREFIX = "{officeplus_faq:usage}"
+PENDING_KEY = f"{USAGE_KEY_PREFIX}:pending"
+BATCH_KEY_PREFIX = f"{USAGE_KEY_PREFIX}:batch:"
+BATCH_INDEX_KEY = f"{USAGE_KEY_PREFIX}:batches"
+
+BATCH_LEASE_SECONDS = 120  # 선점 후 이 시간 내에 완료되지 않은 배치는 다른 Pod 가 재처리
+BATCH_RETENTION = timedelta(days=1)  # 중복 반영 방지 기록 보관 기간
+UPDATE_CHUNK_SIZE = 1000  # UPDATE ... FROM (VALUES ...) 한 문장당 행 수
+
+APPLY_DELTAS_SQL = (
+    "UPDATE faqs AS f SET usage_frequency = f.usage_frequency + v.delta "
+    "FROM (VALUES {rows}) AS v(id, delta) "
+    "WHERE f.id = v.id"
+)
+
+# SQLite: VALUES 에 열 이름을 붙일 수 없어 column1, column2 로 참조합니다.
+SQLITE_APPLY_DELTAS_SQL = (
+    "UPDATE faqs AS f SET usage_frequency = f.usage_frequency + v.column2 "
+    "FROM (VALUES {rows}) AS v "
+    "WHERE f.id = v.column1"
+)
+
+_CLAIM_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('RENAME', KEYS[1], KEYS[2])
+redis.call('ZADD', KEYS[3], ARGV[1], KEYS[2])
+return 1
+"""
+
+_RELEASE_STALE_SCRIPT = """
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not score or tonumber(score) > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+return 1
+"""
+
+
+def record_hit(faq_id: int, amount: int = 1) -> bool:
+    """FAQ 사용 1회를 Redis 에 누적합니다 (O(1)).
+
+    Returns:
+        bool: 기록 성공 여부. Redis 장애 시 요청을 실패시키지 않고 False 를 반환합니다.
+    """
+    try:
+        redis_conn = redis_connection_pool.get_connection()
+        redis_conn.hincrby(PENDING_KEY, str(faq_id), amount)
+        return True
+    except Exception as e:
+        logger.warning(f"사용 빈도 기록 실패 (faq_id={faq_id}): {e}")
+        return False
+
+
+def _claim_pending_batch(redis_conn) -> Optional[str]:
+    """pending 해시를 새 배치 키로 옮겨 선점합니다."""
+    batch_key = f"{BATCH_KEY_PREFIX}{uuid.uuid4().hex}"
+    claim = redis_conn.register_script(_CLAIM_SCRIPT)
+    claimed = claim(keys=[PENDING_KEY, batch_key, BATCH_INDEX_KEY], args=[time.time()])
+    return batch_key if int(claimed or 0) == 1 else None
+
+
+def _claim_stale_batches(redis_conn) -> List[str]:
+    """lease 가 만료된 (다른 Pod 가 처리하다 멈춘) 배치를 재선점합니다."""
+    now = time.time()
+    cutoff = now - BATCH_LEASE_SECONDS
+    stale_keys = redis_conn.zrangebyscore(BATCH_INDEX_KEY, "-inf", cutoff)
+    if not stale_keys:
+        return []
+
+    release = redis_conn.register_script(_RELEASE_STALE_SCRIPT)
+    claimed = []
+    for batch_key in stale_keys:
+        if int(release(keys=[BATCH_INDEX_KEY], args=[batch_key, cutoff, now]) or 0) == 1:
+            claimed.append(batch_key)
+    return claimed
+
+
+def _parse_deltas(raw: Dict[str, str]) -> List[Tuple[int, int]]:
+    """HGETALL 결과를 (faq_id, delta) 목록으로 변환합니다."""
+    deltas = []
+    for raw_id, raw_delta in raw.items():
+        try:
+            faq_id, delta = int(raw_id), int(raw_delta)
+        except (TypeError, ValueError):
+            logger.warning(f"잘못된 사용 빈도 항목 무시: {raw_id}={raw_delta}")
+            continue
+        if delta:
+            deltas.append((faq_id, delta))
+    return deltas
+
+
+async def _apply_batch(engine: AsyncEngine, batch_key: str, deltas: List[Tuple[int, int]]) -> bool:
+    """배치를 한 트랜잭션으로 반영합니다. 이미 반영된 배치면 False 를 반환합니다."""
+    async with engine.begin() as conn:
+        inserted = await conn.execute(
+            text(
+                "INSERT INTO usage_flush_batches (batch_key, faq_count, hit_count, applied_at) "
+                "VALUES (:batch_key, :faq_count, :hit_count, :applied_at) "
+                "ON CONFLICT (batch_key) DO NOTHING RETURNING batch_key"
+            ),
+            {
+                "batch_key": batch_key,
+                "faq_count": len(deltas),
+                "hit_count": sum(delta for _, delta in deltas),
+                "applied_at": datetime.utcnow(),
+            },
+        )
+        if inserted.first() is None:
+            return False
+
+        apply_sql = SQLITE_APPLY_DELTAS_SQL if is_sqlite(conn) else APPLY_DELTAS_SQL
+        for start in range(0, len(deltas), UPDATE_CHUNK_SIZE):
+            chunk = deltas[start:start + UPDATE_CHUNK_SIZE]
+            params = {}
+            rows = []
+            for i, (faq_id, delta) in enumerate(chunk):
+                params[f"id_{i}"] = faq_id
+                params[f"delta_{i}"] = delta
+                rows.append(f"(CAST(:id_{i} AS INTEGER), CAST(:delta_{i} AS INTEGER))")
+            await conn.execute(text(apply_sql.format(rows=", ".join(rows))), params)
+    return True
+
+
+async def _flush_batch(engine: AsyncEngine, redis_conn, batch_key: str) -> int:
+    """배치 하나를 Postgres 에 반영하고 Redis 에서 정리합니다."""
+    deltas = _parse_deltas(redis_conn.hgetall(batch_key) or {})
+    applied = False
+    if deltas:
+        applied = await _apply_batch(engine, batch_key, deltas)
+        if not applied:
+            logger.info(f"이미 반영된 사용 빈도 배치 정리: {batch_key}")
+
+    redis_conn.delete(batch_key)
+    redis_conn.zrem(BATCH_INDEX_KEY, batch_key)
+    return sum(delta for _, delta in deltas) if applied else 0
+
+
+async def flush_usage(engine: AsyncEngine) -> int:
+    """누적된 사용 빈도를 Postgres 에 반영합니다.
+
+    Returns:
+        int: 이번 호출에서 반영된 사용 횟수 합계
+    """
+    redis_conn = redis_connection_pool.get_connection()
+
+    batch_keys = _claim_stale_batches(redis_conn)
+    own_batch = _claim_pending_batch(redis_conn)
+    if own_batch:
+        batch_keys.append(own_batch)
+
+    flushed = 0
+    for batch_key in batch_keys:
+        flushed += await _flush_batch(engine, redis_conn, batch_key)
+    return flushed
+
+
+async def prune_flush_history(engine: AsyncEngine) -> None:
+    """보관 기간이 지난 배치 기록을 삭제합니다."""
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("DELETE FROM usage_flush_batches WHERE applied_at < :cutoff"),
+            {"cutoff": datetime.utcnow() - BATCH_RETENTION},
+        )
+
+
+async def run_usage_flusher(engine: AsyncEngine, interval: float) -> None:
+    """lifespan 동안 주기적으로 사용 빈도를 flush 하는 백그라운드 루프"""
+    logger.info(f"✅ 사용 빈도 flusher 시작 (주기: {interval}초)")
+    last_prune = 0.0
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            flushed = await flush_usage(engine)
+            if flushed:
+                logger.info(f"사용 빈도 반영 완료: {flushed}건")
+
+            if time.monotonic() - last_prune > 3600:
+                await prune_flush_history(engine)
+                last_prune = time.monotonic()
+        except asyncio.CancelledError:
+            logger.info("🛑 사용 빈도 flusher 종료")
+            raise
+        except Exception as e:
+            logger.error(f"사용 빈도 flush 오류: {e}")
@@ -0,0 +1,297 @@
+"""Self-contained local backend: SQLite engine, schema and catalog seed.
+
+With ``LOCAL_BACKEND=true`` the service runs on a SQLite file through
+aiosqlite, with an in-process Redis stand-in (``app.core.redis``), so the
+full app and the benchmarks run on one machine without Postgres or Redis.
+
+The Alembic migrations are Postgres-only, so the local schema is created
+from the models plus SQLite equivalents of the Postgres objects the app
+reads:
+
+- row triggers maintaining ``faqs.question_count`` and ``tags.faq_count``
+- a one-row ``catalog_version_seq`` table whose ``last_value`` is bumped by
+  triggers on the catalog tables, so it is read with the sequence's SQL
+- ``stats_overview_mv`` as a plain view, always current, never refreshed
+
+Modules with Postgres-only statements (advisory locks, DISTINCT ON,
+UPDATE ... FROM VALUES, array_agg, snapshot isolation) check ``is_sqlite``
+and run an equivalent statement or skip the step. The set-based CSV merge
+is Postgres-only; instead an empty local database is seeded from the intent
+export at startup.
+"""
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.pool import StaticPool
+
+from app.models.database import FAQ, Base, FaqTag, QuestionVariant, Tag
+
+logger = logging.getLogger(__name__)
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # readers do not block the writer
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",  # ON DELETE CASCADE of faq_tags / question_variants
+    "PRAGMA busy_timeout=5000",
+)
+
+CATALOG_TABLES = ("faqs", "tags", "faq_tags", "question_variants")
+
+CATALOG_VERSION_DDL = [
+    "CREATE TABLE IF NOT EXISTS catalog_version_seq (last_value BIGINT NOT NULL)",
+    "INSERT INTO catalog_version_seq (last_value) SELECT 1 WHERE NOT EXISTS (SELECT 1 FROM catalog_version_seq)",
+]
+
+# SQLite has no statement triggers, so the catalog version is bumped per row
+LOCAL_TRIGGERS: Dict[str, str] = {
+    **{
+        f"trg_{table}_catalog_version_{op.lower()}": f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_catalog_version_{op.lower()}
+            AFTER {op} ON {table}
+            BEGIN
+                UPDATE catalog_version_seq SET last_value = last_value + 1;
+            END
+        """
+        for table in CATALOG_TABLES
+        for op in ("INSERT", "UPDATE", "DELETE")
+    },
+    "trg_question_variants_count_insert": """
+        CREATE TRIGGER IF NOT EXISTS trg_question_variants_count_insert
+        AFTER INSERT ON question_variants
+        BEGIN
+            UPDATE faqs SET question_count = question_count + 1 WHERE id = NEW.faq_id;
+        END
+    """,
+    "trg_question_variants_count_delete": """
+        CREATE TRIGGER IF NOT EXISTS trg_question_variants_count_delete
+        AFTER DELETE ON question_variants
+        BEGIN
+            UPDATE faqs SET question_count = max(question_count - 1, 0) WHERE id = OLD.faq_id;
+        END
+    """,
+    "trg_question_variants_count_update": """
+        CREATE TRIGGER IF NOT EXISTS trg_question_variants_count_update
+        AFTER UPDATE OF faq_id ON question_variants
+        BEGIN
+            UPDATE faqs SET question_count = question_count + 1 WHERE id = NEW.faq_id;
+            UPDATE faqs SET question_count = max(question_count - 1, 0) WHERE id = OLD.faq_id;
+        END
+    """,
+    "trg_faq_tags_count_insert": """
+        CREATE TRIGGER IF NOT EXISTS trg_faq_tags_count_insert
+        AFTER INSERT ON faq_tags
+        BEGIN
+            UPDATE tags SET faq_count = faq_count + 1 WHERE id = NEW.tag_id;
+        END
+    """,
+    "trg_faq_tags_count_delete": """
+        CREATE TRIGGER IF NOT EXISTS trg_faq_tags_count_delete
+        AFTER DELETE ON faq_tags
+        BEGIN
+            UPDATE tags SET faq_count = max(faq_count - 1, 0) WHERE id = OLD.tag_id;
+        END
+    """,
+    "trg_faq_tags_count_update": """
+        CREATE TRIGGER IF NOT EXISTS trg_faq_tags_count_update
+        AFTER UPDATE OF tag_id ON faq_tags
+        BEGIN
+            UPDATE tags SET faq_count = faq_count + 1 WHERE id = NEW.tag_id;
+            UPDATE tags SET faq_count = max(faq_count - 1, 0) WHERE id = OLD.tag_id;
+        END
+    """,
+}
+
+# Same columns as the Postgres materialized view, computed on every read
+STATS_VIEW_DDL = """
+    CREATE VIEW IF NOT EXISTS stats_overview_mv AS
+    SELECT
+        1 AS id,
+        (SELECT last_value FROM catalog_version_seq) AS catalog_version,
+        strftime('%Y-%m-%d %H:%M:%f', 'now') AS refreshed_at,
+        (SELECT count(*) FROM faqs) AS total_faqs,
+        (SELECT count(*) FROM faqs WHERE is_active) AS active_faqs,
+        (SELECT count(*) FROM tags) AS total_tags,
+        (SELECT count(*) FROM question_variants) AS total_variants,
+        (
+            SELECT json_group_array(json_object(
+                'tag_id', tag_id,
+                'name', name,
+                'is_active', json(CASE WHEN is_active THEN 'true' ELSE 'false' END),
+                'total_faqs', total_faqs,
+                'active_faqs', active_faqs,
+                'inactive_faqs', total_faqs - active_faqs
+            ))
+            FROM (
+                SELECT t.id AS tag_id, t.name, t.is_active,
+                       COALESCE(c.total_faqs, 0) AS total_faqs,
+                       COALESCE(c.active_faqs, 0) AS active_faqs
+                FROM tags t
+                LEFT JOIN (
+                    SELECT ft.tag_id, count(*) AS total_faqs, sum(fq.is_active) AS active_faqs
+                    FROM faq_tags ft
+                    JOIN faqs fq ON fq.id = ft.faq_id
+                    GROUP BY ft.tag_id
+                ) c ON c.tag_id = t.id
+                ORDER BY t.display_order, t.name
+            )
+        ) AS by_tag,
+        (
+            SELECT json_group_array(json_object(
+                'id', id,
+                'question', question,
+                'usage_frequency', usage_frequency,
+                'is_active', json(CASE WHEN is_active THEN 'true' ELSE 'false' END)
+            ))
+            FROM (
+                SELECT id, question, usage_frequency, is_active
+                FROM faqs
+                ORDER BY usage_frequency DESC, id
+                LIMIT 50
+            )
+        ) AS top_usage
+"""
+
+SEED_CHUNK_ROWS = 5000
+
+
+def is_sqlite(bind: Any) -> bool:
+    """Whether an engine, connection or session talks to SQLite (local backend)."""
+    dialect = getattr(bind, "dialect", None)
+    if dialect is None:
+        dialect = bind.bind.dialect
+    return dialect.name == "sqlite"
+
+
+def is_sqlite_url(dsn: str) -> bool:
+    return make_url(dsn).get_backend_name() == "sqlite"
+
+
+def sqlite_engine_options(dsn: str, poolclass: Any, pool_size: int, max_overflow: int) -> Dict[str, Any]:
+    """create_async_engine options for a SQLite DSN.
+
+    An in-memory database exists once per connection, so it gets a single
+    shared connection; a file database uses the regular (instrumented) pool.
+    """
+    if make_url(dsn).database in (None, "", ":memory:"):
+        return {"poolclass": StaticPool}
+    return {"poolclass": poolclass, "pool_size": pool_size, "max_overflow": max_overflow}
+
+
+def configure_sqlite_engine(engine: AsyncEngine) -> None:
+    """Apply the local pragmas to every new SQLite connection."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+async def drop_local_triggers(conn: AsyncConnection) -> None:
+    """Drop the local triggers (bulk loads that write the counters themselves)."""
+    for name in LOCAL_TRIGGERS:
+        await conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+
+async def create_local_triggers(conn: AsyncConnection) -> None:
+    for ddl in LOCAL_TRIGGERS.values():
+        await conn.execute(text(ddl))
+
+
+async def create_local_schema(engine: AsyncEngine) -> None:
+    """Create the tables, triggers, catalog version and stats view if they do not exist."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for ddl in CATALOG_VERSION_DDL:
+            await conn.execute(text(ddl))
+        await create_local_triggers(conn)
+        await conn.execute(text(STATS_VIEW_DDL))
+
+
+def _parse_export(csv_path: Path) -> List[Any]:
+    """Parse the whole export in this process (blocking, run in a thread)."""
+    from app.importer.csv_source import iter_chunks, parse_chunk
+
+    chunks, row_no = [], 2  # row 1 is the header
+    for df in iter_chunks(str(csv_path), SEED_CHUNK_ROWS, use_arrow=False):
+        chunks.append(parse_chunk(df, row_no))
+        row_no += len(df)
+    return chunks
+
+
+async def seed_catalog(engine: AsyncEngine, csv_path: Path) -> Optional[Dict[str, int]]:
+    """Load the intent export into an empty local database.
+
+    Rows are parsed with the importer's CSV parser and inserted as they are
+    (the first row wins for a repeated 의도ID). Returns None when the
+    catalog already has FAQs.
+    """
+    async with engine.connect() as conn:
+        if (await conn.execute(select(FAQ.id).limit(1))).first() is not None:
+            return None
+
+    chunks = await asyncio.to_thread(_parse_export, csv_path)
+    faqs: Dict[str, tuple] = {}
+    variants: List[tuple] = []
+    for chunk in chunks:
+        for record in chunk.faqs:
+            faqs.setdefault(record[1], record)
+        variants.extend(chunk.variants)
+
+    async with engine.begin() as conn:
+        tag_ids = {name: tag_id for tag_id, name in (await conn.execute(select(Tag.id, Tag.name))).all()}
+        new_tags = sorted({record[2] for record in faqs.values() if record[2] and record[2] not in tag_ids})
+        first_order = len(tag_ids) + 1
+        for offset, name in enumerate(new_tags):
+            result = await conn.execute(
+                insert(Tag).values(name=name, display_order=first_order + offset, is_active=True).returning(Tag.id)
+            )
+            tag_ids[name] = result.scalar_one()
+
+        faq_ids: Dict[int, int] = {}
+        for faq_id, record in enumerate(faqs.values(), start=1):
+            faq_ids[record[0]] = faq_id
+        await conn.execute(insert(FAQ), [
+            {
+                "id": faq_ids[row_no], "external_id": external_id, "question": question, "answer": answer,
+                "usage_frequency": usage_frequency, "is_active": is_active,
+                "created_by": created_by, "updated_by": updated_by, "content_hash": digest,
+                "answer_html": answer_html, "answer_text": answer_text, "answer_render_version": render_version,
+            }
+            for (row_no, external_id, _, question, answer, usage_frequency, is_active,
+                 created_by, updated_by, digest, answer_html, answer_text, render_version) in faqs.values()
+        ])
+        links = [
+            {"faq_id": faq_ids[record[0]], "tag_id": tag_ids[record[2]]}
+            for record in faqs.values() if record[2]
+        ]
+        if links:
+            await conn.execute(insert(FaqTag), links)
+        # Variants of a skipped repeated row have no FAQ
+        variant_rows = [
+            {"faq_id": faq_ids[row_no], "question_text": question_text, "is_representative": is_representative}
+            for row_no, _, question_text, is_representative in variants if row_no in faq_ids
+        ]
+        if variant_rows:
+            await conn.execute(insert(QuestionVariant), variant_rows)
+
+    stats = {"faqs": len(faqs), "tags_created": len(new_tags), "variants": len(variant_rows)}
+    logger.info(f"✅ 로컬 DB 시드 완료: {csv_path.name} -> FAQ {stats['faqs']}개, 질의문 {stats['variants']}개")
+    return stats
+
+
+async def prepare_local_database(engine: AsyncEngine, seed_csv: Optional[Path]) -> None:
+    """Create the local schema and seed the catalog once (startup in local backend mode)."""
+    await create_local_schema(engine)
+    if seed_csv is None:
+        return
+    if not seed_csv.exists():
+        logger.warning(f"로컬 시드 CSV 를 찾을 수 없습니다: {seed_csv}")
+        return
+    await seed_catalog(engine, seed_csv)
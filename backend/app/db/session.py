@@ -12,20 +12,37 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.config import settings
+from app.core import request_stats, slow_queries
+from app.core.metrics import instrument_engine, pool_class
+from app.db.local import configure_sqlite_engine, is_sqlite_url, sqlite_engine_options
 
 logger = logging.getLogger(__name__)
 
 _pool_size = settings.postgres_pool_min
 _max_overflow = max(settings.postgres_pool_max - _pool_size, 0)
 
-engine: AsyncEngine = create_async_engine(
-    settings.postgres_dsn,
-    pool_pre_ping=True,
-    pool_size=_pool_size,
-    max_overflow=_max_overflow,
-    echo=settings.log_level.upper() == "DEBUG",
-    future=True,
-)
+if is_sqlite_url(settings.database_dsn):
+    # Local backend mode (LOCAL_BACKEND=true): see app/db/local.py
+    engine: AsyncEngine = create_async_engine(
+        settings.database_dsn,
+        echo=settings.log_level.upper() == "DEBUG",
+        future=True,
+        **sqlite_engine_options(settings.database_dsn, pool_class(), _pool_size, _max_overflow),
+    )
+    configure_sqlite_engine(engine)
+else:
+    engine = create_async_engine(
+        settings.database_dsn,
+        pool_pre_ping=True,
+        poolclass=pool_class(),
+        pool_size=_pool_size,
+        max_overflow=_max_overflow,
+        echo=settings.log_level.upper() == "DEBUG",
+        future=True,
+    )
+instrument_engine(engine)
+request_stats.instrument_engine(engine)
+slow_queries.instrument_engine(engine)
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -50,11 +67,12 @@ async def get_db() -> AsyncSession:
 
 
 async def check_database_connection() -> None:
-    """Validate that the Postgres connection works."""
+    """Validate that the database connection works."""
+    name = "SQLite" if is_sqlite_url(settings.database_dsn) else "Postgres"
     try:
         async with engine.connect() as connection:
             await connection.execute(text("SELECT 1"))
-        logger.info("✅ Postgres 연결 확인 완료")
+        logger.info(f"✅ {name} 연결 확인 완료")
     except SQLAlchemyError as exc:
-        logger.exception("❌ Postgres 연결 확인 실패")
+        logger.exception(f"❌ {name} 연결 확인 실패")
         raise exc
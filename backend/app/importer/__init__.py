@@ -0,0 +1,15 @@
+"""CSV catalog importer."""
+from .csv_source import iter_chunks, parse_chunk
+from .loader import ImportUnavailableError, create_staging_tables, merge_staged, stage_catalog, upsert_catalog
+from .pipeline import import_catalog
+
+__all__ = [
+    "iter_chunks",
+    "parse_chunk",
+    "ImportUnavailableError",
+    "create_staging_tables",
+    "merge_staged",
+    "stage_catalog",
+    "upsert_catalog",
+    "import_catalog",
+]
@@ -0,0 +1,221 @@
+"""Parse the intent export CSV (docs/docs.csv) into staging records.
+
+The file is read in fixed-size chunks (pandas, or pyarrow's streaming reader
+when it is installed) and each chunk is cleaned with vectorized string
+operations, so memory depends on the chunk size rather than the file size.
+"""
+import csv
+import hashlib
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from app.utils.markup import RENDER_VERSION, render_answer
+
+# Column positions in the export (header names repeat, so positions are used)
+COL_EXTERNAL_ID = 0  # 의도ID
+COL_GROUP = 3  # 의도그룹
+COL_USAGE_STATUS = 5  # 사용상태
+COL_USAGE_FREQUENCY = 6  # 총 사용빈도
+COL_REPRESENTATIVE = 8  # 대표질의문
+COL_DISPLAY_QUESTION = 9  # display질의문
+COL_QUESTIONS = 10  # 질의문 (comma-separated)
+COL_AUTHORS = 11  # 등록자 / 수정자
+COL_ANSWER = 14  # 단순응답
+
+ACTIVE_STATUS = "사용"
+MAX_QUESTION_LENGTH = 500
+MAX_EXTERNAL_ID_LENGTH = 64
+MAX_AUTHOR_LENGTH = 50
+MAX_TAG_LENGTH = 100
+
+DEFAULT_CHUNK_ROWS = 5000
+ARROW_BLOCK_SIZE = 16 << 20
+MAX_REPORTED_ERRORS = 100
+
+# Record layouts, in the column order of the staging tables
+FAQ_COLUMNS = [
+    "row_no", "external_id", "tag_name", "question", "answer",
+    "usage_frequency", "is_active", "created_by", "updated_by", "content_hash",
+    "answer_html", "answer_text", "answer_render_version",
+]
+VARIANT_COLUMNS = ["row_no", "external_id", "question_text", "is_representative"]
+
+
+@dataclass
+class ParsedChunk:
+    """Staging records parsed from one chunk of the CSV."""
+    rows: int
+    faqs: List[tuple] = field(default_factory=list)
+    variants: List[tuple] = field(default_factory=list)
+    error_count: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def arrow_available() -> bool:
+    """Whether pyarrow's streaming CSV reader can be used."""
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _pandas_chunks(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    with open(path, "rb") as f:
+        with pd.read_csv(f, encoding="utf-8-sig", dtype=str, chunksize=chunk_rows) as reader:
+            for df in reader:
+                df.attrs["bytes_read"] = f.tell()
+                yield df
+
+
+def _arrow_chunks(path: str) -> Iterator[pd.DataFrame]:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        column_count = len(next(csv.reader(f)))
+    names = [f"c{i}" for i in range(column_count)]
+
+    with open(path, "rb") as f:
+        reader = pacsv.open_csv(
+            f,
+            read_options=pacsv.ReadOptions(column_names=names, skip_rows=1, block_size=ARROW_BLOCK_SIZE),
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(column_types={name: pa.string() for name in names}),
+        )
+        for batch in reader:
+            if batch.num_rows:
+                df = batch.to_pandas()
+                df.attrs["bytes_read"] = f.tell()
+                yield df
+
+
+def iter_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, use_arrow: Optional[bool] = None) -> Iterator[pd.DataFrame]:
+    """Yield the CSV as string-typed DataFrame chunks (positional columns).
+
+    ``df.attrs["bytes_read"]`` is the approximate file offset after the chunk.
+    """
+    if use_arrow is None:
+        use_arrow = arrow_available()
+    if use_arrow:
+        return _arrow_chunks(path)
+    return _pandas_chunks(path, chunk_rows)
+
+
+def _clean(series: pd.Series) -> pd.Series:
+    """Strip whitespace; empty strings become missing."""
+    cleaned = series.astype(object).where(series.notna(), None)
+    cleaned = pd.Series(cleaned, dtype="string").str.strip()
+    return cleaned.mask(cleaned == "")
+
+
+def content_hash(question: str, answer: str, tag_name: Optional[str], is_active: bool, variants: str) -> str:
+    """SHA-256 over the imported content of one FAQ.
+
+    ``variants`` is the sorted, joined '<is_representative><question_text>'
+    list, so variant order in the file does not matter.
+    """
+    payload = "\x1e".join((question, answer, tag_name or "", "1" if is_active else "0", variants))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _values(series: pd.Series) -> list:
+    """Python values with missing entries as None (asyncpg COPY needs plain types)."""
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def parse_chunk(df: pd.DataFrame, first_row_no: int) -> ParsedChunk:
+    """Convert one chunk of CSV rows into FAQ and variant staging records."""
+    result = ParsedChunk(rows=len(df))
+    if df.empty:
+        return result
+
+    columns = df.columns
+    row_no = pd.Series(range(first_row_no, first_row_no + len(df)), index=df.index)
+    external_id = _clean(df[columns[COL_EXTERNAL_ID]])
+    question = _clean(df[columns[COL_DISPLAY_QUESTION]])
+    answer = _clean(df[columns[COL_ANSWER]])
+    raw_frequency = _clean(df[columns[COL_USAGE_FREQUENCY]])
+    frequency = pd.to_numeric(raw_frequency, errors="coerce")
+
+    missing = external_id.isna() | question.isna() | answer.isna()
+    too_long = ~missing & (
+        (external_id.str.len() > MAX_EXTERNAL_ID_LENGTH) | (question.str.len() > MAX_QUESTION_LENGTH)
+    )
+    bad_number = ~missing & ~too_long & raw_frequency.notna() & frequency.isna()
+    invalid = missing | too_long | bad_number
+
+    if invalid.any():
+        messages = pd.Series("", index=df.index)
+        messages[missing] = "Missing essential fields (id, question or answer)"
+        messages[too_long] = "id or question is too long"
+        messages[bad_number] = "usage frequency is not a number"
+        result.error_count = int(invalid.sum())
+        result.errors = [
+            f"Row {n}: {message}"
+            for n, message in zip(row_no[invalid].head(MAX_REPORTED_ERRORS), messages[invalid].head(MAX_REPORTED_ERRORS))
+        ]
+
+    valid = ~invalid
+    row_no, external_id, question, answer = row_no[valid], external_id[valid], question[valid], answer[valid]
+    frequency = frequency[valid].fillna(0).astype("int64")
+    tag_name = _clean(df.loc[valid, columns[COL_GROUP]]).str.slice(0, MAX_TAG_LENGTH)
+    usage_status = _clean(df.loc[valid, columns[COL_USAGE_STATUS]])
+    is_active = usage_status.isna() | (usage_status == ACTIVE_STATUS)
+
+    # '등록자 / 수정자' -> (created_by, updated_by)
+    authors = _clean(df.loc[valid, columns[COL_AUTHORS]]).str.split("/", n=1, expand=True).reindex(columns=[0, 1])
+    created_by = _clean(authors[0]).str.slice(0, MAX_AUTHOR_LENGTH)
+    updated_by = _clean(authors[1]).str.slice(0, MAX_AUTHOR_LENGTH)
+
+    # 질의문 (comma-separated) -> one record per unique variant text
+    variants = pd.DataFrame({
+        "row_no": row_no,
+        "external_id": external_id,
+        "question_text": _clean(df.loc[valid, columns[COL_QUESTIONS]]).str.split(","),
+        "representative": _clean(df.loc[valid, columns[COL_REPRESENTATIVE]]),
+    }).explode("question_text")
+    variants["question_text"] = _clean(variants["question_text"])
+    variants = variants[
+        variants["question_text"].notna() & (variants["question_text"].str.len() <= MAX_QUESTION_LENGTH)
+    ].drop_duplicates(subset=["row_no", "question_text"])
+    is_representative = (variants["question_text"] == variants["representative"]).fillna(False).astype(bool)
+
+    result.variants = list(zip(
+        variants["row_no"].tolist(),
+        _values(variants["external_id"]),
+        _values(variants["question_text"]),
+        is_representative.tolist(),
+    ))
+
+    variant_keys = is_representative.map({True: "1", False: "0"}) + variants["question_text"].astype(str)
+    signatures = variant_keys.groupby(variants["row_no"]).agg(lambda keys: "\x1f".join(sorted(keys)))
+    signatures = signatures.reindex(row_no.values, fill_value="").tolist()
+
+    is_active = is_active.fillna(True).astype(bool).tolist()
+    tag_name, question, answer = _values(tag_name), _values(question), _values(answer)
+    hashes = [
+        content_hash(*fields)
+        for fields in zip(question, answer, tag_name, is_active, signatures)
+    ]
+    # Rendered here so the markup work is spread over the parser processes
+    rendered = [render_answer(text) for text in answer]
+    result.faqs = list(zip(
+        row_no.tolist(),
+        _values(external_id),
+        tag_name,
+        question,
+        answer,
+        frequency.tolist(),
+        is_active,
+        _values(created_by),
+        _values(updated_by),
+        hashes,
+        [html for html, _ in rendered],
+        [text for _, text in rendered],
+        [RENDER_VERSION] * len(rendered),
+    ))
+    return result
+
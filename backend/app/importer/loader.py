@@ -0,0 +1,390 @@
+"""Set-based catalog upsert.
+
+Parsed rows are COPY'd into temporary staging tables and merged into the
+catalog with a handful of INSERT ... ON CONFLICT / UPDATE / DELETE
+statements, all inside the caller's transaction. Readers keep seeing the
+previous catalog until commit.
+
+Each staged row carries a content hash (question, answer, tag, active flag
+and variants). Comparing it with ``faqs.content_hash`` classifies every row
+as new, changed or unchanged before anything is written, and only new and
+changed FAQs (plus their tags and variants) are rewritten. Admin edits clear
+the stored hash, so those FAQs always count as changed.
+
+Created tags, rewritten FAQs and deleted FAQs are appended to the change log
+(``catalog_changes``) in the same transaction; usage-only bumps are not.
+
+The merge is Postgres-only. The local SQLite backend is seeded from the
+export by ``app.db.local.seed_catalog`` instead.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.changes import lock_change_log
+from app.db.local import is_sqlite
+from app.importer.csv_source import FAQ_COLUMNS, VARIANT_COLUMNS
+
+STAGE_FAQS = "stage_faqs"
+STAGE_VARIANTS = "stage_variants"
+STAGE_CHANGES = "stage_changes"
+
+
+class ImportUnavailableError(RuntimeError):
+    """The configured database cannot run the CSV merge (the local SQLite backend)."""
+
+
+STAGING_DDL = [
+    f"""CREATE TEMP TABLE {STAGE_FAQS} (
+        row_no integer NOT NULL,
+        external_id varchar(64) NOT NULL,
+        tag_name varchar(100),
+        question varchar(500) NOT NULL,
+        answer text NOT NULL,
+        usage_frequency integer NOT NULL,
+        is_active boolean NOT NULL,
+        created_by varchar(50),
+        updated_by varchar(50),
+        content_hash varchar(64) NOT NULL,
+        answer_html text,
+        answer_text text,
+        answer_render_version integer NOT NULL
+    ) ON COMMIT DROP""",
+    f"""CREATE TEMP TABLE {STAGE_VARIANTS} (
+        row_no integer NOT NULL,
+        external_id varchar(64) NOT NULL,
+        question_text varchar(500) NOT NULL,
+        is_representative boolean NOT NULL
+    ) ON COMMIT DROP""",
+]
+
+PREPARE_STEPS = [
+    ("index_stage", f"CREATE INDEX ON {STAGE_FAQS} (external_id)"),
+    ("index_stage_variants", f"CREATE INDEX ON {STAGE_VARIANTS} (row_no)"),
+    ("analyze_stage", f"ANALYZE {STAGE_FAQS}"),
+    ("analyze_stage_variants", f"ANALYZE {STAGE_VARIANTS}"),
+    # The same 의도ID twice in one file: keep the first row
+    ("duplicates", f"""
+        DELETE FROM {STAGE_FAQS} s USING {STAGE_FAQS} d
+        WHERE s.external_id = d.external_id AND s.row_no > d.row_no
+    """),
+    ("orphan_variants", f"""
+        DELETE FROM {STAGE_VARIANTS} v
+        WHERE NOT EXISTS (SELECT 1 FROM {STAGE_FAQS} s WHERE s.row_no = v.row_no)
+    """),
+]
+
+# Link FAQs created before external_id existed, by an unambiguous question match
+ADOPT_LEGACY_SQL = f"""
+    UPDATE faqs f SET external_id = s.external_id
+    FROM {STAGE_FAQS} s
+    WHERE f.external_id IS NULL
+      AND f.question = s.question
+      AND NOT EXISTS (SELECT 1 FROM faqs e WHERE e.external_id = s.external_id)
+      AND (SELECT count(*) FROM faqs f2 WHERE f2.external_id IS NULL AND f2.question = s.question) = 1
+      AND (SELECT count(*) FROM {STAGE_FAQS} s2 WHERE s2.question = s.question) = 1
+"""
+
+CLASSIFY_STEPS = [
+    ("classify", f"""
+        CREATE TEMP TABLE stage_diff ON COMMIT DROP AS
+        SELECT s.row_no, f.id AS faq_id,
+               CASE WHEN f.id IS NULL THEN 'new'
+                    WHEN f.content_hash IS DISTINCT FROM s.content_hash THEN 'changed'
+                    ELSE 'unchanged' END AS status
+        FROM {STAGE_FAQS} s
+        LEFT JOIN faqs f ON f.external_id = s.external_id
+    """),
+    ("index_diff", "CREATE INDEX ON stage_diff (row_no)"),
+    ("analyze_diff", "ANALYZE stage_diff"),
+]
+
+DIFF_COUNTS_SQL = "SELECT status, count(*) FROM stage_diff GROUP BY status"
+
+REMOVED_COUNT_SQL = f"""
+    SELECT count(*) FROM faqs f
+    WHERE f.external_id IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM {STAGE_FAQS} s WHERE s.external_id = f.external_id)
+"""
+
+DIFF_SAMPLE_SQL = f"""
+    (SELECT d.status, s.external_id, s.question
+     FROM stage_diff d JOIN {STAGE_FAQS} s ON s.row_no = d.row_no
+     WHERE d.status = 'new' ORDER BY d.row_no LIMIT :limit)
+    UNION ALL
+    (SELECT d.status, s.external_id, s.question
+     FROM stage_diff d JOIN {STAGE_FAQS} s ON s.row_no = d.row_no
+     WHERE d.status = 'changed' ORDER BY d.row_no LIMIT :limit)
+    UNION ALL
+    (SELECT 'removed', f.external_id, f.question
+     FROM faqs f
+     WHERE f.external_id IS NOT NULL
+       AND NOT EXISTS (SELECT 1 FROM {STAGE_FAQS} s WHERE s.external_id = f.external_id)
+     ORDER BY f.id LIMIT :limit)
+"""
+
+CREATE_TAGS_SQL = f"""
+    WITH created AS (
+        INSERT INTO tags (name, display_order, is_active, created_at, updated_at)
+        SELECT n.tag_name,
+               COALESCE((SELECT max(display_order) FROM tags), 0) + row_number() OVER (ORDER BY n.tag_name),
+               true, CAST(:now AS TIMESTAMP), CAST(:now AS TIMESTAMP)
+        FROM (SELECT DISTINCT tag_name FROM {STAGE_FAQS} WHERE tag_name IS NOT NULL) n
+        WHERE NOT EXISTS (SELECT 1 FROM tags t WHERE t.name = n.tag_name)
+        ON CONFLICT (name) DO NOTHING
+        RETURNING id
+    )
+    INSERT INTO {STAGE_CHANGES} (entity, entity_id, op)
+    SELECT 'tag', id, 'upsert' FROM created
+"""
+
+UPSERT_FAQS_SQL = f"""
+    INSERT INTO faqs AS f (
+        external_id, question, answer, usage_frequency, is_active,
+        created_by, updated_by, created_at, updated_at, content_hash,
+        answer_html, answer_text, answer_render_version
+    )
+    SELECT s.external_id, s.question, s.answer, s.usage_frequency, s.is_active,
+           s.created_by, s.updated_by, CAST(:now AS TIMESTAMP), CAST(:now AS TIMESTAMP), s.content_hash,
+           s.answer_html, s.answer_text, s.answer_render_version
+    FROM {STAGE_FAQS} s
+    JOIN stage_diff d ON d.row_no = s.row_no
+    WHERE d.status <> 'unchanged'
+    ON CONFLICT (external_id) DO UPDATE SET
+        question = EXCLUDED.question,
+        answer = EXCLUDED.answer,
+        usage_frequency = GREATEST(f.usage_frequency, EXCLUDED.usage_frequency),
+        is_active = EXCLUDED.is_active,
+        updated_by = EXCLUDED.updated_by,
+        updated_at = EXCLUDED.updated_at,
+        content_hash = EXCLUDED.content_hash,
+        answer_html = EXCLUDED.answer_html,
+        answer_text = EXCLUDED.answer_text,
+        answer_render_version = EXCLUDED.answer_render_version
+    RETURNING (xmax = 0) AS inserted
+"""
+
+# Unchanged content, but the export counted more uses (usage_frequency is unindexed: HOT update)
+RAISE_USAGE_SQL = f"""
+    UPDATE faqs f SET usage_frequency = s.usage_frequency
+    FROM stage_diff d
+    JOIN {STAGE_FAQS} s ON s.row_no = d.row_no
+    WHERE d.status = 'unchanged' AND f.id = d.faq_id AND f.usage_frequency < s.usage_frequency
+"""
+
+DELETE_MISSING_SQL = f"""
+    WITH deleted AS (
+        DELETE FROM faqs f
+        WHERE f.external_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM {STAGE_FAQS} s WHERE s.external_id = f.external_id)
+        RETURNING f.id
+    )
+    INSERT INTO {STAGE_CHANGES} (entity, entity_id, op)
+    SELECT 'faq', id, 'delete' FROM deleted
+"""
+
+RELATION_STEPS = [
+    ("map_faqs", f"""
+        CREATE TEMP TABLE stage_map ON COMMIT DROP AS
+        SELECT f.id AS faq_id, s.row_no, t.id AS tag_id
+        FROM {STAGE_FAQS} s
+        JOIN stage_diff d ON d.row_no = s.row_no AND d.status <> 'unchanged'
+        JOIN faqs f ON f.external_id = s.external_id
+        LEFT JOIN tags t ON t.name = s.tag_name
+    """),
+    ("index_map", "CREATE INDEX ON stage_map (faq_id)"),
+    ("map_variants", f"""
+        CREATE TEMP TABLE stage_variant_map ON COMMIT DROP AS
+        SELECT DISTINCT ON (m.faq_id, v.question_text) m.faq_id, v.question_text, v.is_representative
+        FROM {STAGE_VARIANTS} v
+        JOIN stage_map m ON m.row_no = v.row_no
+        ORDER BY m.faq_id, v.question_text, v.is_representative DESC
+    """),
+    ("index_variant_map", "CREATE INDEX ON stage_variant_map (faq_id, question_text)"),
+    ("analyze_map", "ANALYZE stage_map"),
+    ("analyze_variant_map", "ANALYZE stage_variant_map"),
+    ("tag_links_removed", """
+        DELETE FROM faq_tags ft USING stage_map m
+        WHERE ft.faq_id = m.faq_id AND ft.tag_id IS DISTINCT FROM m.tag_id
+    """),
+    ("tag_links_added", """
+        INSERT INTO faq_tags (faq_id, tag_id, created_at)
+        SELECT m.faq_id, m.tag_id, CAST(:now AS TIMESTAMP)
+        FROM stage_map m
+        WHERE m.tag_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM faq_tags ft WHERE ft.faq_id = m.faq_id AND ft.tag_id = m.tag_id)
+        ON CONFLICT ON CONSTRAINT uq_faq_tag DO NOTHING
+    """),
+    ("variants_removed", """
+        DELETE FROM question_variants qv USING stage_map m
+        WHERE qv.faq_id = m.faq_id
+          AND NOT EXISTS (
+              SELECT 1 FROM stage_variant_map v
+              WHERE v.faq_id = qv.faq_id AND v.question_text = qv.question_text
+          )
+    """),
+    ("variants_updated", """
+        UPDATE question_variants qv SET is_representative = v.is_representative
+        FROM stage_variant_map v
+        WHERE qv.faq_id = v.faq_id AND qv.question_text = v.question_text
+          AND qv.is_representative <> v.is_representative
+    """),
+    ("variants_added", """
+        INSERT INTO question_variants (faq_id, question_text, is_representative, created_at)
+        SELECT v.faq_id, v.question_text, v.is_representative, CAST(:now AS TIMESTAMP)
+        FROM stage_variant_map v
+        WHERE NOT EXISTS (
+            SELECT 1 FROM question_variants qv
+            WHERE qv.faq_id = v.faq_id AND qv.question_text = v.question_text
+        )
+    """),
+]
+
+# Change log rows are collected during the merge and appended under the
+# change log lock at the very end, so admin writes wait only for the commit
+CHANGE_LOG_DDL = f"""CREATE TEMP TABLE {STAGE_CHANGES} (
+    seq serial,
+    entity varchar(20) NOT NULL,
+    entity_id integer NOT NULL,
+    op varchar(10) NOT NULL
+) ON COMMIT DROP"""
+
+FAQ_CHANGES_SQL = f"""
+    INSERT INTO {STAGE_CHANGES} (entity, entity_id, op)
+    SELECT 'faq', faq_id, 'upsert' FROM stage_map ORDER BY faq_id
+"""
+
+APPEND_CHANGES_SQL = f"""
+    INSERT INTO catalog_changes (entity, entity_id, op, changed_at)
+    SELECT entity, entity_id, op, CAST(:now AS TIMESTAMP) FROM {STAGE_CHANGES} ORDER BY seq
+"""
+
+# Steps whose row counts are reported
+COUNTED_STEPS = {
+    "duplicates", "tag_links_removed", "tag_links_added",
+    "variants_removed", "variants_updated", "variants_added",
+}
+
+
+async def create_staging_tables(conn: AsyncConnection) -> None:
+    """Create the temporary staging tables (dropped at commit)."""
+    if is_sqlite(conn):
+        raise ImportUnavailableError(
+            "The CSV import merge needs Postgres; the local backend is seeded from LOCAL_SEED_CSV at startup"
+        )
+    for ddl in STAGING_DDL:
+        await conn.execute(text(ddl))
+
+
+async def copy_records(conn: AsyncConnection, table: str, columns: Sequence[str], records: Iterable[tuple]) -> None:
+    """COPY records into a staging table through the asyncpg driver connection."""
+    raw_connection = await conn.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table, records=records, columns=list(columns)
+    )
+
+
+async def stage_catalog(conn: AsyncConnection, faqs: List[tuple], variants: List[tuple]) -> None:
+    """COPY one batch of parsed FAQ and variant records into the staging tables."""
+    if faqs:
+        await copy_records(conn, STAGE_FAQS, FAQ_COLUMNS, faqs)
+    if variants:
+        await copy_records(conn, STAGE_VARIANTS, VARIANT_COLUMNS, variants)
+
+
+async def classify_staged(conn: AsyncConnection, sample_limit: int = 20) -> Dict[str, Any]:
+    """Diff the staged catalog against the database without writing to the catalog tables."""
+    for _, sql in CLASSIFY_STEPS:
+        await conn.execute(text(sql))
+
+    diff: Dict[str, Any] = {"new": 0, "changed": 0, "unchanged": 0}
+    for status, count in (await conn.execute(text(DIFF_COUNTS_SQL))).all():
+        diff[status] = count
+    diff["removed"] = (await conn.execute(text(REMOVED_COUNT_SQL))).scalar()
+
+    samples: Dict[str, List[Dict[str, str]]] = {"new": [], "changed": [], "removed": []}
+    if sample_limit:
+        rows = await conn.execute(text(DIFF_SAMPLE_SQL), {"limit": sample_limit})
+        for status, external_id, question in rows.all():
+            samples[status].append({"external_id": external_id, "question": question})
+    diff["samples"] = samples
+    return diff
+
+
+async def merge_staged(
+    conn: AsyncConnection,
+    delete_missing: bool = True,
+    adopt_legacy: bool = False,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Classify the staged catalog and, unless ``dry_run``, apply it with set-based statements.
+
+    Returns row counts; ``diff`` holds the new/changed/unchanged/removed
+    classification. With ``dry_run`` nothing is written to the catalog and the
+    caller is expected to roll back (adopt_legacy links are only previewed).
+    """
+    stats: Dict[str, Any] = {}
+    params = {"now": datetime.utcnow()}
+
+    for name, sql in PREPARE_STEPS:
+        result = await conn.execute(text(sql))
+        if name in COUNTED_STEPS:
+            stats[name] = result.rowcount
+
+    staged = (await conn.execute(text(f"SELECT count(*) FROM {STAGE_FAQS}"))).scalar()
+    if not staged:
+        raise ValueError("No valid rows were staged; refusing to merge an empty catalog")
+    stats["staged"] = staged
+
+    if adopt_legacy:
+        stats["adopted"] = (await conn.execute(text(ADOPT_LEGACY_SQL))).rowcount
+
+    diff = await classify_staged(conn)
+    if not delete_missing:
+        diff["removed"] = 0
+        diff["samples"]["removed"] = []
+    stats["diff"] = diff
+    if dry_run:
+        return stats
+
+    await conn.execute(text(CHANGE_LOG_DDL))
+    stats["tags_created"] = (await conn.execute(text(CREATE_TAGS_SQL), params)).rowcount
+
+    upserted = (await conn.execute(text(UPSERT_FAQS_SQL), params)).scalars().all()
+    stats["faqs_inserted"] = sum(1 for inserted in upserted if inserted)
+    stats["faqs_updated"] = len(upserted) - stats["faqs_inserted"]
+    stats["usage_raised"] = (await conn.execute(text(RAISE_USAGE_SQL))).rowcount
+
+    stats["faqs_deleted"] = (await conn.execute(text(DELETE_MISSING_SQL))).rowcount if delete_missing else 0
+
+    for name, sql in RELATION_STEPS:
+        result = await conn.execute(text(sql), params)
+        if name in COUNTED_STEPS:
+            stats[name] = result.rowcount
+
+    await conn.execute(text(FAQ_CHANGES_SQL))
+    await lock_change_log(conn)
+    stats["changes_logged"] = (await conn.execute(text(APPEND_CHANGES_SQL), params)).rowcount
+    return stats
+
+
+async def upsert_catalog(
+    engine: AsyncEngine,
+    faqs: List[tuple],
+    variants: List[tuple],
+    delete_missing: bool = True,
+    adopt_legacy: bool = False,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Stage and merge a parsed catalog in a single transaction (rolled back when ``dry_run``)."""
+    async with engine.connect() as conn:
+        await create_staging_tables(conn)
+        await stage_catalog(conn, faqs, variants)
+        stats = await merge_staged(conn, delete_missing=delete_missing, adopt_legacy=adopt_legacy, dry_run=dry_run)
+        if dry_run:
+            await conn.rollback()
+        else:
+            await conn.commit()
+        return stats
@@ -0,0 +1,141 @@
+"""Streaming import pipeline: chunked reader -> process pool -> bounded queue -> COPY.
+
+The reader runs in a thread, each chunk is parsed in a worker process, and the
+parse futures travel through a bounded queue to the loader, which COPYs them
+into the staging tables in file order. When the database falls behind the
+queue fills up and reading pauses, so memory stays proportional to
+``chunk_rows * queue_size`` however large the file is.
+
+The import can be cancelled (task cancellation rolls the transaction back)
+until the ``committing`` phase. A cancel that arrives while COMMIT is running
+is absorbed: the commit finishes and the import returns normally, because
+its outcome would otherwise be unknown.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.importer.csv_source import DEFAULT_CHUNK_ROWS, MAX_REPORTED_ERRORS, iter_chunks, parse_chunk
+from app.importer.loader import create_staging_tables, merge_staged, stage_catalog
+
+logger = logging.getLogger(__name__)
+
+FIRST_ROW_NO = 2  # row 1 is the header
+
+
+async def _produce(path: str, chunk_rows: int, use_arrow: Optional[bool], executor, queue: asyncio.Queue) -> None:
+    """Read chunks and queue their parse futures; a final None marks the end."""
+    loop = asyncio.get_running_loop()
+    chunks = iter_chunks(path, chunk_rows, use_arrow)
+    row_no = FIRST_ROW_NO
+    try:
+        while True:
+            df = await loop.run_in_executor(None, next, chunks, None)
+            if df is None:
+                break
+            bytes_read = df.attrs.get("bytes_read")
+            await queue.put((loop.run_in_executor(executor, parse_chunk, df, row_no), bytes_read))
+            row_no += len(df)
+    except Exception as e:
+        # Hand the read error to the consumer so it fails instead of waiting forever
+        failed = loop.create_future()
+        failed.set_exception(e)
+        await queue.put((failed, None))
+        return
+    await queue.put(None)
+
+
+async def _commit_uncancellable(conn) -> None:
+    """Commit, waiting for COMMIT to finish even if the task is cancelled meanwhile."""
+    commit = asyncio.ensure_future(conn.commit())
+    cancels = 0
+    while True:
+        try:
+            await asyncio.shield(commit)
+            break
+        except asyncio.CancelledError:
+            if commit.done():
+                raise
+            cancels += 1
+    task = asyncio.current_task()
+    for _ in range(cancels):
+        task.uncancel()
+    if cancels:
+        logger.info("임포트 커밋 중 취소 요청 무시 (커밋 완료)")
+
+
+async def import_catalog(
+    engine: AsyncEngine,
+    path: str,
+    delete_missing: bool = True,
+    adopt_legacy: bool = False,
+    dry_run: bool = False,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    use_arrow: Optional[bool] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Stream a CSV export into the staging tables and merge it in one transaction.
+
+    With ``dry_run`` the diff is computed and the transaction rolled back.
+    ``progress`` is called with the running report after every staged chunk
+    and whenever the phase changes.
+    """
+    workers = workers or os.cpu_count() or 1
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or workers * 2)
+    report: Dict[str, Any] = {
+        "phase": "staging", "bytes_read": 0, "rows": 0, "faqs": 0, "variants": 0, "error_count": 0, "errors": [],
+    }
+
+    def set_phase(phase: str) -> None:
+        report["phase"] = phase
+        if progress:
+            progress(report)
+
+    # spawn: forking a process that already runs an event loop and DB pools is unsafe
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        async with engine.connect() as conn:
+            await create_staging_tables(conn)
+            set_phase("staging")
+            producer = asyncio.create_task(_produce(path, chunk_rows, use_arrow, executor, queue))
+            try:
+                while (item := await queue.get()) is not None:
+                    future, bytes_read = item
+                    chunk = await future
+                    await stage_catalog(conn, chunk.faqs, chunk.variants)
+                    report["rows"] += chunk.rows
+                    report["faqs"] += len(chunk.faqs)
+                    report["variants"] += len(chunk.variants)
+                    report["error_count"] += chunk.error_count
+                    report["errors"].extend(chunk.errors[:MAX_REPORTED_ERRORS - len(report["errors"])])
+                    if bytes_read is not None:
+                        report["bytes_read"] = bytes_read
+                    if progress:
+                        progress(report)
+                await producer
+            except BaseException:
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+                raise
+
+            logger.info(f"✅ CSV 스테이징 완료: {report['rows']} rows, {report['faqs']} FAQs, {report['variants']} variants")
+            set_phase("merging")
+            report["stats"] = await merge_staged(
+                conn, delete_missing=delete_missing, adopt_legacy=adopt_legacy, dry_run=dry_run
+            )
+            set_phase("committing")
+            if dry_run:
+                await conn.rollback()
+            else:
+                await _commit_uncancellable(conn)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return report
@@ -1,17 +1,35 @@
 """Entry point for the FastAPI backend service."""
+import asyncio
 import logging
+import os
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
 
 from app.config import settings  # 먼저 임포트하여 .env 파일 로드
 from app.core.redis import RedisSessionManager
 from app.utils.middleware import SessionMiddleware
 from app.api import router as service_router
-from app.db.session import check_database_connection
+from app.api.serializers import ORJSONResponse
+from app.db.local import prepare_local_database
+from app.db.session import check_database_connection, engine
+from app.core.usage import run_usage_flusher
+from app.core.trending import run_trending_rebalancer
+from app.core.stats import run_stats_refresher
+from app.core.imports import cancel_local_jobs
+from app.core.changes import run_change_log_pruner
+from app.api.change_stream import change_broadcaster
+from app.core.bundle import MANIFEST_NAME as BUNDLE_MANIFEST_NAME, run_bundle_builder
+from app.core import metrics
+from app.core.request_stats import RequestStatsMiddleware
+from app.core import slow_queries
+from app.core.profiling import ProfilingMiddleware, WorkerSampler, request_profiling_available
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -24,19 +42,64 @@ logging.basicConfig(
 async def lifespan(app: FastAPI):
     """Initialize shared resources for the service lifecycle."""
     redis_manager: Optional[RedisSessionManager] = None
+    background_tasks: List[asyncio.Task] = []
+    sampler: Optional[WorkerSampler] = None
     try:
         logger.info("🔄 FastAPI service 초기화 시작")
         await check_database_connection()
+        if settings.local_backend:
+            await prepare_local_database(engine, settings.local_seed_csv)
 
         redis_manager = RedisSessionManager()
         await redis_manager.connect()
         app.state.session_manager = redis_manager
         logger.info("✅ Redis Session Manager 초기화 완료")
 
+        background_tasks.append(
+            asyncio.create_task(run_usage_flusher(engine, settings.usage_flush_interval))
+        )
+        background_tasks.append(
+            asyncio.create_task(
+                run_trending_rebalancer(settings.trending_half_life, settings.trending_rebalance_interval)
+            )
+        )
+        background_tasks.append(
+            asyncio.create_task(
+                run_stats_refresher(engine, settings.stats_refresh_interval, settings.stats_max_age)
+            )
+        )
+        background_tasks.append(
+            asyncio.create_task(run_change_log_pruner(engine, settings.change_log_retention_days))
+        )
+        background_tasks.append(
+            asyncio.create_task(change_broadcaster.run(settings.change_poll_interval))
+        )
+        background_tasks.append(
+            asyncio.create_task(
+                run_bundle_builder(engine, settings.bundle_dir, settings.bundle_debounce, settings.bundle_max_delay)
+            )
+        )
+
+        if settings.profile_sampling_enabled:
+            sampler = WorkerSampler(
+                settings.profile_dir,
+                settings.profile_sampling_interval,
+                settings.profile_sampling_window,
+                settings.profile_keep,
+            )
+            sampler.start()
+
         yield
     finally:
+        await cancel_local_jobs()
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
         if redis_manager:
             await redis_manager.disconnect()
+        if sampler:
+            await asyncio.to_thread(sampler.stop)
+        metrics.mark_worker_dead()
         logger.info("🛑 FastAPI service 종료 완료")
 
 
@@ -46,6 +109,8 @@ app = FastAPI(
     docs_url="/p/faq/docs",
     redoc_url="/p/faq/redoc",
     lifespan=lifespan,
+    # orjson for dict responses; Default() keeps FastAPI's direct Pydantic-to-JSON path for response_model routes
+    default_response_class=Default(ORJSONResponse),
 )
 
 # Enable very permissive CORS for now (same as the existing service)
@@ -58,12 +123,46 @@ app.add_middleware(
 )
 
 # Attach the existing session middleware to reuse Redis validation
-app.add_middleware(SessionMiddleware)
+# (the public FAQ bundle is anonymous, like the frontend assets)
+app.add_middleware(
+    SessionMiddleware,
+    excluded_prefixes=["/static/", "/assets/", f"{settings.bundle_mount_path}/"],
+)
+
+# Lets the slow query log name the route that ran a statement
+if slow_queries.recorder is not None:
+    app.add_middleware(slow_queries.SlowQueryMiddleware)
+
+# Per-request SQL/Redis counts as Server-Timing headers; session validation lookups are included
+if settings.request_stats_enabled:
+    app.add_middleware(RequestStatsMiddleware, repeat_threshold=settings.query_repeat_threshold)
+
+# Metrics middleware is added last so it is outermost and also times session validation
+if metrics.enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Per-request profiling sits outside everything else so the profile covers the whole stack
+if request_profiling_available(settings.profiler_token):
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.profiler_token,
+        profile_dir=settings.profile_dir,
+        interval=settings.profile_interval,
+        keep=settings.profile_keep,
+    )
 
 # Register routers
 app.include_router(service_router)
 
 
+if metrics.enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint() -> Response:
+        """Prometheus scrape endpoint (sums all workers in multiprocess mode)."""
+        body, content_type = await asyncio.to_thread(metrics.render_metrics)
+        return Response(content=body, media_type=content_type)
+
+
 class SPAStaticFiles(StaticFiles):
     """StaticFiles subclass that falls back to index.html for SPA routes."""
 
@@ -74,6 +173,52 @@ class SPAStaticFiles(StaticFiles):
         return response
 
 
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles subclass that serves pre-compressed .br/.gz siblings with cache headers.
+
+    Content-hashed shards never change, so they are cached as immutable; the
+    manifest is revalidated on every use (ETag / Last-Modified).
+    """
+
+    encodings = (("br", ".br"), ("gzip", ".gz"))
+
+    async def get_response(self, path: str, scope):
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        accepted = {token.split(";")[0].strip().lower() for token in accept_encoding.split(",")}
+        response = None
+        for encoding, suffix in self.encodings:
+            if encoding not in accepted:
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except HTTPException:
+                continue
+            response.headers["content-encoding"] = encoding
+            if response.status_code != 304:
+                response.headers["content-type"] = "application/json"
+            break
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        response.headers["vary"] = "Accept-Encoding"
+        if os.path.basename(path) == BUNDLE_MANIFEST_NAME:
+            response.headers["cache-control"] = "no-cache"
+        else:
+            response.headers["cache-control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+def mount_bundle(app_instance: FastAPI):
+    bundle_dir = settings.bundle_dir
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    app_instance.mount(
+        settings.bundle_mount_path,
+        PrecompressedStaticFiles(directory=str(bundle_dir)),
+        name="bundle",
+    )
+    logger.info(f"✅ FAQ 번들 정적 파일 서빙: {bundle_dir} -> {settings.bundle_mount_path}")
+
+
 def mount_frontend(app_instance: FastAPI):
     frontend_dir = settings.frontend_dist
     if not frontend_dir.exists():
@@ -89,6 +234,7 @@ def mount_frontend(app_instance: FastAPI):
     logger.info(f"✅ Frontend 정적 파일 서빙: {frontend_dir} -> {mount_path}")
 
 
+mount_bundle(app)
 mount_frontend(app)
 
 
@@ -5,6 +5,8 @@ from .database import (
     FaqTag,
     FAQ,
     QuestionVariant,
+    UsageFlushBatch,
+    CatalogChange,
     AdminUser,
 )
 from .user import UserModel
@@ -15,6 +17,8 @@ __all__ = [
     "FaqTag",
     "FAQ",
     "QuestionVariant",
+    "UsageFlushBatch",
+    "CatalogChange",
     "AdminUser",
     "UserModel",
 ]
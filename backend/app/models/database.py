@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text, Boolean, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -13,18 +13,23 @@ class Tag(Base):
     """태그 모델 (선택적 분류)"""
     __tablename__ = "tags"
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(100), nullable=False, unique=True, comment="태그명 (예: #Ucloud, #Mail)")
     description = Column(Text, nullable=True, comment="태그 설명")
     color = Column(String(7), nullable=True, comment="UI 표시 색상 (#RRGGBB)")
     display_order = Column(Integer, default=0, nullable=False, comment="표시 순서")
-    is_active = Column(Boolean, default=True, nullable=False, index=True, comment="활성화 여부")
+    is_active = Column(Boolean, default=True, nullable=False, comment="활성화 여부")
+    faq_count = Column(Integer, server_default="0", nullable=False, comment="연결된 FAQ 갯수 (트리거 관리)")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, comment="생성일시")
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, comment="수정일시")
 
     # Relationships (다대다)
     faqs = relationship("FAQ", secondary="faq_tags", back_populates="tags")
 
+    __table_args__ = (
+        Index("ix_tags_display_order_name", "display_order", "name"),
+    )
+
     def __repr__(self):
         return f"<Tag(id={self.id}, name={self.name})>"
 
@@ -33,13 +38,14 @@ class FaqTag(Base):
     """FAQ-Tag 연결 테이블 (다대다 관계)"""
     __tablename__ = "faq_tags"
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    faq_id = Column(Integer, ForeignKey("faqs.id", ondelete="CASCADE"), nullable=False, index=True, comment="FAQ ID")
-    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), nullable=False, index=True, comment="태그 ID")
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    faq_id = Column(Integer, ForeignKey("faqs.id", ondelete="CASCADE"), nullable=False, comment="FAQ ID")
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), nullable=False, comment="태그 ID")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, comment="생성일시")
 
     __table_args__ = (
-        UniqueConstraint('faq_id', 'tag_id', name='uq_faq_tag'),
+        UniqueConstraint('faq_id', 'tag_id', name='uq_faq_tag'),  # faq_id 조회도 이 인덱스를 사용
+        Index("ix_faq_tags_tag_id_faq_id", "tag_id", "faq_id"),
     )
 
     def __repr__(self):
@@ -50,12 +56,17 @@ class FAQ(Base):
     """FAQ 모델"""
     __tablename__ = "faqs"
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    question = Column(String(500), nullable=False, index=True, comment="질문")
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    external_id = Column(String(64), nullable=True, comment="원본 시스템 의도ID")
+    content_hash = Column(String(64), nullable=True, comment="임포트 내용 해시 (관리자 수정 시 NULL)")
+    question = Column(String(500), nullable=False, comment="질문")
     answer = Column(Text, nullable=False, comment="답변 내용")
-    usage_frequency = Column(Integer, default=0, nullable=False, index=True, comment="사용 빈도")
-    question_count = Column(Integer, default=0, nullable=False, comment="질의문 갯수")
-    is_active = Column(Boolean, default=True, nullable=False, index=True, comment="활성화 여부")
+    answer_html = Column(Text, nullable=True, comment="답변 HTML (저장 시 렌더링, 정제됨)")
+    answer_text = Column(Text, nullable=True, comment="답변 평문 (검색/미리보기용)")
+    answer_render_version = Column(Integer, server_default="0", nullable=False, comment="답변 렌더러 버전 (재렌더링 대상 판별)")
+    usage_frequency = Column(Integer, default=0, nullable=False, comment="사용 빈도 (인덱스 없음: HOT 업데이트 유지)")
+    question_count = Column(Integer, server_default="0", nullable=False, comment="질의문 갯수 (트리거 관리)")
+    is_active = Column(Boolean, default=True, nullable=False, comment="활성화 여부")
     created_by = Column(String(50), nullable=True, comment="작성자")
     updated_by = Column(String(50), nullable=True, comment="수정자")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, comment="생성일시")
@@ -65,6 +76,18 @@ class FAQ(Base):
     tags = relationship("Tag", secondary="faq_tags", back_populates="faqs")
     question_variants = relationship("QuestionVariant", back_populates="faq", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        UniqueConstraint("external_id", name="uq_faqs_external_id"),
+        Index("ix_faqs_updated_at", text("updated_at DESC"), text("id DESC")),
+        Index(
+            "ix_faqs_active_updated_at", text("updated_at DESC"), text("id DESC"),
+            postgresql_where=text("is_active"), sqlite_where=text("is_active"),
+        ),
+        Index("ix_faqs_question_trgm", "question", postgresql_using="gin", postgresql_ops={"question": "gin_trgm_ops"}),
+        Index("ix_faqs_answer_trgm", "answer", postgresql_using="gin", postgresql_ops={"answer": "gin_trgm_ops"}),
+        {"postgresql_with": {"fillfactor": 90}},
+    )
+
     def __repr__(self):
         return f"<FAQ(id={self.id}, question={self.question[:30]}...)>"
 
@@ -73,24 +96,58 @@ class QuestionVariant(Base):
     """질문 변형 모델 (다양한 질문 표현)"""
     __tablename__ = "question_variants"
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    faq_id = Column(Integer, ForeignKey("faqs.id", ondelete="CASCADE"), nullable=False, index=True, comment="FAQ ID")
-    question_text = Column(String(500), nullable=False, index=True, comment="질문 텍스트")
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    faq_id = Column(Integer, ForeignKey("faqs.id", ondelete="CASCADE"), nullable=False, comment="FAQ ID")
+    question_text = Column(String(500), nullable=False, comment="질문 텍스트")
     is_representative = Column(Boolean, default=False, nullable=False, comment="대표 질의문 여부")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, comment="생성일시")
 
     # Relationships
     faq = relationship("FAQ", back_populates="question_variants")
 
+    __table_args__ = (
+        Index(
+            "ix_question_variants_faq_id_order_covering", "faq_id", text("is_representative DESC"), "created_at",
+            postgresql_include=["id", "question_text"],
+        ),
+    )
+
     def __repr__(self):
         return f"<QuestionVariant(id={self.id}, faq_id={self.faq_id}, text={self.question_text[:30]}...)>"
 
 
+class UsageFlushBatch(Base):
+    """사용 빈도 flush 배치 기록 (중복 반영 방지)"""
+    __tablename__ = "usage_flush_batches"
+
+    batch_key = Column(String(120), primary_key=True, comment="Redis 배치 키")
+    faq_count = Column(Integer, default=0, nullable=False, comment="반영된 FAQ 수")
+    hit_count = Column(Integer, default=0, nullable=False, comment="반영된 사용 횟수 합계")
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True, comment="반영일시")
+
+    def __repr__(self):
+        return f"<UsageFlushBatch(batch_key={self.batch_key}, hit_count={self.hit_count})>"
+
+
+class CatalogChange(Base):
+    """카탈로그 변경 로그 (증분 동기화용, append-only)"""
+    __tablename__ = "catalog_changes"
+
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True, comment="변경 순번 (커밋 순서)")
+    entity = Column(String(20), nullable=False, comment="대상 종류 (faq, tag)")
+    entity_id = Column(Integer, nullable=False, comment="대상 ID")
+    op = Column(String(10), nullable=False, comment="변경 종류 (upsert, delete)")
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True, comment="변경일시")
+
+    def __repr__(self):
+        return f"<CatalogChange(seq={self.seq}, {self.op} {self.entity}:{self.entity_id})>"
+
+
 class AdminUser(Base):
     """관리자 계정 모델"""
     __tablename__ = "admin_users"
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     username = Column(String(50), nullable=False, unique=True, index=True, comment="사용자명")
     email = Column(String(100), nullable=False, unique=True, comment="이메일")
     hashed_password = Column(String(255), nullable=False, comment="해시된 비밀번호")
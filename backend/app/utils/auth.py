@@ -6,6 +6,7 @@ from typing import Optional
 import asyncio
 
 from app.models.user import UserModel
+from app.core.metrics import record_redis_retry
 from app.core.redis import redis_connection_pool
 
 logger = logging.getLogger(__name__)
@@ -98,6 +99,7 @@ async def is_valid(auth_key: str) -> Optional[UserModel]:
 
                 # 마지막 시도가 아니면 재시도
                 if attempt < max_retries - 1:
+                    record_redis_retry("session_validate")
                     await asyncio.sleep(0.5 * (attempt + 1))  # 점진적 대기
                     continue
                 else:
@@ -0,0 +1,285 @@
+"""FAQ 답변 마크업 렌더러
+
+원본 시스템에서 가져온 답변(`faqs.answer`)은 Markdown 과 비슷한 자체 마크업입니다.
+`**굵게**`, `---` 구분선, `||||` 줄바꿈, `▶` 항목, `*`/`1.` 목록, `###` 제목,
+`[[텍스트]](URL)` 링크, `![](이미지)`, `|a|b|` 표, 일부 HTML(`<b>`, `<br>`, 색상 `<span>`/`<font>`).
+
+쓰기 시점(생성/수정/임포트)에 한 번 렌더링해 `answer_html`(정제된 HTML)과
+`answer_text`(검색/미리보기용 일반 텍스트)로 저장합니다.
+
+- 안전성: 입력 전체를 먼저 HTML 이스케이프한 뒤 허용한 구문만 태그로 바꿉니다.
+  원본의 HTML 은 허용 목록(굵게, 줄바꿈, 색상)만 다시 태그로 만들고 나머지는 글자로 남습니다.
+  링크/이미지 URL 은 http(s) 만 허용합니다.
+- 렌더러 출력이 바뀌면 `RENDER_VERSION` 을 올리고 `rerender_answers.py` 로 일괄 재렌더링합니다.
+"""
+import html
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+RENDER_VERSION = 1
+
+_SECTION_BREAK = "||||"
+_PLACEHOLDER = "\x00{}\x00"
+_PLACEHOLDER_RE = re.compile(r"\x00(\d+)\x00")
+
+_RULE_RE = re.compile(r"^\s*(?:-{3,}|_{3,}|\*{3,})\s*$")
+_HEADING_RE = re.compile(r"^\s*(#{1,6})\s+(.+?)\s*#*\s*$")
+_BULLET_ITEM_RE = re.compile(r"^(\s*)[*\-•]\s+(.*)$")
+_ORDERED_ITEM_RE = re.compile(r"^(\s*)(\d{1,3})[.)]\s+(.*)$")
+_TABLE_ROW_RE = re.compile(r"^\s*\|.*\|\s*$")
+_TABLE_DIVIDER_RE = re.compile(r"^\s*\|(?:\s*:?-{2,}:?\s*\|)+\s*$")
+_ARROW_RE = re.compile(r"^\s*(?:\*\*)?\s*▶")
+
+# 이스케이프된 텍스트에 적용하는 인라인 규칙
+_URL = r"https?://[^\s()<>\"']+"
+_IMAGE_RE = re.compile(r"!\[([^\]\n]*)\]\((" + _URL + r")\)")
+_DOUBLE_LINK_RE = re.compile(r"\[\[(.+?)\]\]\((" + _URL + r")\)")
+_LINK_RE = re.compile(r"\[([^\[\]\n]+)\]\((" + _URL + r")\)")
+_BARE_URL_RE = re.compile(r"(?<![\w/=])(" + _URL + r")")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_HTML_BOLD_RE = re.compile(r"&lt;b&gt;(.*?)&lt;/b&gt;", re.IGNORECASE)
+_HTML_BREAK_RE = re.compile(r"&lt;/?br\s*/?&gt;", re.IGNORECASE)
+_HTML_ANCHOR_RE = re.compile(
+    r"&lt;a\s+href\s*=\s*&quot;(https?://[^\s<>]+?)&quot;.*?&gt;(.*?)&lt;/a&gt;", re.IGNORECASE
+)
+_COLOR_OPEN_RE = re.compile(
+    r"&lt;(?:span\s+style\s*=\s*&quot;\s*color\s*:\s*([#\w]+)\s*;?\s*&quot;"
+    r"|fonti?\s+color\s*=\s*(?:&quot;|&#x27;)?([#\w]+)(?:&quot;|&#x27;)?"
+    r"|span)\s*&gt;",
+    re.IGNORECASE,
+)
+_COLOR_CLOSE_RE = re.compile(r"&lt;/(?:span|font)\s*&gt;", re.IGNORECASE)
+_COLOR_TAG_RE = re.compile(_COLOR_OPEN_RE.pattern + "|" + _COLOR_CLOSE_RE.pattern, re.IGNORECASE)
+_SAFE_COLOR_RE = re.compile(r"^(?:#[0-9a-fA-F]{3}|#[0-9a-fA-F]{6}|[a-zA-Z]{3,20})$")
+
+# 일반 텍스트 변환용 (원문에 적용)
+_RAW_TAG_RE = re.compile(r"</?(?:b|br|span|font|fon|a)\b[^>]*>", re.IGNORECASE)
+_RAW_IMAGE_RE = re.compile(r"!\[([^\]\n]*)\]\([^)\s]*\)")
+_RAW_DOUBLE_LINK_RE = re.compile(r"\[\[(.+?)\]\]\([^)\s]*\)")
+_RAW_LINK_RE = re.compile(r"\[([^\[\]\n]+)\]\([^)\s]*\)")
+
+
+class _Inline:
+    """인라인 렌더링: 만든 태그는 placeholder 로 보관해 다음 규칙이 건드리지 않게 합니다."""
+
+    def __init__(self):
+        self.fragments: List[str] = []
+
+    def keep(self, fragment: str) -> str:
+        self.fragments.append(fragment)
+        return _PLACEHOLDER.format(len(self.fragments) - 1)
+
+    def restore(self, text: str) -> str:
+        while _PLACEHOLDER_RE.search(text):
+            text = _PLACEHOLDER_RE.sub(lambda m: self.fragments[int(m.group(1))], text)
+        return text
+
+    def _link(self, label: str, url: str) -> str:
+        # 링크 텍스트까지 보관해 다른 규칙(자동 링크 등)이 링크 안에서 다시 적용되지 않게 합니다.
+        label = _BOLD_RE.sub(r"<strong>\1</strong>", label)
+        return self.keep(f'<a href="{url}" target="_blank" rel="noopener noreferrer">{label}</a>')
+
+    def _colors(self, text: str) -> str:
+        """색상 span/font 를 균형 잡힌 태그로 바꿉니다 (짝이 없는 닫는 태그는 버림)."""
+        depth = 0
+
+        def replace(match: re.Match) -> str:
+            nonlocal depth
+            if match.group(0).startswith("&lt;/"):
+                if depth == 0:
+                    return ""
+                depth -= 1
+                return self.keep("</span>")
+            depth += 1
+            color = match.group(1) or match.group(2)
+            if color and _SAFE_COLOR_RE.match(color):
+                return self.keep(f'<span style="color:{color}">')
+            return self.keep("<span>")
+
+        text = _COLOR_TAG_RE.sub(replace, text)
+        return text + self.keep("</span>" * depth) if depth else text
+
+    def render(self, escaped: str) -> str:
+        text = _IMAGE_RE.sub(lambda m: self.keep(f'<img src="{m.group(2)}" alt="{m.group(1)}" loading="lazy">'), escaped)
+        text = _HTML_ANCHOR_RE.sub(lambda m: self._link(m.group(2), m.group(1)), text)
+        text = _DOUBLE_LINK_RE.sub(lambda m: self._link(m.group(1), m.group(2)), text)
+        text = _LINK_RE.sub(lambda m: self._link(m.group(1), m.group(2)), text)
+        text = _BARE_URL_RE.sub(lambda m: self._link(m.group(1), m.group(1)), text)
+        text = _HTML_BREAK_RE.sub(lambda m: self.keep("<br>"), text)
+        text = _HTML_BOLD_RE.sub(lambda m: self.keep("<strong>") + m.group(1) + self.keep("</strong>"), text)
+        text = _BOLD_RE.sub(lambda m: self.keep("<strong>") + m.group(1) + self.keep("</strong>"), text)
+        text = self._colors(text)
+        return self.restore(text)
+
+
+def _inline(line: str) -> str:
+    return _Inline().render(html.escape(line.strip().replace("\x00", ""), quote=True))
+
+
+def _table(rows: List[str]) -> str:
+    cells = [[cell.strip() for cell in row.strip().strip("|").split("|")] for row in rows]
+    header, body = (cells[0], cells[1:]) if len(rows) > 1 and _TABLE_DIVIDER_RE.match(rows[1]) else (None, cells)
+    if header is not None:
+        body = body[1:]
+    parts = ["<table>"]
+    if header is not None:
+        parts.append("<thead><tr>" + "".join(f"<th>{_inline(c)}</th>" for c in header) + "</tr></thead>")
+    parts.append("<tbody>")
+    for row in body:
+        parts.append("<tr>" + "".join(f"<td>{_inline(c)}</td>" for c in row) + "</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+
+class _Blocks:
+    """블록 단위 렌더링 (문단, 목록, 표, 제목, 구분선)"""
+
+    def __init__(self):
+        self.out: List[str] = []
+        self.paragraph: List[str] = []
+        self.lists: List[Tuple[str, int]] = []  # (ul|ol, indent) 스택
+        self.table: List[str] = []
+
+    def flush_paragraph(self) -> None:
+        if self.paragraph:
+            self.out.append("<p>" + "<br>".join(self.paragraph) + "</p>")
+            self.paragraph = []
+
+    def close_lists(self, indent: int = -1) -> None:
+        while self.lists and self.lists[-1][1] > indent:
+            tag, _ = self.lists.pop()
+            self.out.append(f"</li></{tag}>")
+
+    def flush_table(self) -> None:
+        if self.table:
+            self.out.append(_table(self.table))
+            self.table = []
+
+    def flush(self) -> None:
+        self.flush_paragraph()
+        self.close_lists()
+        self.flush_table()
+
+    def list_item(self, tag: str, indent: int, content: str) -> None:
+        self.flush_paragraph()
+        self.flush_table()
+        self.close_lists(indent)
+        if self.lists and self.lists[-1][1] == indent and self.lists[-1][0] == tag:
+            self.out.append("</li><li>")
+        elif self.lists and self.lists[-1][1] == indent:
+            # 같은 깊이에서 목록 종류가 바뀜
+            self.close_lists(indent - 1)
+            self.lists.append((tag, indent))
+            self.out.append(f"<{tag}><li>")
+        else:
+            self.lists.append((tag, indent))
+            self.out.append(f"<{tag}><li>")
+        self.out.append(_inline(content))
+
+    def line(self, raw: str) -> None:
+        stripped = raw.strip()
+        if not stripped:
+            self.flush()
+            return
+        if stripped == _SECTION_BREAK:
+            self.flush()
+            self.out.append("<br>")
+            return
+        if _TABLE_ROW_RE.match(raw):
+            self.flush_paragraph()
+            self.close_lists()
+            self.table.append(raw)
+            return
+        self.flush_table()
+        if _RULE_RE.match(raw):
+            self.flush()
+            self.out.append("<hr>")
+            return
+        heading = _HEADING_RE.match(raw)
+        if heading:
+            self.flush()
+            level = len(heading.group(1))
+            self.out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+            return
+        bullet = _BULLET_ITEM_RE.match(raw)
+        if bullet:
+            self.list_item("ul", len(bullet.group(1).expandtabs(4)), bullet.group(2))
+            return
+        ordered = _ORDERED_ITEM_RE.match(raw)
+        if ordered:
+            # 번호는 원문 그대로 유지 (목록 중간에서 시작하는 번호가 많음)
+            self.list_item("ol", len(ordered.group(1).expandtabs(4)), f"{ordered.group(2)}. {ordered.group(3)}")
+            return
+        if _ARROW_RE.match(raw):
+            self.flush()
+            self.out.append(f'<p class="bullet">{_inline(stripped)}</p>')
+            return
+        if self.lists and raw[:1].isspace():
+            # 들여쓴 줄은 바로 위 목록 항목의 연속
+            self.out.append("<br>" + _inline(stripped))
+            return
+        self.close_lists()
+        self.paragraph.append(_inline(stripped))
+
+
+def _split_sections(text: str) -> List[str]:
+    """`||||` 를 독립된 줄로 분리합니다 (문장 중간에 쓰인 경우 포함)."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = re.sub(r"[ \t]*\|\|\|\|[ \t]*", "\n" + _SECTION_BREAK + "\n", text)
+    return text.split("\n")
+
+
+def render_answer_html(answer: Optional[str]) -> str:
+    """답변 마크업을 정제된 HTML 로 렌더링합니다."""
+    if not answer:
+        return ""
+    blocks = _Blocks()
+    for raw in _split_sections(answer):
+        blocks.line(raw)
+    blocks.flush()
+    html_out = "".join(blocks.out)
+    # 앞뒤의 섹션 줄바꿈은 의미가 없으므로 제거
+    while html_out.startswith("<br>"):
+        html_out = html_out[4:]
+    while html_out.endswith("<br>"):
+        html_out = html_out[:-4]
+    return html_out
+
+
+def render_answer_text(answer: Optional[str]) -> str:
+    """답변 마크업을 검색/미리보기용 일반 텍스트로 변환합니다."""
+    if not answer:
+        return ""
+    lines = []
+    for raw in _split_sections(answer.replace("\x00", "")):
+        stripped = raw.strip()
+        if stripped == _SECTION_BREAK or _RULE_RE.match(raw) or _TABLE_DIVIDER_RE.match(raw):
+            lines.append("")
+            continue
+        line = _RAW_TAG_RE.sub("", stripped)
+        line = _RAW_IMAGE_RE.sub(r"\1", line)
+        line = _RAW_DOUBLE_LINK_RE.sub(r"\1", line)
+        line = _RAW_LINK_RE.sub(r"\1", line)
+        line = line.replace("**", "")
+        heading = _HEADING_RE.match(line)
+        if heading:
+            line = heading.group(2)
+        bullet = _BULLET_ITEM_RE.match(line)
+        if bullet:
+            line = "- " + bullet.group(2)
+        if _TABLE_ROW_RE.match(line):
+            line = " | ".join(cell.strip() for cell in line.strip().strip("|").split("|"))
+        lines.append(html.unescape(line).strip())
+    text = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def render_answer(answer: Optional[str]) -> Tuple[str, str]:
+    """(answer_html, answer_text)"""
+    return render_answer_html(answer), render_answer_text(answer)
+
+
+def rendered_answer_fields(answer: Optional[str]) -> Dict[str, Any]:
+    """FAQ 컬럼에 그대로 넣을 렌더링 결과 (answer_html, answer_text, answer_render_version)"""
+    answer_html, answer_text = render_answer(answer)
+    return {"answer_html": answer_html, "answer_text": answer_text, "answer_render_version": RENDER_VERSION}
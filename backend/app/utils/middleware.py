@@ -1,7 +1,7 @@
 """세션 관리 미들웨어"""
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 import logging
 import os
 from datetime import datetime
@@ -14,7 +14,7 @@ from app.utils.auth import is_valid
 logger = logging.getLogger(__name__)
 
 
-class SessionMiddleware(BaseHTTPMiddleware):
+class SessionMiddleware:
     """
     세션 관리 미들웨어
 
@@ -26,10 +26,13 @@ class SessionMiddleware(BaseHTTPMiddleware):
     - 브라우저에서 쿠키 설정 불필요
     - Postman, curl 등에서 별도 인증 헤더 불필요
     - 자동으로 'LOCAL_DEV' 사용자로 동작
+
+    순수 ASGI 미들웨어로 구현되어 있어 응답 본문을 감싸거나 버퍼링하지 않습니다.
+    (SSE 같은 스트리밍 응답이 그대로 전달됨)
     """
 
-    def __init__(self, app, excluded_paths: list = None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, excluded_paths: list = None, excluded_prefixes: list = None):
+        self.app = app
         # 세션 체크를 제외할 경로들
         self.excluded_paths = excluded_paths or [
             "/",
@@ -43,40 +46,42 @@ class SessionMiddleware(BaseHTTPMiddleware):
             "/redoc",
             "/openapi.json",
             "/favicon.ico",
-            "/static"
+            "/static",
+            "/metrics",
         ]
+        # 세션 체크를 제외할 경로 prefix (정적 파일)
+        self.excluded_prefixes = tuple(excluded_prefixes or ["/static/", "/assets/"])
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """미들웨어 메인 로직"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
 
         # 제외 경로 체크
         if request.url.path in self.excluded_paths:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # 정적 파일 경로 체크
-        if request.url.path.startswith("/static/") or request.url.path.startswith("/assets/"):
-            return await call_next(request)
+        if request.url.path.startswith(self.excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
 
         # FAQ 관련 GET 요청은 세션 체크 제외 (읽기 전용)
         if request.method == "GET" and request.url.path.startswith("/api/faq"):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         try:
             # 세션 검증 및 사용자 정보 추출
             user_info = await self._validate_session(request)
 
-            # request state에 사용자 정보 저장
-            request.state.user_info = user_info
-            request.state.session_validated = True
-
-            # 다음 미들웨어/핸들러 호출
-            response = await call_next(request)
-
-            return response
-
         except HTTPException as e:
             # 인증 실패 시 JSON 응답 반환
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=e.status_code,
                 content={
                     "success": False,
@@ -85,9 +90,11 @@ class SessionMiddleware(BaseHTTPMiddleware):
                     "path": request.url.path
                 }
             )
+            await response(scope, receive, send)
+            return
         except Exception as e:
             logger.error(f"세션 미들웨어 오류: {e}")
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=500,
                 content={
                     "success": False,
@@ -96,6 +103,15 @@ class SessionMiddleware(BaseHTTPMiddleware):
                     "path": request.url.path
                 }
             )
+            await response(scope, receive, send)
+            return
+
+        # request state에 사용자 정보 저장 (scope["state"] 에 저장되어 핸들러의 Request 와 공유됨)
+        request.state.user_info = user_info
+        request.state.session_validated = True
+
+        # 다음 미들웨어/핸들러 호출
+        await self.app(scope, receive, send)
 
     async def _validate_session(self, request: Request) -> UserModel:
         """세션 검증 로직 - 세션 재갱신 처리 포함"""
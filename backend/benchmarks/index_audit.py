@@ -0,0 +1,288 @@
+"""Benchmark the baseline index set against the audited one (migration 180f67f6ffb4).
+
+For each index set the catalog tables are recreated in a scratch schema and
+filled with the same deterministic synthetic data. The script then measures:
+
+- total index size,
+- WAL bytes and time for write workloads shaped like the app's writes
+  (usage flush, FAQ edit, variant insert, tag reassignment),
+- EXPLAIN (ANALYZE, BUFFERS) execution time and buffers for every query
+  shape issued by app/api/routes.py.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmarks/index_audit.py --faqs 1000000 --output index_audit.json
+
+The target database needs the pg_trgm extension (created by the migration).
+The scratch schema is dropped at the end.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+
+SCHEMA = "bench_index_audit"
+
+TABLES_DDL = [
+    """CREATE TABLE tags (
+        id serial PRIMARY KEY, name varchar(100) NOT NULL UNIQUE, description text, color varchar(7),
+        display_order integer NOT NULL, is_active boolean NOT NULL, faq_count integer NOT NULL DEFAULT 0,
+        created_at timestamp NOT NULL, updated_at timestamp NOT NULL)""",
+    """CREATE TABLE faqs (
+        id serial PRIMARY KEY, question varchar(500) NOT NULL, answer text NOT NULL,
+        usage_frequency integer NOT NULL, question_count integer NOT NULL DEFAULT 0, is_active boolean NOT NULL,
+        created_by varchar(50), updated_by varchar(50), created_at timestamp NOT NULL, updated_at timestamp NOT NULL)""",
+    """CREATE TABLE faq_tags (
+        id serial PRIMARY KEY, faq_id integer NOT NULL REFERENCES faqs(id) ON DELETE CASCADE,
+        tag_id integer NOT NULL REFERENCES tags(id) ON DELETE CASCADE, created_at timestamp NOT NULL,
+        CONSTRAINT uq_faq_tag UNIQUE (faq_id, tag_id))""",
+    """CREATE TABLE question_variants (
+        id serial PRIMARY KEY, faq_id integer NOT NULL REFERENCES faqs(id) ON DELETE CASCADE,
+        question_text varchar(500) NOT NULL, is_representative boolean NOT NULL, created_at timestamp NOT NULL)""",
+]
+
+INDEX_SETS: Dict[str, Dict[str, Any]] = {
+    # As created by 66c2c105139c
+    "baseline": {
+        "fillfactor": 100,
+        "indexes": [
+            "CREATE INDEX ix_faqs_id ON faqs (id)",
+            "CREATE INDEX ix_faqs_question ON faqs (question)",
+            "CREATE INDEX ix_faqs_is_active ON faqs (is_active)",
+            "CREATE INDEX ix_faqs_usage_frequency ON faqs (usage_frequency)",
+            "CREATE INDEX ix_tags_id ON tags (id)",
+            "CREATE INDEX ix_tags_is_active ON tags (is_active)",
+            "CREATE INDEX ix_faq_tags_id ON faq_tags (id)",
+            "CREATE INDEX ix_faq_tags_faq_id ON faq_tags (faq_id)",
+            "CREATE INDEX ix_faq_tags_tag_id ON faq_tags (tag_id)",
+            "CREATE INDEX ix_question_variants_id ON question_variants (id)",
+            "CREATE INDEX ix_question_variants_faq_id ON question_variants (faq_id)",
+            "CREATE INDEX ix_question_variants_question_text ON question_variants (question_text)",
+        ],
+    },
+    # As left by 180f67f6ffb4 and 9e1f4b7c2a65 (partial / covering variants)
+    "audited": {
+        "fillfactor": 90,
+        "indexes": [
+            "CREATE INDEX ix_faqs_updated_at ON faqs (updated_at DESC, id DESC)",
+            "CREATE INDEX ix_faqs_active_updated_at ON faqs (updated_at DESC, id DESC) WHERE is_active",
+            "CREATE INDEX ix_faqs_question_trgm ON faqs USING gin (question gin_trgm_ops)",
+            "CREATE INDEX ix_faqs_answer_trgm ON faqs USING gin (answer gin_trgm_ops)",
+            "CREATE INDEX ix_faq_tags_tag_id_faq_id ON faq_tags (tag_id, faq_id)",
+            "CREATE INDEX ix_question_variants_faq_id_order_covering ON question_variants "
+            "(faq_id, is_representative DESC, created_at) INCLUDE (id, question_text)",
+            "CREATE INDEX ix_tags_display_order_name ON tags (display_order, name)",
+        ],
+    },
+}
+
+FAQ_COLUMNS = "faqs.id, faqs.question, faqs.usage_frequency, faqs.question_count, faqs.is_active, faqs.created_at, faqs.updated_at"
+
+# Query shapes issued by app/api/routes.py (list_faqs, selectinload, list_variants, list_tags)
+READ_QUERIES = {
+    "list_faqs_page1": f"SELECT {FAQ_COLUMNS} FROM faqs ORDER BY faqs.updated_at DESC, faqs.id DESC LIMIT 20 OFFSET 0",
+    "list_faqs_active_page100": (
+        f"SELECT {FAQ_COLUMNS} FROM faqs WHERE faqs.is_active = true "
+        "ORDER BY faqs.updated_at DESC, faqs.id DESC LIMIT 20 OFFSET 1980"
+    ),
+    "list_faqs_active_count": "SELECT count(faqs.id) FROM faqs WHERE faqs.is_active = true",
+    "list_faqs_inactive_page100": (
+        f"SELECT {FAQ_COLUMNS} FROM faqs WHERE faqs.is_active = false "
+        "ORDER BY faqs.updated_at DESC, faqs.id DESC LIMIT 20 OFFSET 1980"
+    ),
+    "list_faqs_inactive_count": "SELECT count(faqs.id) FROM faqs WHERE faqs.is_active = false",
+    "list_faqs_search": (
+        f"SELECT {FAQ_COLUMNS} FROM faqs WHERE faqs.question ILIKE :pattern OR faqs.answer ILIKE :pattern "
+        "ORDER BY faqs.updated_at DESC, faqs.id DESC LIMIT 20"
+    ),
+    "list_faqs_search_count": "SELECT count(faqs.id) FROM faqs WHERE faqs.question ILIKE :pattern OR faqs.answer ILIKE :pattern",
+    "list_faqs_tag_filter": (
+        f"SELECT {FAQ_COLUMNS} FROM faqs JOIN faq_tags ON faqs.id = faq_tags.faq_id "
+        "WHERE faq_tags.tag_id IN (3, 7) ORDER BY faqs.updated_at DESC, faqs.id DESC LIMIT 20"
+    ),
+    "list_faqs_tag_count": (
+        "SELECT count(faqs.id) FROM faqs JOIN faq_tags ON faqs.id = faq_tags.faq_id WHERE faq_tags.tag_id IN (3, 7)"
+    ),
+    "selectin_tags": (
+        "SELECT faq_tags.faq_id, tags.* FROM tags JOIN faq_tags ON tags.id = faq_tags.tag_id "
+        "WHERE faq_tags.faq_id IN (SELECT generate_series(500000, 500019))"
+    ),
+    "selectin_variants": "SELECT * FROM question_variants WHERE faq_id IN (SELECT generate_series(500000, 500019))",
+    "list_variants": (
+        "SELECT * FROM question_variants WHERE faq_id = 424242 "
+        "ORDER BY is_representative DESC, created_at"
+    ),
+    "list_tags": "SELECT * FROM tags ORDER BY display_order, name",
+    "trending_faqs": (
+        f"SELECT {FAQ_COLUMNS} FROM faqs "
+        "WHERE faqs.id IN (17, 4242, 99999, 250000, 500000, 500001, 612345, 777777, 888888, 999999) "
+        "AND faqs.is_active = true"
+    ),
+}
+
+# Write shapes: usage flusher, update_faq, create_variant, update_faq tag reassignment
+WRITE_WORKLOADS = {
+    "usage_flush_10k": (
+        "UPDATE faqs AS f SET usage_frequency = f.usage_frequency + v.delta "
+        "FROM (SELECT (random() * (:faqs - 1))::int + 1 AS id, 1 AS delta FROM generate_series(1, 10000) GROUP BY 1) AS v "
+        "WHERE f.id = v.id"
+    ),
+    "faq_edit_2k": (
+        "UPDATE faqs SET answer = answer || ' ', updated_at = now(), updated_by = 'bench' "
+        "WHERE id IN (SELECT (random() * (:faqs - 1))::int + 1 FROM generate_series(1, 2000))"
+    ),
+    "variant_insert_10k": (
+        "INSERT INTO question_variants (faq_id, question_text, is_representative, created_at) "
+        "SELECT (random() * (:faqs - 1))::int + 1, '추가 질의문 ' || md5(g::text), false, now() "
+        "FROM generate_series(1, 10000) g"
+    ),
+    "tag_reassign_5k": (
+        "UPDATE faq_tags SET tag_id = (tag_id % 200) + 1 "
+        "WHERE faq_id IN (SELECT (random() * (:faqs - 1))::int + 1 FROM generate_series(1, 5000))"
+    ),
+}
+
+
+def sync_dsn() -> str:
+    """Convert the app's asyncpg DSN to a psycopg2 one."""
+    return settings.postgres_dsn.replace("postgresql+asyncpg://", "postgresql+psycopg2://", 1)
+
+
+def populate(conn, faqs: int, variants_per_faq: int) -> None:
+    """Create and fill the scratch tables deterministically."""
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+    for ddl in TABLES_DDL:
+        conn.execute(text(ddl))
+
+    conn.execute(text("SELECT setseed(0.42)"))
+    conn.execute(text(
+        "INSERT INTO tags (name, display_order, is_active, created_at, updated_at) "
+        "SELECT 'tag_' || g, g, true, now(), now() FROM generate_series(1, 200) g"
+    ))
+    conn.execute(text(
+        "INSERT INTO faqs (question, answer, usage_frequency, is_active, created_by, created_at, updated_at) "
+        "SELECT 'FAQ 질문 ' || md5(g::text), "
+        "       '**안내** ' || repeat(md5((g * 7)::text) || ' ', 12), "
+        "       (random() * 5000)::int, random() < 0.9, 'bench', "
+        "       now() - (random() * interval '1000 days'), now() - (random() * interval '1000 days') "
+        "FROM generate_series(1, :faqs) g"
+    ), {"faqs": faqs})
+    conn.execute(text(
+        "INSERT INTO faq_tags (faq_id, tag_id, created_at) "
+        "SELECT g, (g % 200) + 1, now() FROM generate_series(1, :faqs) g"
+    ), {"faqs": faqs})
+    conn.execute(text(
+        "INSERT INTO question_variants (faq_id, question_text, is_representative, created_at) "
+        "SELECT f, '질의문 ' || md5((f * 31 + v)::text), v = 1, now() - (v * interval '1 day') "
+        "FROM generate_series(1, :faqs) f, generate_series(1, :variants) v"
+    ), {"faqs": faqs, "variants": variants_per_faq})
+
+
+def apply_index_set(conn, index_set: Dict[str, Any]) -> float:
+    """Create the index set and return the build time in seconds."""
+    conn.execute(text(f"ALTER TABLE faqs SET (fillfactor = {index_set['fillfactor']})"))
+    conn.execute(text("VACUUM FULL faqs"))
+    started = time.perf_counter()
+    for ddl in index_set["indexes"]:
+        conn.execute(text(ddl))
+    elapsed = time.perf_counter() - started
+    conn.execute(text("VACUUM ANALYZE"))
+    return elapsed
+
+
+def index_size_bytes(conn) -> int:
+    """Total size of all indexes in the scratch schema (primary keys included)."""
+    return int(conn.execute(text(
+        "SELECT COALESCE(sum(pg_relation_size(c.oid)), 0) FROM pg_class c "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace WHERE n.nspname = :schema AND c.relkind = 'i'"
+    ), {"schema": SCHEMA}).scalar())
+
+
+def run_writes(conn, faqs: int) -> Dict[str, Dict[str, float]]:
+    """Run each write workload in its own transaction, measuring WAL volume and time."""
+    results = {}
+    for name, sql in WRITE_WORKLOADS.items():
+        conn.execute(text("SELECT setseed(0.7)"))
+        start_lsn = conn.execute(text("SELECT pg_current_wal_insert_lsn()")).scalar()
+        started = time.perf_counter()
+        conn.execute(text(sql), {"faqs": faqs})
+        elapsed = time.perf_counter() - started
+        wal_bytes = conn.execute(
+            text("SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), :lsn)"), {"lsn": start_lsn}
+        ).scalar()
+        results[name] = {"seconds": round(elapsed, 4), "wal_bytes": int(wal_bytes)}
+    return results
+
+
+def run_reads(conn, pattern: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """EXPLAIN ANALYZE every read shape and keep the median execution time."""
+    results = {}
+    for name, sql in READ_QUERIES.items():
+        timings: List[float] = []
+        buffers = 0
+        for _ in range(repeat):
+            plan = conn.execute(
+                text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), {"pattern": pattern}
+            ).scalar()[0]
+            timings.append(plan["Execution Time"])
+            top = plan["Plan"]
+            buffers = top.get("Shared Hit Blocks", 0) + top.get("Shared Read Blocks", 0)
+        results[name] = {"median_ms": round(statistics.median(timings), 3), "buffers": buffers}
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--faqs", type=int, default=1_000_000, help="number of FAQ rows")
+    parser.add_argument("--variants-per-faq", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5, help="EXPLAIN ANALYZE runs per query")
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    engine = create_engine(sync_dsn(), isolation_level="AUTOCOMMIT")
+    report: Dict[str, Any] = {"faqs": args.faqs, "variants_per_faq": args.variants_per_faq, "sets": {}}
+
+    try:
+        with engine.connect() as conn:
+            for set_name, index_set in INDEX_SETS.items():
+                print(f"▶ {set_name}: populating {args.faqs:,} FAQs...", file=sys.stderr)
+                populate(conn, args.faqs, args.variants_per_faq)
+                build_seconds = apply_index_set(conn, index_set)
+                # A search term that hits ~1 in 4096 rows
+                pattern = "%" + conn.execute(text("SELECT substr(md5('7'), 1, 3)")).scalar() + "%"
+                report["sets"][set_name] = {
+                    "index_build_seconds": round(build_seconds, 2),
+                    "index_bytes": index_size_bytes(conn),
+                    "reads": run_reads(conn, pattern, args.repeat),
+                    "writes": run_writes(conn, args.faqs),
+                }
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    finally:
+        engine.dispose()
+
+    baseline, audited = report["sets"]["baseline"], report["sets"]["audited"]
+    print(f"\n{'metric':<32}{'baseline':>14}{'audited':>14}{'ratio':>8}")
+    print(f"{'index bytes':<32}{baseline['index_bytes']:>14,}{audited['index_bytes']:>14,}"
+          f"{audited['index_bytes'] / max(baseline['index_bytes'], 1):>8.2f}")
+    for name in WRITE_WORKLOADS:
+        before, after = baseline["writes"][name]["wal_bytes"], audited["writes"][name]["wal_bytes"]
+        print(f"{'WAL ' + name:<32}{before:>14,}{after:>14,}{after / max(before, 1):>8.2f}")
+    for name in READ_QUERIES:
+        before, after = baseline["reads"][name]["median_ms"], audited["reads"][name]["median_ms"]
+        print(f"{'ms ' + name:<32}{before:>14.3f}{after:>14.3f}{after / max(before, 0.001):>8.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Benchmark JSON encoding of FAQ responses: response-model path vs. precompiled serializers.
+
+Builds transient ORM rows (no database needed) shaped like the catalog and
+times, per page of FAQs:
+
+- ``before``: what the endpoints did through ``response_model=`` - validate
+  every row into the schema (``from_attributes``), then serialize the
+  validated models to JSON with Pydantic. ``list_faqs`` additionally ran
+  ``FaqListResponse.model_validate`` on each item before that.
+- ``after``: ``app/api/serializers.py`` - read the schema fields off each row
+  into a dict and encode the page with orjson.
+
+Both outputs are decoded and compared, so the benchmark also checks that the
+fast path produces the same JSON.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmarks/json_encode.py --page-size 100 --repeat 200 --output json_encode.json
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from pydantic import TypeAdapter
+
+from app.api.schemas import FaqDetailResponse, FaqListResponse, PaginatedResponse
+from app.api.serializers import dumps, serialize_all, serialize_faq_detail, serialize_faq_list_item
+from app.models.database import FAQ, QuestionVariant, Tag
+from app.utils.markup import render_answer
+
+WORDS = ["메일", "용량", "초과", "비밀번호", "변경", "U-Cloud", "접속", "오류", "결재", "문서", "보안", "설정", "안내", "확인"]
+
+
+def make_rows(count: int, seed: int) -> List[FAQ]:
+    """Transient FAQ rows with tags and question variants loaded."""
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1, 9, 0, 0)
+    tags = [
+        Tag(id=i, name=f"#Tag{i}", description=None, color="#336699", display_order=i, is_active=True,
+            faq_count=rng.randint(1, 500), created_at=now, updated_at=now)
+        for i in range(1, 21)
+    ]
+    rows = []
+    for faq_id in range(1, count + 1):
+        sentence = lambda n: " ".join(rng.choice(WORDS) for _ in range(n))  # noqa: E731
+        answer = "\n".join(
+            [f"**{sentence(3)}**", "---"] + [f"* {sentence(rng.randint(4, 12))}" for _ in range(rng.randint(3, 10))]
+        )
+        answer_html, answer_text = render_answer(answer)
+        updated_at = now + timedelta(seconds=rng.randint(0, 10 ** 7), microseconds=rng.randint(0, 999999))
+        faq = FAQ(
+            id=faq_id, external_id=str(faq_id), question=f"{sentence(5)}?", answer=answer,
+            answer_html=answer_html, answer_text=answer_text, usage_frequency=rng.randint(0, 10000),
+            question_count=0, is_active=True, created_by="10001", updated_by="10002",
+            created_at=now, updated_at=updated_at,
+        )
+        faq.tags = rng.sample(tags, rng.randint(0, 3))
+        faq.question_variants = [
+            QuestionVariant(id=faq_id * 100 + i, faq_id=faq_id, question_text=f"{sentence(4)}?",
+                            is_representative=i == 0, created_at=now)
+            for i in range(rng.randint(1, 8))
+        ]
+        faq.question_count = len(faq.question_variants)
+        rows.append(faq)
+    return rows
+
+
+def time_per_call(func: Callable[[], bytes], repeat: int) -> Dict[str, float]:
+    """Milliseconds per call (median and p95 over ``repeat`` calls)."""
+    func()  # warm up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {"median_ms": round(statistics.median(samples), 3), "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FAQ JSON encoding per page")
+    parser.add_argument("--page-size", type=int, default=100, help="FAQs per page (default: 100)")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed encodes per case (default: 200)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    rows = make_rows(args.page_size, args.seed)
+    page_adapter = TypeAdapter(PaginatedResponse)
+    detail_adapter = TypeAdapter(List[FaqDetailResponse])
+    page_meta = {"total": 10 * args.page_size, "page": 1, "page_size": args.page_size, "total_pages": 10}
+
+    def list_before() -> bytes:
+        payload = {"items": [FaqListResponse.model_validate(row) for row in rows], **page_meta}
+        return page_adapter.dump_json(page_adapter.validate_python(payload, from_attributes=True))
+
+    def list_after() -> bytes:
+        return dumps({"items": serialize_all(serialize_faq_list_item, rows), **page_meta})
+
+    def detail_before() -> bytes:
+        return detail_adapter.dump_json(detail_adapter.validate_python(rows, from_attributes=True))
+
+    def detail_after() -> bytes:
+        return dumps(serialize_all(serialize_faq_detail, rows))
+
+    cases: Dict[str, Any] = {}
+    for name, before, after in (("list_page", list_before, list_after), ("detail_rows", detail_before, detail_after)):
+        if json.loads(before()) != json.loads(after()):
+            raise SystemExit(f"{name}: fast path output differs from the response-model output")
+        cases[name] = {
+            "bytes": len(after()),
+            "before": time_per_call(before, args.repeat),
+            "after": time_per_call(after, args.repeat),
+        }
+        cases[name]["speedup"] = round(cases[name]["before"]["median_ms"] / cases[name]["after"]["median_ms"], 2)
+
+    results = {"page_size": args.page_size, "repeat": args.repeat, "cases": cases}
+    for name, case in cases.items():
+        print(
+            f"{name:12s} {case['bytes']:>8d} B  before {case['before']['median_ms']:8.3f} ms  "
+            f"after {case['after']['median_ms']:8.3f} ms  x{case['speedup']}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+"""Replay a realistic request mix against a running server and report per-endpoint percentiles.
+
+A fixed number of closed-loop workers (``--concurrency``) pick scenarios by
+weight from a seeded RNG, so the same seed, mix and target replay the same
+sequence of requests. Scenarios:
+
+- ``bundle_manifest`` / ``bundle_shard``: anonymous reads of the public FAQ
+  bundle (no cookie, pre-compressed static files).
+- ``faq_list``, ``faq_list_tag``, ``faq_detail``, ``faq_trending``,
+  ``tag_list``: session-authenticated catalog reads.
+- ``faq_search``: ``/faqs?search=`` with terms drawn from the question
+  variants in ``docs/docs.csv`` (a whole variant or one of its words).
+- ``faq_hit``: usage tracking writes.
+- ``faq_edit``: admin edits - ``PUT /faqs/{id}`` with the FAQ's current
+  question, so the catalog content is unchanged but the full write path runs
+  (updated_at, change log, bundle rebuild). Disable with ``--read-only``.
+
+Authenticated scenarios send an ``AX`` cookie. Unless ``--no-sessions`` is
+given, ``--sessions`` SSO sessions (``AX:{cookie}`` keys, same JSON fields
+the SSO writes) are seeded into the Redis configured in ``.env`` before the
+run and deleted afterwards; the target server must use the same Redis.
+
+The report has throughput, error counts and p50/p95/p99 per scenario.
+``--baseline`` compares against a stored report and exits with status 1 when
+a scenario's p95/p99 grew, or its throughput or the total throughput dropped,
+by more than ``--tolerance``; ``--save-baseline`` writes the run as the new
+baseline.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmarks/loadtest.py --base-url http://localhost:8000 \\
+        --concurrency 32 --requests 20000 --output loadtest.json --baseline benchmarks/loadtest_baseline.json
+"""
+import argparse
+import asyncio
+import csv
+import json
+import random
+import secrets
+import statistics
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+
+COL_QUESTIONS = 10  # 질의문 (comma-separated), see app/importer/csv_source.py
+
+DEFAULT_MIX = {
+    "bundle_manifest": 5,
+    "bundle_shard": 10,
+    "faq_list": 15,
+    "faq_list_tag": 10,
+    "faq_search": 25,
+    "faq_detail": 20,
+    "faq_trending": 5,
+    "tag_list": 5,
+    "faq_hit": 4,
+    "faq_edit": 1,
+}
+WRITE_SCENARIOS = {"faq_hit", "faq_edit"}
+ANONYMOUS_SCENARIOS = {"bundle_manifest", "bundle_shard"}
+
+MIN_COMPARE_REQUESTS = 100  # percentiles of rarer scenarios are too noisy to compare
+
+SESSION_TTL = 60 * 60  # seeded sessions expire on their own if cleanup is skipped
+SESSION_KEY_PREFIX = "AX:"
+
+
+# ==================== Inputs ====================
+
+def load_search_terms(csv_path: Path, limit: int, rng: random.Random) -> List[str]:
+    """Search terms from the question variants of the intent export."""
+    variants: List[str] = []
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            if len(row) > COL_QUESTIONS:
+                variants.extend(part.strip() for part in row[COL_QUESTIONS].split(",") if part.strip())
+    if not variants:
+        raise SystemExit(f"No question variants found in {csv_path}")
+
+    terms = []
+    for variant in rng.sample(variants, min(limit, len(variants))):
+        words = [word for word in variant.split() if len(word) > 1]
+        terms.append(rng.choice(words) if words and rng.random() < 0.5 else variant)
+    return terms
+
+
+def seed_sessions(count: int) -> List[str]:
+    """Create SSO sessions in Redis and return their AX cookie values."""
+    from app.core.redis import redis_connection_pool
+
+    if settings.local_backend:
+        # The in-process Redis of a LOCAL_BACKEND server is not shared with this process
+        raise SystemExit("LOCAL_BACKEND servers keep sessions in-process; use --no-sessions")
+    client = redis_connection_pool.get_connection()
+    if client is None:
+        raise SystemExit("Redis is not reachable; use --no-sessions against a local (APP_ENV=local) server")
+    cookies = []
+    for index in range(count):
+        cookie = f"loadtest-{secrets.token_hex(16)}"
+        user = {
+            "id": f"lt{index:05d}",
+            "email": f"loadtest{index:05d}@example.com",
+            "dept": "LOADTEST",
+            "corp": "LT00",
+        }
+        client.set(SESSION_KEY_PREFIX + cookie, json.dumps(user), ex=SESSION_TTL)
+        cookies.append(cookie)
+    return cookies
+
+
+def delete_sessions(cookies: List[str]) -> None:
+    from app.core.redis import redis_connection_pool
+
+    client = redis_connection_pool.get_connection()
+    if client is not None:
+        for cookie in cookies:
+            client.delete(SESSION_KEY_PREFIX + cookie)
+
+
+@dataclass
+class Catalog:
+    """Ids the scenarios pick from, read from the target before the run."""
+    faqs: List[Tuple[int, str]] = field(default_factory=list)  # (id, question)
+    tag_ids: List[int] = field(default_factory=list)
+    shards: List[str] = field(default_factory=list)
+
+
+async def discover_catalog(client: httpx.AsyncClient, cookies: List[str], pages: int) -> Catalog:
+    catalog = Catalog()
+    headers = {"cookie": f"AX={cookies[0]}"} if cookies else None
+    for page in range(1, pages + 1):
+        response = await client.get(
+            f"{settings.api_prefix}/faqs",
+            params={"page": page, "page_size": 100, "fields": "id,question", "include": "", "is_active": "true"},
+            headers=headers,
+        )
+        response.raise_for_status()
+        body = response.json()
+        catalog.faqs.extend((item["id"], item["question"]) for item in body["items"])
+        if page >= body["total_pages"]:
+            break
+    response = await client.get(f"{settings.api_prefix}/tags", params={"fields": "id"}, headers=headers)
+    response.raise_for_status()
+    catalog.tag_ids = [tag["id"] for tag in response.json()]
+    response = await client.get(f"{settings.bundle_mount_path}/manifest.json")
+    if response.status_code == 200:
+        catalog.shards = [shard["file"] for shard in response.json()["shards"]]
+    if not catalog.faqs:
+        raise SystemExit("The target has no active FAQs; import docs/docs.csv first")
+    return catalog
+
+
+# ==================== Scenarios ====================
+
+def build_request(
+    name: str, rng: random.Random, catalog: Catalog, terms: List[str],
+) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+    """(method, url, httpx options) for one scenario, or None if the target lacks the data."""
+    api = settings.api_prefix
+    if name == "bundle_manifest":
+        return "GET", f"{settings.bundle_mount_path}/manifest.json", {"headers": {"accept-encoding": "br, gzip"}}
+    if name == "bundle_shard":
+        if not catalog.shards:
+            return None
+        shard = rng.choice(catalog.shards)
+        return "GET", f"{settings.bundle_mount_path}/{shard}", {"headers": {"accept-encoding": "br, gzip"}}
+    if name == "faq_list":
+        return "GET", f"{api}/faqs", {"params": {"page": rng.randint(1, 5), "page_size": 20}}
+    if name == "faq_list_tag":
+        if not catalog.tag_ids:
+            return None
+        return "GET", f"{api}/faqs", {"params": {"tag_ids": rng.choice(catalog.tag_ids), "page_size": 20}}
+    if name == "faq_search":
+        return "GET", f"{api}/faqs", {"params": {"search": rng.choice(terms), "page_size": 20}}
+    if name == "faq_detail":
+        return "GET", f"{api}/faqs/{rng.choice(catalog.faqs)[0]}", {}
+    if name == "faq_trending":
+        return "GET", f"{api}/faqs/trending", {}
+    if name == "tag_list":
+        return "GET", f"{api}/tags", {}
+    if name == "faq_hit":
+        return "POST", f"{api}/faqs/{rng.choice(catalog.faqs)[0]}/hits", {}
+    if name == "faq_edit":
+        faq_id, question = rng.choice(catalog.faqs)
+        return "PUT", f"{api}/faqs/{faq_id}", {"json": {"question": question}}
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+@dataclass
+class Samples:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    errors: int = 0
+
+
+async def worker(
+    index: int, args, client: httpx.AsyncClient, catalog: Catalog, terms: List[str], cookies: List[str],
+    mix: Dict[str, int], budget: Dict[str, int], deadline: float, results: Optional[Dict[str, Samples]],
+) -> None:
+    """Send requests until the shared budget or the deadline runs out (results=None: warm-up)."""
+    rng = random.Random(args.seed * 1000 + index + (0 if results is None else 500))
+    names, weights = list(mix), list(mix.values())
+    cookie = f"AX={cookies[index % len(cookies)]}" if cookies else None
+    while budget["remaining"] > 0 and time.monotonic() < deadline:
+        budget["remaining"] -= 1
+        name = rng.choices(names, weights)[0]
+        request = build_request(name, rng, catalog, terms)
+        if request is None:
+            continue
+        method, url, options = request
+        if name not in ANONYMOUS_SCENARIOS and cookie:
+            options["headers"] = {**options.get("headers", {}), "cookie": cookie}
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **options)
+            await response.aread()
+        except httpx.HTTPError:
+            if results is not None:
+                results[name].errors += 1
+            continue
+        if results is not None:
+            samples = results[name]
+            samples.latencies.append(time.perf_counter() - started)
+            samples.statuses[response.status_code] += 1
+            if response.status_code >= 400:
+                samples.errors += 1
+
+
+# ==================== Report ====================
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def summarize(results: Dict[str, Samples], elapsed: float) -> Dict[str, Any]:
+    endpoints = {}
+    for name in sorted(results):
+        samples = results[name]
+        ordered = sorted(samples.latencies)
+        if not ordered:
+            continue
+        endpoints[name] = {
+            "requests": len(ordered),
+            "errors": samples.errors,
+            "statuses": {str(status): count for status, count in sorted(samples.statuses.items())},
+            "rps": round(len(ordered) / elapsed, 1),
+            "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions of this run against the baseline report."""
+    regressions = []
+    if report["rps"] < baseline["rps"] * (1 - tolerance):
+        regressions.append(f"total throughput {baseline['rps']} -> {report['rps']} rps")
+    for name, before in baseline["endpoints"].items():
+        after = report["endpoints"].get(name)
+        if after is None or min(before["requests"], after["requests"]) < MIN_COMPARE_REQUESTS:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if after[metric] > before[metric] * (1 + tolerance):
+                regressions.append(f"{name} {metric} {before[metric]} -> {after[metric]}")
+        if after["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{name} throughput {before['rps']} -> {after['rps']} rps")
+        before_rate = before["errors"] / max(before["requests"], 1)
+        after_rate = after["errors"] / max(after["requests"], 1)
+        if after_rate > before_rate + 0.01:
+            regressions.append(f"{name} error rate {before_rate:.1%} -> {after_rate:.1%}")
+    return regressions
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"\n{'scenario':<16}{'requests':>9}{'errors':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          + (f"{'base p95':>10}" if baseline else ""))
+    for name, endpoint in report["endpoints"].items():
+        line = (f"{name:<16}{endpoint['requests']:>9}{endpoint['errors']:>8}{endpoint['rps']:>9.1f}"
+                f"{endpoint['p50_ms']:>9.2f}{endpoint['p95_ms']:>9.2f}{endpoint['p99_ms']:>9.2f}")
+        if baseline:
+            before = baseline["endpoints"].get(name)
+            line += f"{before['p95_ms']:>10.2f}" if before else f"{'-':>10}"
+        print(line)
+    print(f"{'total':<16}{report['requests']:>9}{report['errors']:>8}{report['rps']:>9.1f}")
+
+
+# ==================== Main ====================
+
+def parse_mix(value: Optional[str], read_only: bool) -> Dict[str, int]:
+    mix = dict(DEFAULT_MIX)
+    if value:
+        mix = {}
+        for part in value.split(","):
+            name, _, weight = part.partition("=")
+            if name.strip() not in DEFAULT_MIX:
+                raise SystemExit(f"Unknown scenario {name!r}; available: {', '.join(DEFAULT_MIX)}")
+            mix[name.strip()] = int(weight or 1)
+    if read_only:
+        mix = {name: weight for name, weight in mix.items() if name not in WRITE_SCENARIOS}
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+async def run(args) -> int:
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix, args.read_only)
+    terms = load_search_terms(Path(args.csv), args.search_terms, rng)
+    cookies = [] if args.no_sessions else seed_sessions(args.sessions)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+            catalog = await discover_catalog(client, cookies, args.discover_pages)
+            print(f"▶ {len(catalog.faqs)} FAQs, {len(catalog.tag_ids)} tags, {len(catalog.shards)} bundle shards, "
+                  f"{len(terms)} search terms, {len(cookies)} sessions", file=sys.stderr)
+
+            async def phase(requests: int, results: Optional[Dict[str, Samples]]) -> float:
+                budget = {"remaining": requests}
+                deadline = time.monotonic() + (args.duration or float("inf"))
+                started = time.perf_counter()
+                await asyncio.gather(*(
+                    worker(index, args, client, catalog, terms, cookies, mix, budget, deadline, results)
+                    for index in range(args.concurrency)
+                ))
+                return time.perf_counter() - started
+
+            await phase(args.warmup, None)
+            results: Dict[str, Samples] = defaultdict(Samples)
+            elapsed = await phase(args.requests, results)
+    finally:
+        if cookies:
+            delete_sessions(cookies)
+
+    report = {
+        "config": {
+            "base_url": args.base_url, "concurrency": args.concurrency, "requests": args.requests,
+            "warmup": args.warmup, "duration": args.duration, "seed": args.seed, "mix": mix,
+        },
+        **summarize(results, elapsed),
+    }
+    baseline = None
+    if args.baseline and Path(args.baseline).exists() and not args.save_baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+    print_report(report, baseline)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+    if baseline is not None:
+        if baseline["config"]["mix"] != mix or baseline["config"]["concurrency"] != args.concurrency:
+            print("\nWarning: the baseline was recorded with a different mix or concurrency", file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=f"http://localhost:{settings.api_port}")
+    parser.add_argument("--concurrency", type=int, default=16, help="closed-loop workers (default: 16)")
+    parser.add_argument("--requests", type=int, default=5000, help="measured requests (default: 5000)")
+    parser.add_argument("--warmup", type=int, default=200, help="requests sent before measuring (default: 200)")
+    parser.add_argument("--duration", type=float, default=None, help="stop measuring after this many seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mix", help="scenario weights, e.g. faq_search=50,faq_detail=50 (default: built-in mix)")
+    parser.add_argument("--read-only", action="store_true", help="skip the faq_hit and faq_edit write scenarios")
+    parser.add_argument("--csv", default="docs/docs.csv", help="intent export used for search terms")
+    parser.add_argument("--search-terms", type=int, default=500, help="distinct search terms (default: 500)")
+    parser.add_argument("--sessions", type=int, default=20, help="SSO sessions seeded into Redis (default: 20)")
+    parser.add_argument("--no-sessions", action="store_true", help="send no AX cookie (APP_ENV=local servers)")
+    parser.add_argument("--discover-pages", type=int, default=20, help="pages of 100 FAQ ids to pick from")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="write the JSON report to this path")
+    parser.add_argument("--baseline", help="baseline report to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run to --baseline instead")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed regression (default: 0.15)")
+    args = parser.parse_args()
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline needs --baseline")
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
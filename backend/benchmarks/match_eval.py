@@ -0,0 +1,405 @@
+"""Evaluate FAQ matching quality and latency with question variants as labeled queries.
+
+Every question variant is a query whose expected answer is its ``faq_id``
+(leave-one-out): the variant is held out of the index while its own query
+runs, so an engine can only find the FAQ through the FAQ's question, its
+other variants or, for ``ilike``, its answer. A variant that only repeats
+its FAQ's question or an earlier variant of the same FAQ (ignoring case,
+spacing and punctuation) is dropped before indexing; otherwise the held-out
+query would still find its exact copy in the index. Engines:
+
+- ``ilike``: the current ``/faqs?search=`` behaviour. The query must be a
+  case-insensitive substring of the question or answer, and matches are
+  ordered like the route (``updated_at DESC, id DESC``).
+- ``trigram``: pg_trgm ``similarity()`` (shared / total distinct trigrams of
+  the padded words).
+- ``bm25``: Okapi BM25 (k1=1.2, b=0.75).
+- ``tfidf``: cosine similarity of sublinear TF-IDF vectors.
+
+The ranked engines score the FAQ question and every variant as separate
+texts and rank an FAQ by its best text; ties fall back to the route order.
+Terms are lowercased ``[0-9a-z]`` runs and Hangul runs, and Hangul words also
+add their character bigrams so ``날씨를`` still meets ``날씨``. Corpus statistics
+(document frequencies, average length) include the held-out variant.
+
+Queries are split across ``--workers`` processes; each builds the indexes
+once and evaluates its share. The report has, per engine, MRR, recall@k for
+every ``--k``, the share of queries whose FAQ was not retrieved at all, index
+build time and per-query latency percentiles. Latency is in-process scoring
+only (no database or HTTP), so it compares engines, not endpoints; keep
+``--workers`` at or below the core count, or time slicing inflates the tail.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmarks/match_eval.py --workers 8 --output match_eval.json
+    PYTHONPATH=$(pwd) python benchmarks/match_eval.py --engines bm25,tfidf --sample 2000 --seed 1
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+FAQS_SQL = """
+    SELECT id, question, answer FROM faqs
+    {where}
+    ORDER BY updated_at DESC, id DESC
+"""
+
+VARIANTS_SQL = """
+    SELECT v.id, v.faq_id, v.question_text
+    FROM question_variants v
+    JOIN faqs f ON f.id = v.faq_id
+    {where}
+    ORDER BY v.id
+"""
+
+TERM_PATTERN = re.compile(r"[0-9a-z]+|[가-힣]+")
+WORD_PATTERN = re.compile(r"[^\W_]+")  # pg_trgm: words are runs of alphanumerics
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(value: str) -> List[str]:
+    """Lowercased terms; Hangul words also yield their character bigrams."""
+    terms = []
+    for word in TERM_PATTERN.findall(value.lower()):
+        terms.append(word)
+        if len(word) > 2 and "가" <= word[0] <= "힣":
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+def trigrams(value: str) -> set:
+    """pg_trgm trigram set: each word padded with two leading and one trailing space."""
+    result = set()
+    for word in WORD_PATTERN.findall(value.lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def normalized(value: str) -> str:
+    """Text compared for duplicates: lowercased words, ignoring spacing and punctuation."""
+    return " ".join(WORD_PATTERN.findall(value.lower()))
+
+
+def drop_duplicate_variants(
+    faqs: List[Tuple[int, str, str]], variants: List[Tuple[int, int, str]]
+) -> Tuple[List[Tuple[int, int, str]], int]:
+    """Variants not equal to their FAQ's question or an earlier variant of it, and the number dropped."""
+    seen: Dict[int, set] = {faq_id: {normalized(question)} for faq_id, question, _ in faqs}
+    kept = []
+    for variant in variants:
+        _, faq_id, question_text = variant
+        key = normalized(question_text)
+        texts = seen.setdefault(faq_id, set())
+        if key in texts:
+            continue
+        texts.add(key)
+        kept.append(variant)
+    return kept, len(variants) - len(kept)
+
+
+class Corpus:
+    """FAQs in route order plus the indexed texts (questions first, then variants)."""
+
+    def __init__(self, faqs: List[Tuple[int, str, str]], variants: List[Tuple[int, int, str]]):
+        self.faqs = faqs
+        self.order = {faq_id: position for position, (faq_id, _, _) in enumerate(faqs)}
+        self.doc_faq: List[int] = [faq_id for faq_id, _, _ in faqs]
+        self.doc_text: List[str] = [question for _, question, _ in faqs]
+        # (doc index, faq_id, text) of every labeled query
+        self.queries: List[Tuple[int, int, str]] = []
+        for _, faq_id, question_text in variants:
+            self.queries.append((len(self.doc_text), faq_id, question_text))
+            self.doc_faq.append(faq_id)
+            self.doc_text.append(question_text)
+
+
+class IlikeEngine:
+    """Substring match on question/answer, like ``/faqs?search=``."""
+
+    def __init__(self, corpus: Corpus):
+        self.rows = [(faq_id, question.lower(), answer.lower()) for faq_id, question, answer in corpus.faqs]
+
+    def search(self, query: str, held_out: int) -> Dict[int, float]:
+        needle = query.lower()
+        return {faq_id: 1.0 for faq_id, question, answer in self.rows if needle in question or needle in answer}
+
+
+class TrigramEngine:
+    """pg_trgm similarity over an inverted trigram index."""
+
+    def __init__(self, corpus: Corpus):
+        self.doc_faq = corpus.doc_faq
+        self.sizes: List[int] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        for doc, value in enumerate(corpus.doc_text):
+            grams = trigrams(value)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings[gram].append(doc)
+
+    def search(self, query: str, held_out: int) -> Dict[int, float]:
+        grams = trigrams(query)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        shared.pop(held_out, None)
+        best: Dict[int, float] = {}
+        for doc, count in shared.items():
+            score = count / (len(grams) + self.sizes[doc] - count)
+            faq_id = self.doc_faq[doc]
+            if score > best.get(faq_id, 0.0):
+                best[faq_id] = score
+        return best
+
+
+class Bm25Engine:
+    """Okapi BM25 over term postings."""
+
+    def __init__(self, corpus: Corpus):
+        self.doc_faq = corpus.doc_faq
+        documents = [Counter(tokenize(value)) for value in corpus.doc_text]
+        lengths = [sum(terms.values()) for terms in documents]
+        average = sum(lengths) / max(len(lengths), 1) or 1.0
+        self.idf: Dict[str, float] = {}
+        self.postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for doc, terms in enumerate(documents):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc] / average)
+            for term, tf in terms.items():
+                self.postings[term].append((doc, tf * (BM25_K1 + 1) / (tf + norm)))
+        total = len(documents)
+        for term, entries in self.postings.items():
+            df = len(entries)
+            self.idf[term] = math.log(1 + (total - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, held_out: int) -> Dict[int, float]:
+        scores: Dict[int, float] = defaultdict(float)
+        for term, qtf in Counter(tokenize(query)).items():
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc, weight in self.postings[term]:
+                scores[doc] += qtf * idf * weight
+        scores.pop(held_out, None)
+        best: Dict[int, float] = {}
+        for doc, score in scores.items():
+            faq_id = self.doc_faq[doc]
+            if score > best.get(faq_id, 0.0):
+                best[faq_id] = score
+        return best
+
+
+class TfidfEngine:
+    """Cosine similarity of L2-normalized sublinear TF-IDF vectors."""
+
+    def __init__(self, corpus: Corpus):
+        self.doc_faq = corpus.doc_faq
+        documents = [Counter(tokenize(value)) for value in corpus.doc_text]
+        df: Counter = Counter()
+        for terms in documents:
+            df.update(terms.keys())
+        total = len(documents)
+        self.idf = {term: math.log((1 + total) / (1 + count)) + 1 for term, count in df.items()}
+        self.postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for doc, terms in enumerate(documents):
+            vector = self._vector(terms)
+            for term, weight in vector.items():
+                self.postings[term].append((doc, weight))
+
+    def _vector(self, terms: Counter) -> Dict[str, float]:
+        vector = {
+            term: (1 + math.log(tf)) * self.idf[term] for term, tf in terms.items() if term in self.idf
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {term: weight / norm for term, weight in vector.items()}
+
+    def search(self, query: str, held_out: int) -> Dict[int, float]:
+        scores: Dict[int, float] = defaultdict(float)
+        for term, weight in self._vector(Counter(tokenize(query))).items():
+            for doc, doc_weight in self.postings[term]:
+                scores[doc] += weight * doc_weight
+        scores.pop(held_out, None)
+        best: Dict[int, float] = {}
+        for doc, score in scores.items():
+            faq_id = self.doc_faq[doc]
+            if score > best.get(faq_id, 0.0):
+                best[faq_id] = score
+        return best
+
+
+ENGINES = {
+    "ilike": IlikeEngine,
+    "trigram": TrigramEngine,
+    "bm25": Bm25Engine,
+    "tfidf": TfidfEngine,
+}
+
+# Per-process state, set once by _init_worker
+_corpus: Optional[Corpus] = None
+_engines: Dict[str, Any] = {}
+_build_seconds: Dict[str, float] = {}
+
+
+def _init_worker(faqs, variants, engine_names: List[str]) -> None:
+    global _corpus
+    _corpus = Corpus(faqs, variants)
+    for name in engine_names:
+        started = time.perf_counter()
+        _engines[name] = ENGINES[name](_corpus)
+        _build_seconds[name] = time.perf_counter() - started
+
+
+def rank_of(scores: Dict[int, float], faq_id: int, order: Dict[int, int]) -> Optional[int]:
+    """1-based rank of the expected FAQ (None when not retrieved); ties use the route order."""
+    best = scores.get(faq_id)
+    if best is None:
+        return None
+    position = order[faq_id]
+    return 1 + sum(1 for other, score in scores.items() if score > best or (score == best and order[other] < position))
+
+
+def _evaluate(query_indexes: List[int]) -> Dict[str, Any]:
+    """Run a share of the queries through every engine: ranks and latencies (seconds)."""
+    results: Dict[str, Any] = {"build_seconds": dict(_build_seconds), "engines": {}}
+    for name, engine in _engines.items():
+        ranks: List[Optional[int]] = []
+        latencies: List[float] = []
+        for index in query_indexes:
+            held_out, faq_id, query = _corpus.queries[index]
+            started = time.perf_counter()
+            scores = engine.search(query, held_out)
+            latencies.append(time.perf_counter() - started)
+            ranks.append(rank_of(scores, faq_id, _corpus.order))
+        results["engines"][name] = {"ranks": ranks, "latencies": latencies}
+    return results
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def summarize(ranks: List[Optional[int]], latencies: List[float], ks: List[int], build_seconds: float) -> Dict[str, Any]:
+    count = len(ranks) or 1
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "queries": len(ranks),
+        "mrr": round(sum(1 / rank for rank in ranks if rank) / count, 4),
+        "recall": {str(k): round(sum(1 for rank in ranks if rank and rank <= k) / count, 4) for k in ks},
+        "not_retrieved": round(sum(1 for rank in ranks if rank is None) / count, 4),
+        "build_seconds": round(build_seconds, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+async def load_corpus(include_inactive: bool) -> Tuple[List[tuple], List[tuple]]:
+    """Read FAQs (route order) and their question variants from the app database."""
+    from app.db.session import engine
+
+    try:
+        async with engine.connect() as conn:
+            faqs = (await conn.execute(text(FAQS_SQL.format(where="" if include_inactive else "WHERE is_active")))).all()
+            variants = (await conn.execute(
+                text(VARIANTS_SQL.format(where="" if include_inactive else "WHERE f.is_active"))
+            )).all()
+    finally:
+        await engine.dispose()
+    return [tuple(row) for row in faqs], [tuple(row) for row in variants]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engines", default=",".join(ENGINES), help=f"comma-separated subset of {', '.join(ENGINES)}")
+    parser.add_argument("--k", default="1,3,5,10", help="recall@k cut-offs (default: 1,3,5,10)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="evaluation processes")
+    parser.add_argument("--sample", type=int, default=None, help="evaluate a random sample of this many variants")
+    parser.add_argument("--seed", type=int, default=42, help="sampling seed")
+    parser.add_argument("--include-inactive", action="store_true", help="also index and query inactive FAQs")
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    engine_names = [name.strip() for name in args.engines.split(",") if name.strip()]
+    unknown = [name for name in engine_names if name not in ENGINES]
+    if unknown or not engine_names:
+        parser.error(f"unknown engines: {', '.join(unknown) or '(none)'}")
+    ks = sorted({int(k) for k in args.k.split(",") if k.strip()})
+
+    faqs, variants = asyncio.run(load_corpus(args.include_inactive))
+    variants, duplicates = drop_duplicate_variants(faqs, variants)
+    query_indexes = list(range(len(variants)))
+    if args.sample and args.sample < len(query_indexes):
+        query_indexes = sorted(random.Random(args.seed).sample(query_indexes, args.sample))
+    if not query_indexes:
+        print("No question variants to evaluate.", file=sys.stderr)
+        return 1
+
+    workers = max(1, min(args.workers, len(query_indexes)))
+    print(f"▶ {len(faqs):,} FAQs, {len(variants):,} variants ({duplicates:,} duplicates dropped), "
+          f"{len(query_indexes):,} queries, "
+          f"{workers} workers: {', '.join(engine_names)}", file=sys.stderr)
+
+    started = time.perf_counter()
+    chunk_size = math.ceil(len(query_indexes) / (workers * 4))
+    chunks = [query_indexes[i:i + chunk_size] for i in range(0, len(query_indexes), chunk_size)]
+    if workers == 1:
+        _init_worker(faqs, variants, engine_names)
+        parts = [_evaluate(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(faqs, variants, engine_names),
+        ) as executor:
+            parts = list(executor.map(_evaluate, chunks))
+    elapsed = time.perf_counter() - started
+
+    report: Dict[str, Any] = {
+        "faqs": len(faqs),
+        "variants": len(variants),
+        "duplicate_variants": duplicates,
+        "queries": len(query_indexes),
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 2),
+        "engines": {},
+    }
+    for name in engine_names:
+        ranks = [rank for part in parts for rank in part["engines"][name]["ranks"]]
+        latencies = [latency for part in parts for latency in part["engines"][name]["latencies"]]
+        build_seconds = max(part["build_seconds"][name] for part in parts)
+        report["engines"][name] = summarize(ranks, latencies, ks, build_seconds)
+
+    recall_header = "".join(f"{'R@' + str(k):>8}" for k in ks)
+    print(f"\n{'engine':<10}{'MRR':>8}{recall_header}{'miss':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'build s':>10}")
+    for name, result in report["engines"].items():
+        recalls = "".join(f"{result['recall'][str(k)]:>8.3f}" for k in ks)
+        print(f"{name:<10}{result['mrr']:>8.3f}{recalls}{result['not_retrieved']:>8.3f}"
+              f"{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}{result['p99_ms']:>10.3f}{result['build_seconds']:>10.3f}")
+    print(f"\n{len(query_indexes):,} queries in {elapsed:.1f}s", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,617 @@
+"""Generate a synthetic FAQ catalog shaped like docs/docs.csv and bulk-load it with COPY.
+
+The profile is learned from the intent export:
+
+- variants per FAQ, question length (words), answer length (lines) and usage
+  frequency are sampled from their empirical distributions;
+- tag popularity follows the export's group sizes (a Zipf tail beyond the
+  export's tag count), with the export's share of untagged and inactive FAQs;
+- question words are drawn from the question vocabulary by frequency; answers
+  reuse the export's answer lines (markup, ``▶``, ``**``, ``||||`` intact)
+  with half of their Hangul and Latin words swapped for vocabulary words of the
+  same script, so the Korean/Latin mix and the markup density carry over.
+
+Generation runs in worker processes, one chunk of ``--chunk-size`` FAQs at a
+time. Every chunk has its own RNG stream derived from ``(seed, chunk)``, and
+ids are assigned from per-chunk counts computed up front, so the same
+``--seed``, ``--faqs`` and ``--chunk-size`` give the same catalog (ids and
+text) whatever the worker count or machine.
+
+Loading (into an empty catalog, or with ``--truncate``):
+
+1. secondary indexes on the catalog tables are dropped (``--keep-indexes`` to
+   keep them) and user triggers (counters, catalog version) disabled;
+2. tags, then every chunk's FAQs, variants and tag links are COPY'd in one
+   transaction per chunk over ``--connections`` connections;
+3. ``tags.faq_count`` is recomputed (``faqs.question_count`` is written
+   directly), sequences are moved past the generated ids, triggers are
+   re-enabled, indexes rebuilt, tables analyzed, the catalog version bumped
+   and the stats view refreshed; a tag change is logged so the static bundle
+   rebuilds. Change-feed mirrors need a full resync afterwards.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmarks/synth_catalog.py --profile-only
+    PYTHONPATH=$(pwd) python benchmarks/synth_catalog.py --faqs 1000000 --seed 42 --truncate
+    PYTHONPATH=$(pwd) python benchmarks/synth_catalog.py --faqs 100000 --csv-dir /tmp/synth   # no database
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from app.config import settings
+from app.importer.csv_source import (
+    ACTIVE_STATUS, COL_ANSWER, COL_DISPLAY_QUESTION, COL_GROUP, COL_QUESTIONS, COL_USAGE_FREQUENCY,
+    COL_USAGE_STATUS, MAX_QUESTION_LENGTH, MAX_TAG_LENGTH,
+)
+from app.utils.markup import RENDER_VERSION, render_answer
+
+DEFAULT_CHUNK_SIZE = 10_000
+CATALOG_TABLES = ("tags", "faqs", "faq_tags", "question_variants")
+SUBSTITUTION_RATE = 0.5  # share of answer words replaced by vocabulary words
+VARIANT_REUSE_RATE = 0.5  # share of a variant's words taken from its FAQ's question
+EPOCH = datetime(2021, 1, 1)
+SPAN_SECONDS = 5 * 365 * 24 * 3600
+
+FAQ_COLUMNS = [
+    "id", "external_id", "question", "answer", "answer_html", "answer_text", "answer_render_version",
+    "usage_frequency", "question_count", "is_active", "created_by", "updated_by", "created_at", "updated_at",
+]
+VARIANT_COLUMNS = ["id", "faq_id", "question_text", "is_representative", "created_at"]
+FAQ_TAG_COLUMNS = ["id", "faq_id", "tag_id", "created_at"]
+TAG_COLUMNS = ["id", "name", "description", "color", "display_order", "is_active", "faq_count", "created_at", "updated_at"]
+
+_WORD_RE = re.compile(r"[가-힣]+|[A-Za-z]+")
+_HANGUL_RE = re.compile(r"[가-힣]")
+_LATIN_RE = re.compile(r"[A-Za-z]")
+
+
+# ==================== Profile ====================
+
+def _sorted_vocabulary(counter: Counter) -> Tuple[List[str], List[float]]:
+    """Words and cumulative probabilities, most frequent first (ties by word for stability)."""
+    items = sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+    counts = np.array([count for _, count in items], dtype=np.float64)
+    return [word for word, _ in items], (np.cumsum(counts) / counts.sum()).tolist()
+
+
+def script_mix(texts: List[str]) -> Dict[str, float]:
+    """Share of Hangul and Latin letters among all letters."""
+    hangul = sum(len(_HANGUL_RE.findall(value)) for value in texts)
+    latin = sum(len(_LATIN_RE.findall(value)) for value in texts)
+    letters = max(hangul + latin, 1)
+    return {"hangul": round(hangul / letters, 4), "latin": round(latin / letters, 4)}
+
+
+def learn_profile(csv_path: str) -> Dict[str, Any]:
+    """Learn the catalog shape from the intent export."""
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        rows = [row for row in reader if len(row) > COL_ANSWER and row[COL_DISPLAY_QUESTION].strip() and row[COL_ANSWER].strip()]
+    if not rows:
+        raise SystemExit(f"No usable rows in {csv_path}")
+
+    questions = [row[COL_DISPLAY_QUESTION].strip() for row in rows]
+    answers = [row[COL_ANSWER].strip() for row in rows]
+    groups = Counter(row[COL_GROUP].strip()[:MAX_TAG_LENGTH] for row in rows if row[COL_GROUP].strip())
+    variant_counts = [
+        max(len({part.strip() for part in row[COL_QUESTIONS].split(",") if part.strip()}), 1) for row in rows
+    ]
+    usage = [int(row[COL_USAGE_FREQUENCY]) if row[COL_USAGE_FREQUENCY].strip().isdigit() else 0 for row in rows]
+    statuses = [row[COL_USAGE_STATUS].strip() for row in rows]
+
+    question_vocabulary: Counter = Counter()
+    for row in rows:
+        for value in [row[COL_DISPLAY_QUESTION]] + row[COL_QUESTIONS].split(","):
+            question_vocabulary.update(value.split())
+    hangul_words: Counter = Counter()
+    latin_words: Counter = Counter()
+    answer_lines: List[str] = []
+    answer_line_counts: List[int] = []
+    for answer in answers:
+        lines = answer.split("\n")
+        answer_line_counts.append(len(lines))
+        answer_lines.extend(lines)
+        for word in _WORD_RE.findall(answer):
+            (hangul_words if _HANGUL_RE.match(word) else latin_words)[word] += 1
+
+    tag_names = [name for name, _ in sorted(groups.items(), key=lambda item: (-item[1], item[0]))]
+    q_words, q_cdf = _sorted_vocabulary(question_vocabulary)
+    h_words, h_cdf = _sorted_vocabulary(hangul_words)
+    l_words, l_cdf = _sorted_vocabulary(latin_words)
+    return {
+        "source": os.path.basename(csv_path),
+        "rows": len(rows),
+        "active_ratio": sum(1 for status in statuses if not status or status == ACTIVE_STATUS) / len(rows),
+        "untagged_ratio": 1 - sum(groups.values()) / len(rows),
+        "tag_names": tag_names,
+        "tag_sizes": [groups[name] for name in tag_names],
+        "variant_counts": variant_counts,
+        "question_word_counts": [max(len(question.split()), 1) for question in questions],
+        "answer_line_counts": answer_line_counts,
+        "usage_frequency": usage,
+        "answer_lines": answer_lines,
+        "answer_line_words": [len(_WORD_RE.findall(line)) for line in answer_lines],
+        "question_words": q_words, "question_cdf": q_cdf,
+        "hangul_words": h_words, "hangul_cdf": h_cdf,
+        "latin_words": l_words, "latin_cdf": l_cdf,
+        "question_mix": script_mix(questions),
+        "answer_mix": script_mix(answers),
+    }
+
+
+def tag_weights(profile: Dict[str, Any], tag_count: int) -> np.ndarray:
+    """Cumulative tag popularity: the export's group sizes, then a Zipf tail."""
+    sizes = list(profile["tag_sizes"][:tag_count])
+    learned = len(sizes)
+    last = sizes[-1] if sizes else 1
+    sizes += [last * learned / rank for rank in range(learned + 1, tag_count + 1)]
+    weights = np.array(sizes, dtype=np.float64)
+    return np.cumsum(weights) / weights.sum()
+
+
+def tag_names(profile: Dict[str, Any], tag_count: int) -> List[str]:
+    names = list(profile["tag_names"][:tag_count])
+    for rank in range(len(names), tag_count):
+        base = profile["tag_names"][rank % len(profile["tag_names"])] if profile["tag_names"] else "Tag"
+        names.append(f"{base[:MAX_TAG_LENGTH - 8]}-{rank:06d}")
+    return names
+
+
+# ==================== Generation ====================
+
+def _structure(profile: Dict[str, Any], tag_cdf: np.ndarray, seed: int, chunk: int, size: int):
+    """Per-FAQ counts of one chunk, drawn first from the chunk's structure stream."""
+    rng = np.random.default_rng([seed, chunk, 0])
+    variants = rng.choice(np.asarray(profile["variant_counts"]), size)
+    tagged = rng.random(size) >= profile["untagged_ratio"]
+    tags = np.searchsorted(tag_cdf, rng.random(size), side="right")
+    return variants, tagged, tags
+
+
+def plan_chunk(profile: Dict[str, Any], tag_cdf: np.ndarray, seed: int, chunk: int, size: int) -> Tuple[int, int]:
+    """(variants, tag links) of one chunk, for assigning ids before generation."""
+    variants, tagged, _ = _structure(profile, tag_cdf, seed, chunk, size)
+    return int(variants.sum()), int(tagged.sum())
+
+
+def _draw(words: List[str], cdf: np.ndarray, uniform: np.ndarray) -> List[str]:
+    indexes = np.minimum(np.searchsorted(cdf, uniform, side="right"), len(words) - 1)
+    return [words[index] for index in indexes]
+
+
+def _csv(rows: List[tuple]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _flag(value: bool) -> str:
+    return "t" if value else "f"
+
+
+def _template(line: str) -> Tuple[List[str], List[Tuple[int, bool]]]:
+    """A line split into segments, with the positions of its words and whether each is Hangul."""
+    segments, words, last = [], [], 0
+    for match in _WORD_RE.finditer(line):
+        segments.append(line[last:match.start()])
+        words.append((len(segments), bool(_HANGUL_RE.match(match.group(0)))))
+        segments.append(match.group(0))
+        last = match.end()
+    segments.append(line[last:])
+    return segments, words
+
+
+_profile_cache: Dict[str, Any] = {}
+
+
+def _load_cached(profile_path: str) -> Dict[str, Any]:
+    """Profile and derived arrays, loaded once per worker process."""
+    if _profile_cache.get("path") != profile_path:
+        with open(profile_path, encoding="utf-8") as f:
+            profile = json.load(f)
+        _profile_cache.clear()
+        _profile_cache.update({
+            "path": profile_path,
+            "profile": profile,
+            "question_cdf": np.asarray(profile["question_cdf"]),
+            "hangul_cdf": np.asarray(profile["hangul_cdf"]),
+            "latin_cdf": np.asarray(profile["latin_cdf"]),
+            "answer_line_words": np.asarray(profile["answer_line_words"]),
+            "answer_templates": [_template(line) for line in profile["answer_lines"]],
+        })
+    return _profile_cache
+
+
+def generate_chunk(
+    profile_path: str, seed: int, chunk: int, size: int, first_faq_id: int, first_variant_id: int,
+    first_link_id: int, tag_count: int, render: bool,
+) -> Dict[str, Any]:
+    """Generate one chunk as COPY-ready CSV (faqs, question_variants, faq_tags)."""
+    cache = _load_cached(profile_path)
+    profile = cache["profile"]
+    tag_cdf = tag_weights(profile, tag_count)
+    variant_counts, tagged, tag_indexes = _structure(profile, tag_cdf, seed, chunk, size)
+    rng = np.random.default_rng([seed, chunk, 1])
+
+    # Questions
+    word_counts = rng.choice(np.asarray(profile["question_word_counts"]), size)
+    question_words = _draw(profile["question_words"], cache["question_cdf"], rng.random(int(word_counts.sum())))
+    questions, offset = [], 0
+    for count in word_counts:
+        questions.append(" ".join(question_words[offset:offset + count])[:MAX_QUESTION_LENGTH].strip())
+        offset += count
+
+    # Answers: export lines with half of their words swapped for words of the same script
+    line_counts = rng.choice(np.asarray(profile["answer_line_counts"]), size)
+    line_indexes = rng.integers(0, len(profile["answer_lines"]), int(line_counts.sum()))
+    answer_words = int(cache["answer_line_words"][line_indexes].sum())
+    hangul = _draw(profile["hangul_words"], cache["hangul_cdf"], rng.random(answer_words))
+    latin = _draw(profile["latin_words"], cache["latin_cdf"], rng.random(answer_words))
+    swaps = (rng.random(answer_words) < SUBSTITUTION_RATE).tolist()
+    templates = cache["answer_templates"]
+
+    answers, offset, word = [], 0, 0
+    for count in line_counts.tolist():
+        lines = []
+        for index in line_indexes[offset:offset + count].tolist():
+            segments, words = templates[index]
+            segments = list(segments)
+            for position, is_hangul in words:
+                if swaps[word]:
+                    segments[position] = hangul[word] if is_hangul else latin[word]
+                word += 1
+            lines.append("".join(segments))
+        answers.append("\n".join(lines).strip() or questions[len(answers)])
+        offset += count
+
+    usage = rng.choice(np.asarray(profile["usage_frequency"]), size)
+    active = rng.random(size) < profile["active_ratio"]
+    created = rng.integers(0, SPAN_SECONDS, size)
+    updated = created + (rng.random(size) * (SPAN_SECONDS - created)).astype(np.int64)
+
+    # Variants beyond the representative one: question-length word lists, each word either taken
+    # from the FAQ's question or drawn from the question vocabulary
+    extra_counts = rng.choice(np.asarray(profile["question_word_counts"]), int(variant_counts.sum()) - size)
+    extra_words = int(extra_counts.sum())
+    pool = _draw(profile["question_words"], cache["question_cdf"], rng.random(extra_words))
+    reuse = (rng.random(extra_words) < VARIANT_REUSE_RATE).tolist()
+    picks = rng.integers(0, 1 << 30, extra_words).tolist()
+    extra_counts = extra_counts.tolist()
+
+    faqs, variants, links = [], [], []
+    variant_id, link_id = first_variant_id, first_link_id
+    variant_index, word_offset = 0, 0
+    for i in range(size):
+        faq_id = first_faq_id + i
+        created_at = (EPOCH + timedelta(seconds=int(created[i]))).isoformat(sep=" ")
+        updated_at = (EPOCH + timedelta(seconds=int(updated[i]))).isoformat(sep=" ")
+        question, answer = questions[i], answers[i]
+        if render:
+            answer_html, answer_text = render_answer(answer)
+            version = RENDER_VERSION
+        else:
+            answer_html, answer_text, version = None, None, 0
+
+        texts = [question]
+        base_words = question.split()
+        for _ in range(int(variant_counts[i]) - 1):
+            end = word_offset + extra_counts[variant_index]
+            words = [
+                base_words[picks[k] % len(base_words)] if base_words and reuse[k] else pool[k]
+                for k in range(word_offset, end)
+            ]
+            texts.append(" ".join(words)[:MAX_QUESTION_LENGTH].strip())
+            variant_index += 1
+            word_offset = end
+        seen = set()
+        for position, value in enumerate(texts):
+            # Keep ids dense even when a variant repeats: suffix duplicates instead of dropping them
+            if value in seen or not value:
+                value = f"{value} ({position})"[:MAX_QUESTION_LENGTH]
+            seen.add(value)
+            variants.append((variant_id, faq_id, value, _flag(position == 0), created_at))
+            variant_id += 1
+
+        faqs.append((
+            faq_id, f"SYN{seed}-{faq_id:09d}", question, answer, answer_html, answer_text, version,
+            int(usage[i]), len(texts), _flag(bool(active[i])), "synthetic", "synthetic", created_at, updated_at,
+        ))
+        if tagged[i]:
+            links.append((link_id, faq_id, int(tag_indexes[i]) + 1, created_at))
+            link_id += 1
+
+    return {
+        "chunk": chunk,
+        "faqs": _csv(faqs),
+        "question_variants": _csv(variants),
+        "faq_tags": _csv(links),
+        "counts": (len(faqs), len(variants), len(links)),
+        "sample": (questions[:200], answers[:200]) if chunk == 0 else None,
+    }
+
+
+def tags_csv(profile: Dict[str, Any], tag_count: int) -> bytes:
+    now = EPOCH.isoformat(sep=" ")
+    rows = [
+        (index + 1, name, None, None, index, "t", 0, now, now)
+        for index, name in enumerate(tag_names(profile, tag_count))
+    ]
+    return _csv(rows)
+
+
+# ==================== Loading ====================
+
+async def _copy(conn, table: str, columns: List[str], data: bytes) -> None:
+    """COPY CSV bytes into a table through the asyncpg driver connection."""
+    if not data:
+        return
+
+    async def source():
+        yield data
+
+    raw_connection = await conn.get_raw_connection()
+    await raw_connection.driver_connection.copy_to_table(table, source=source(), columns=columns, format="csv")
+
+
+async def prepare_tables(engine, truncate: bool, keep_indexes: bool) -> List[str]:
+    """Empty check/truncate, drop secondary indexes, disable user triggers. Returns the dropped index DDL."""
+    async with engine.begin() as conn:
+        if truncate:
+            await conn.execute(text(f"TRUNCATE {', '.join(CATALOG_TABLES)} RESTART IDENTITY CASCADE"))
+        else:
+            for table in CATALOG_TABLES:
+                if (await conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})"))).scalar():
+                    raise SystemExit(f"{table} is not empty; pass --truncate to replace the catalog")
+        index_ddl = []
+        if not keep_indexes:
+            rows = await conn.execute(text("""
+                SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+                FROM pg_index i
+                WHERE i.indrelid::regclass::text = ANY(:tables)
+                  AND NOT i.indisprimary
+                  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+            """), {"tables": list(CATALOG_TABLES)})
+            for name, ddl in rows.all():
+                index_ddl.append(ddl)
+                await conn.execute(text(f"DROP INDEX {name}"))
+        for table in CATALOG_TABLES:
+            await conn.execute(text(f"ALTER TABLE {table} DISABLE TRIGGER USER"))
+    return index_ddl
+
+
+async def finish_tables(engine, index_ddl: List[str], connections: int) -> None:
+    """Recompute counters, move sequences, re-enable triggers, rebuild indexes, analyze."""
+    async with engine.begin() as conn:
+        await conn.execute(text("""
+            UPDATE tags t SET faq_count = c.cnt
+            FROM (SELECT tag_id, count(*) AS cnt FROM faq_tags GROUP BY tag_id) c
+            WHERE t.id = c.tag_id
+        """))
+        for table in CATALOG_TABLES:
+            await conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)"
+            ))
+            await conn.execute(text(f"ALTER TABLE {table} ENABLE TRIGGER USER"))
+
+    semaphore = asyncio.Semaphore(connections)
+
+    async def build(ddl: str) -> None:
+        async with semaphore:
+            async with engine.begin() as conn:
+                await conn.execute(text("SET LOCAL maintenance_work_mem = '512MB'"))
+                started = time.perf_counter()
+                await conn.execute(text(ddl))
+                print(f"   index rebuilt in {time.perf_counter() - started:.1f}s: {ddl[:90]}")
+
+    await asyncio.gather(*(build(ddl) for ddl in index_ddl))
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in CATALOG_TABLES:
+            await conn.execute(text(f"ANALYZE {table}"))
+        await conn.execute(text("SELECT nextval('catalog_version_seq')"))
+        await conn.execute(text("REFRESH MATERIALIZED VIEW stats_overview_mv"))
+
+
+async def load(args, profile_path: str, profile: Dict[str, Any]) -> None:
+    from app.core.changes import ENTITY_TAG, OP_UPSERT, notify_changes, record_changes
+    from app.db.session import engine
+
+    tag_cdf = tag_weights(profile, args.tags)
+    chunks = chunk_sizes(args.faqs, args.chunk_size)
+    started = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        index_ddl = await prepare_tables(engine, args.truncate, args.keep_indexes)
+        loop = asyncio.get_running_loop()
+        plans = [plan_chunk(profile, tag_cdf, args.seed, chunk, size) for chunk, size in enumerate(chunks)]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=args.workers * 2)
+        totals = [0, 0, 0]
+
+        async def produce() -> None:
+            faq_id, variant_id, link_id = 1, 1, 1
+            for chunk, size in enumerate(chunks):
+                future = loop.run_in_executor(
+                    executor, generate_chunk, profile_path, args.seed, chunk, size, faq_id, variant_id, link_id,
+                    args.tags, not args.no_render,
+                )
+                await queue.put(future)
+                faq_id += size
+                variant_id += plans[chunk][0]
+                link_id += plans[chunk][1]
+            for _ in range(args.connections):
+                await queue.put(None)
+
+        async def consume() -> None:
+            while (future := await queue.get()) is not None:
+                result = await future
+                async with engine.begin() as conn:
+                    await _copy(conn, "faqs", FAQ_COLUMNS, result["faqs"])
+                    await _copy(conn, "question_variants", VARIANT_COLUMNS, result["question_variants"])
+                    await _copy(conn, "faq_tags", FAQ_TAG_COLUMNS, result["faq_tags"])
+                for index, count in enumerate(result["counts"]):
+                    totals[index] += count
+                elapsed = time.perf_counter() - started
+                print(f"   ... {totals[0]:,} FAQs, {totals[1]:,} variants, {totals[2]:,} tag links "
+                      f"({totals[0] / elapsed:,.0f} FAQs/s)")
+
+        producer = asyncio.create_task(produce())
+        try:
+            async with engine.begin() as conn:
+                await _copy(conn, "tags", TAG_COLUMNS, tags_csv(profile, args.tags))
+            await asyncio.gather(*(consume() for _ in range(args.connections)))
+            await producer
+        except BaseException:
+            producer.cancel()
+            raise
+        finally:
+            # Also after a failed load: triggers must not stay disabled and indexes must come back
+            load_seconds = time.perf_counter() - started
+            print("▶ Recomputing counters, rebuilding indexes, analyzing...")
+            await finish_tables(engine, index_ddl, args.connections)
+        async with engine.begin() as conn:
+            await record_changes(conn, [(ENTITY_TAG, tag_id, OP_UPSERT) for tag_id in range(1, args.tags + 1)])
+        notify_changes()
+        print(f"\nLoaded {totals[0]:,} FAQs, {totals[1]:,} variants, {totals[2]:,} tag links in {load_seconds:.1f}s "
+              f"(total {time.perf_counter() - started:.1f}s)")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        await engine.dispose()
+
+
+def write_csv_dir(args, profile_path: str, profile: Dict[str, Any]) -> None:
+    """Generate into CSV files (no database); prints a digest of the output for determinism checks."""
+    out = Path(args.csv_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    tag_cdf = tag_weights(profile, args.tags)
+    chunks = chunk_sizes(args.faqs, args.chunk_size)
+    plans = [plan_chunk(profile, tag_cdf, args.seed, chunk, size) for chunk, size in enumerate(chunks)]
+    digest = hashlib.sha256(tags_csv(profile, args.tags))
+    (out / "tags.csv").write_bytes(tags_csv(profile, args.tags))
+    started = time.perf_counter()
+    totals = [0, 0, 0]
+    samples: Tuple[List[str], List[str]] = ([], [])
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures, faq_id, variant_id, link_id = [], 1, 1, 1
+        for chunk, size in enumerate(chunks):
+            futures.append(executor.submit(
+                generate_chunk, profile_path, args.seed, chunk, size, faq_id, variant_id, link_id,
+                args.tags, not args.no_render,
+            ))
+            faq_id += size
+            variant_id += plans[chunk][0]
+            link_id += plans[chunk][1]
+        files = {table: open(out / f"{table}.csv", "wb") for table in ("faqs", "question_variants", "faq_tags")}
+        try:
+            for future in futures:
+                result = future.result()
+                for table, handle in files.items():
+                    handle.write(result[table])
+                    digest.update(result[table])
+                for index, count in enumerate(result["counts"]):
+                    totals[index] += count
+                if result["sample"]:
+                    samples = result["sample"]
+        finally:
+            for handle in files.values():
+                handle.close()
+    elapsed = time.perf_counter() - started
+    print(f"\nGenerated {totals[0]:,} FAQs, {totals[1]:,} variants, {totals[2]:,} tag links in {elapsed:.1f}s "
+          f"({totals[0] / elapsed:,.0f} FAQs/s) -> {out}")
+    print(f"   question mix {script_mix(samples[0])} (export {profile['question_mix']})")
+    print(f"   answer mix   {script_mix(samples[1])} (export {profile['answer_mix']})")
+    print(f"   sha256 {digest.hexdigest()}")
+
+
+def chunk_sizes(total: int, chunk_size: int) -> List[int]:
+    return [min(chunk_size, total - start) for start in range(0, total, chunk_size)]
+
+
+def print_profile(profile: Dict[str, Any]) -> None:
+    def stats(values: List[int]) -> str:
+        array = np.asarray(values)
+        return f"mean {array.mean():.1f}, p50 {np.percentile(array, 50):.0f}, p95 {np.percentile(array, 95):.0f}, max {array.max()}"
+
+    print(f"Profile of {profile['source']} ({profile['rows']} rows)")
+    print(f"   variants per FAQ:      {stats(profile['variant_counts'])}")
+    print(f"   question words:        {stats(profile['question_word_counts'])}")
+    print(f"   answer lines:          {stats(profile['answer_line_counts'])}")
+    print(f"   usage frequency:       {stats(profile['usage_frequency'])}")
+    print(f"   tags: {len(profile['tag_names'])} (largest {profile['tag_sizes'][:5]}), "
+          f"untagged {profile['untagged_ratio']:.1%}, active {profile['active_ratio']:.1%}")
+    print(f"   vocabulary: {len(profile['question_words'])} question words, "
+          f"{len(profile['hangul_words'])} Hangul / {len(profile['latin_words'])} Latin answer words")
+    print(f"   script mix: questions {profile['question_mix']}, answers {profile['answer_mix']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default="docs/docs.csv", help="intent export to learn the shape from")
+    parser.add_argument("--faqs", type=int, default=1_000_000, help="FAQs to generate (default: 1,000,000)")
+    parser.add_argument("--tags", type=int, default=None, help="number of tags (default: as in the export)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"FAQs per chunk; part of the output's identity (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="generator processes")
+    parser.add_argument("--connections", type=int, default=4, help="parallel COPY connections (default: 4)")
+    parser.add_argument("--no-render", action="store_true",
+                        help="leave answer_html/answer_text empty (fill later with rerender_answers.py)")
+    parser.add_argument("--truncate", action="store_true", help="replace the existing catalog")
+    parser.add_argument("--keep-indexes", action="store_true", help="load with the secondary indexes in place")
+    parser.add_argument("--csv-dir", help="write CSV files here instead of loading the database")
+    parser.add_argument("--profile-only", action="store_true", help="print the learned profile and exit")
+    parser.add_argument("--profile-out", help="also write the learned profile as JSON")
+    args = parser.parse_args()
+    if settings.local_backend and not (args.csv_dir or args.profile_only):
+        parser.error("the COPY load needs Postgres; use --csv-dir with LOCAL_BACKEND=true")
+
+    print("=" * 60)
+    print("  Synthetic FAQ Catalog Generator")
+    print("=" * 60)
+    profile = learn_profile(args.csv)
+    print_profile(profile)
+    if args.profile_out:
+        Path(args.profile_out).write_text(json.dumps(profile, ensure_ascii=False))
+    if args.profile_only:
+        return
+    args.tags = args.tags or len(profile["tag_names"]) or 1
+
+    # Workers read the profile from a file instead of receiving it with every chunk
+    with tempfile.NamedTemporaryFile("w", suffix=".json", prefix="synth_profile_", delete=False, encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False)
+    profile_path = Path(f.name)
+    try:
+        print(f"\n▶ {args.faqs:,} FAQs, {args.tags} tags, seed {args.seed}, {args.workers} workers")
+        if args.csv_dir:
+            write_csv_dir(args, str(profile_path), profile)
+        else:
+            asyncio.run(load(args, str(profile_path), profile))
+    except Exception as e:
+        print(f"\nGeneration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        profile_path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Re-render stored answer markup after the renderer changes.
+
+Answers are compiled to HTML and plain text when they are written. Bumping
+RENDER_VERSION in app/utils/markup.py marks every stored rendering as stale;
+this script walks the FAQs in id order, re-renders the stale ones in batches
+(one transaction each, updated_at untouched) and logs the FAQs whose output
+actually changed to the change feed so mirrors and the static bundle follow.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.core.changes import ENTITY_FAQ, OP_UPSERT, notify_changes, record_changes
+from app.db.session import engine
+from app.utils.markup import RENDER_VERSION, render_answer
+
+DEFAULT_BATCH_SIZE = 500
+
+SELECT_BATCH_SQL = """
+    SELECT id, answer, answer_html, answer_text
+    FROM faqs
+    WHERE id > :after_id AND (:all OR answer_render_version < :version)
+    ORDER BY id
+    LIMIT :limit
+"""
+
+UPDATE_SQL = """
+    UPDATE faqs
+    SET answer_html = :answer_html, answer_text = :answer_text, answer_render_version = :version
+    WHERE id = :id
+"""
+
+
+async def rerender(args):
+    """Re-render stale answers batch by batch."""
+    started = time.perf_counter()
+    after_id, rendered, changed = 0, 0, 0
+    try:
+        while True:
+            async with engine.begin() as conn:
+                rows = (await conn.execute(
+                    text(SELECT_BATCH_SQL),
+                    {"after_id": after_id, "all": args.all, "version": RENDER_VERSION, "limit": args.batch_size},
+                )).all()
+                if not rows:
+                    break
+                updates, changed_ids = [], []
+                for faq_id, answer, old_html, old_text in rows:
+                    answer_html, answer_text = render_answer(answer)
+                    updates.append({
+                        "id": faq_id, "answer_html": answer_html, "answer_text": answer_text, "version": RENDER_VERSION,
+                    })
+                    if (answer_html, answer_text) != (old_html, old_text):
+                        changed_ids.append(faq_id)
+                if not args.dry_run:
+                    await conn.execute(text(UPDATE_SQL), updates)
+                    await record_changes(conn, [(ENTITY_FAQ, faq_id, OP_UPSERT) for faq_id in changed_ids])
+            if changed_ids and not args.dry_run:
+                notify_changes()
+            after_id = rows[-1].id
+            rendered += len(rows)
+            changed += len(changed_ids)
+            print(f"   ... {rendered} rendered, {changed} changed (last id {after_id})")
+
+        elapsed = time.perf_counter() - started
+        verb = "would change" if args.dry_run else "changed"
+        print(f"\nRendered {rendered} answers in {elapsed:.2f}s; {verb} {changed} (render version {RENDER_VERSION})")
+    except Exception as e:
+        print(f"\nRe-render failed (finished batches are kept): {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-render stored FAQ answer HTML/text")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help=f"Re-render every FAQ, not only those rendered before version {RENDER_VERSION}",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"FAQs per transaction (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count the answers whose rendering would change",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  FAQ Answer Re-render Script")
+    print("=" * 60)
+    asyncio.run(rerender(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Run the app against the local backend (SQLite + fakeredis) seeded from docs/docs.csv."""
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Settings are read when app modules are imported, so set them before any test imports the app
+os.environ["LOCAL_BACKEND"] = "true"
+os.environ["LOCAL_SQLITE_PATH"] = str(Path(tempfile.mkdtemp(prefix="faq-tests-")) / "local.db")
+os.environ["LOCAL_SEED_CSV"] = str(BACKEND_DIR / "docs" / "docs.csv")
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def client():
+    """HTTP client for the app with its lifespan (schema, seed, background tasks) running."""
+    from httpx import ASGITransport, AsyncClient
+
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield client
@@ -0,0 +1,29 @@
+"""Full catalog export over the server-side cursor."""
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app.api.export import EXPORT_BATCH_SIZE
+from app.db.session import engine
+from app.models.database import FAQ, QuestionVariant
+
+API = "/p/faq/apis"
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_ndjson_export_returns_every_faq(client):
+    async with engine.connect() as conn:
+        total_faqs = (await conn.execute(select(func.count(FAQ.id)))).scalar()
+        total_variants = (await conn.execute(select(func.count(QuestionVariant.id)))).scalar()
+    # The seeded catalog must span several cursor batches for this to cover batch boundaries
+    assert total_faqs > EXPORT_BATCH_SIZE
+
+    response = await client.get(f"{API}/faqs/export?format=ndjson")
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+
+    assert len(records) == total_faqs
+    assert len({record["id"] for record in records}) == total_faqs
+    assert sum(len(record["question_variants"]) for record in records) == total_variants
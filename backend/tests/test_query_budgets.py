@@ -0,0 +1,55 @@
+"""SQL statement budgets of the hot read endpoints.
+
+A budget that starts failing usually means a relationship is lazy-loaded per
+row (N+1) or a new query was added to the endpoint. Every endpoint also has
+to run each statement shape at most once.
+"""
+import pytest
+
+from app.core.request_stats import query_budget
+
+API = "/p/faq/apis"
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize(
+    ("path", "max_queries"),
+    [
+        # count + page + selectin tags
+        (f"{API}/faqs?page_size=100", 3),
+        (f"{API}/faqs?page_size=100&is_active=true&tag_ids=1,2", 3),
+        (f"{API}/faqs?page=2&search=%EB%B9%84%EB%B0%80%EB%B2%88%ED%98%B8", 3),
+        # count + page
+        (f"{API}/faqs?page_size=100&include=", 2),
+    ],
+)
+async def test_list_faqs(client, path, max_queries):
+    with query_budget(max_queries=max_queries, max_repeats=1) as stats:
+        response = await client.get(path)
+    assert response.status_code == 200
+    assert stats.db_count > 0
+
+
+@pytest.mark.parametrize(
+    ("query", "max_queries"),
+    [
+        # faq + selectin tags + selectin variants
+        ("", 3),
+        ("?include=tags", 2),
+        ("?include=", 1),
+    ],
+)
+async def test_get_faq(client, query, max_queries):
+    faq_id = (await client.get(f"{API}/faqs?page_size=1&include=")).json()["items"][0]["id"]
+    with query_budget(max_queries=max_queries, max_repeats=1):
+        response = await client.get(f"{API}/faqs/{faq_id}{query}")
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("path", [f"{API}/tags", f"{API}/tags?is_active=true"])
+async def test_list_tags(client, path):
+    with query_budget(max_queries=1):
+        response = await client.get(path)
+    assert response.status_code == 200
+    assert response.json()
@@ -1,5 +1,5 @@
 import axios from 'axios';
-const API_BASE_URL = '/p/faq/apis';
+export const API_BASE_URL = '/p/faq/apis';
 const api = axios.create({
     baseURL: API_BASE_URL,
     headers: {
@@ -14,7 +14,7 @@ import type {
   FaqFilters,
 } from '../types';
 
-const API_BASE_URL = '/p/faq/apis';
+export const API_BASE_URL = '/p/faq/apis';
 
 const api = axios.create({
   baseURL: API_BASE_URL,
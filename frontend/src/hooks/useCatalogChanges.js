@@ -0,0 +1,29 @@
+import { useEffect } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import { API_BASE_URL } from '../api/client';
+// 다른 편집자의 변경을 SSE로 받아 관련 쿼리를 무효화합니다 (폴링 불필요).
+// 연결이 끊기면 EventSource가 Last-Event-ID로 자동 재연결합니다.
+export const useCatalogChanges = () => {
+    const queryClient = useQueryClient();
+    useEffect(() => {
+        const source = new EventSource(`${API_BASE_URL}/changes/stream`, { withCredentials: true });
+        source.addEventListener('change', (event) => {
+            const change = JSON.parse(event.data);
+            if (change.entity === 'tag') {
+                queryClient.invalidateQueries({ queryKey: ['tags'] });
+                queryClient.invalidateQueries({ queryKey: ['tag', change.id] });
+                queryClient.invalidateQueries({ queryKey: ['faqs'] });
+            }
+            else {
+                queryClient.invalidateQueries({ queryKey: ['faqs'] });
+                queryClient.invalidateQueries({ queryKey: ['faq', change.id] });
+                queryClient.invalidateQueries({ queryKey: ['variants', change.id] });
+                queryClient.invalidateQueries({ queryKey: ['tags'] });
+            }
+        });
+        source.addEventListener('resync', () => {
+            queryClient.invalidateQueries();
+        });
+        return () => source.close();
+    }, [queryClient]);
+};
@@ -55,7 +55,9 @@ export const FAQDetailPage = () => {
     if (error || !faq) {
         return _jsx("div", { className: styles.error, children: "FAQ\uB97C \uCC3E\uC744 \uC218 \uC5C6\uC2B5\uB2C8\uB2E4." });
     }
-    return (_jsxs("div", { className: styles.container, children: [_jsxs("div", { className: styles.header, children: [_jsx("div", { children: _jsx("h2", { className: styles.title, children: faq.question }) }), _jsxs("div", { className: styles.actions, children: [_jsx(Button, { variant: "secondary", onClick: () => navigate('/faqs'), children: "\uBAA9\uB85D" }), _jsx(Button, { onClick: () => navigate(`/faqs/${id}/edit`), children: "\uC218\uC815" }), _jsx(Button, { variant: "danger", onClick: () => setShowDeleteModal(true), children: "\uC0AD\uC81C" })] })] }), _jsxs("div", { className: styles.content, children: [_jsxs("div", { className: styles.section, children: [_jsx("h3", { className: styles.sectionTitle, children: "\uAE30\uBCF8 \uC815\uBCF4" }), _jsxs("dl", { className: styles.infoList, children: [_jsx("dt", { children: "\uC0C1\uD0DC" }), _jsx("dd", { children: _jsx("span", { className: `${styles.status} ${faq.is_active ? styles.active : styles.inactive}`, children: faq.is_active ? '활성' : '비활성' }) }), _jsx("dt", { children: "\uD0DC\uADF8" }), _jsx("dd", { children: _jsx("div", { className: styles.tags, children: faq.tags.length > 0 ? (faq.tags.map((tag) => (_jsx(TagBadge, { name: tag.name, color: tag.color }, tag.id)))) : (_jsx("span", { className: styles.empty, children: "-" })) }) }), _jsx("dt", { children: "\uC791\uC131\uC790" }), _jsx("dd", { children: faq.created_by || '-' }), _jsx("dt", { children: "\uC0DD\uC131\uC77C" }), _jsx("dd", { children: new Date(faq.created_at).toLocaleString('ko-KR') }), _jsx("dt", { children: "\uC218\uC815\uC77C" }), _jsx("dd", { children: new Date(faq.updated_at).toLocaleString('ko-KR') })] })] }), _jsxs("div", { className: styles.section, children: [_jsx("h3", { className: styles.sectionTitle, children: "\uB2F5\uBCC0" }), _jsx("div", { className: styles.qaBlock, children: _jsx("div", { className: styles.qaItem, children: _jsx("p", { className: styles.answer, children: faq.answer }) }) })] }), _jsxs("div", { className: styles.section, children: [_jsxs("h3", { className: styles.sectionTitle, children: ["\uBCC0\uD615 \uC9C8\uBB38 (", faq.question_variants.length, ")"] }), _jsxs("div", { className: styles.variantInput, children: [_jsx("input", { type: "text", value: newVariant, onChange: (e) => setNewVariant(e.target.value), placeholder: "\uBCC0\uD615 \uC9C8\uBB38 \uCD94\uAC00", onKeyDown: (e) => {
+    return (_jsxs("div", { className: styles.container, children: [_jsxs("div", { className: styles.header, children: [_jsx("div", { children: _jsx("h2", { className: styles.title, children: faq.question }) }), _jsxs("div", { className: styles.actions, children: [_jsx(Button, { variant: "secondary", onClick: () => navigate('/faqs'), children: "\uBAA9\uB85D" }), _jsx(Button, { onClick: () => navigate(`/faqs/${id}/edit`), children: "\uC218\uC815" }), _jsx(Button, { variant: "danger", onClick: () => setShowDeleteModal(true), children: "\uC0AD\uC81C" })] })] }), _jsxs("div", { className: styles.content, children: [_jsxs("div", { className: styles.section, children: [_jsx("h3", { className: styles.sectionTitle, children: "\uAE30\uBCF8 \uC815\uBCF4" }), _jsxs("dl", { className: styles.infoList, children: [_jsx("dt", { children: "\uC0C1\uD0DC" }), _jsx("dd", { children: _jsx("span", { className: `${styles.status} ${faq.is_active ? styles.active : styles.inactive}`, children: faq.is_active ? '활성' : '비활성' }) }), _jsx("dt", { children: "\uD0DC\uADF8" }), _jsx("dd", { children: _jsx("div", { className: styles.tags, children: faq.tags.length > 0 ? (faq.tags.map((tag) => (_jsx(TagBadge, { name: tag.name, color: tag.color }, tag.id)))) : (_jsx("span", { className: styles.empty, children: "-" })) }) }), _jsx("dt", { children: "\uC791\uC131\uC790" }), _jsx("dd", { children: faq.created_by || '-' }), _jsx("dt", { children: "\uC0DD\uC131\uC77C" }), _jsx("dd", { children: new Date(faq.created_at).toLocaleString('ko-KR') }), _jsx("dt", { children: "\uC218\uC815\uC77C" }), _jsx("dd", { children: new Date(faq.updated_at).toLocaleString('ko-KR') })] })] }), _jsxs("div", { className: styles.section, children: [_jsx("h3", { className: styles.sectionTitle, children: "\uB2F5\uBCC0" }), _jsx("div", { className: styles.qaBlock, children: _jsx("div", { className: styles.qaItem, children: faq.answer_html ? (
+                                    // Sanitized by the backend renderer (app/utils/markup.py) at write time
+                                    _jsx("div", { className: styles.answerHtml, dangerouslySetInnerHTML: { __html: faq.answer_html } })) : (_jsx("p", { className: styles.answer, children: faq.answer })) }) })] }), _jsxs("div", { className: styles.section, children: [_jsxs("h3", { className: styles.sectionTitle, children: ["\uBCC0\uD615 \uC9C8\uBB38 (", faq.question_variants.length, ")"] }), _jsxs("div", { className: styles.variantInput, children: [_jsx("input", { type: "text", value: newVariant, onChange: (e) => setNewVariant(e.target.value), placeholder: "\uBCC0\uD615 \uC9C8\uBB38 \uCD94\uAC00", onKeyDown: (e) => {
                                             if (e.key === 'Enter') {
                                                 e.preventDefault();
                                                 handleAddVariant();
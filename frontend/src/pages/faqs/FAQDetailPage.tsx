@@ -114,7 +114,12 @@ export const FAQDetailPage: React.FC = () => {
           <h3 className={styles.sectionTitle}>답변</h3>
           <div className={styles.qaBlock}>
             <div className={styles.qaItem}>
-              <p className={styles.answer}>{faq.answer}</p>
+              {faq.answer_html ? (
+                // Sanitized by the backend renderer (app/utils/markup.py) at write time
+                <div className={styles.answerHtml} dangerouslySetInnerHTML={{ __html: faq.answer_html }} />
+              ) : (
+                <p className={styles.answer}>{faq.answer}</p>
+              )}
             </div>
           </div>
         </div>
@@ -3,6 +3,7 @@ import { useState } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { useFaqs, useDeleteFaq } from '../../hooks/useFaqs';
 import { useTags } from '../../hooks/useTags';
+import { useCatalogChanges } from '../../hooks/useCatalogChanges';
 import { Button, SearchInput, Pagination, TagBadge, ConfirmModal, MultiSelect } from '../../components/common';
 import styles from './FAQListPage.module.css';
 export const FAQListPage = () => {
@@ -21,6 +22,7 @@ export const FAQListPage = () => {
         is_active: selectedStatus,
     });
     const { data: tags } = useTags(true);
+    useCatalogChanges();
     const deleteFaq = useDeleteFaq();
     const handleSearch = () => {
         setSearchQuery(search);
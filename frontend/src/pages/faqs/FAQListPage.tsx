@@ -2,6 +2,7 @@ import React, { useState } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { useFaqs, useDeleteFaq } from '../../hooks/useFaqs';
 import { useTags } from '../../hooks/useTags';
+import { useCatalogChanges } from '../../hooks/useCatalogChanges';
 import { Button, SearchInput, Pagination, TagBadge, ConfirmModal, MultiSelect } from '../../components/common';
 import type { FaqListItem } from '../../types';
 import styles from './FAQListPage.module.css';
@@ -24,6 +25,7 @@ export const FAQListPage: React.FC = () => {
   });
 
   const { data: tags } = useTags(true);
+  useCatalogChanges();
   const deleteFaq = useDeleteFaq();
 
   const handleSearch = () => {
@@ -1,6 +1,7 @@
 import { jsx as _jsx, jsxs as _jsxs, Fragment as _Fragment } from "react/jsx-runtime";
 import { useState, useRef, useEffect } from 'react';
 import { useTags, useCreateTag, useUpdateTag, useDeleteTag } from '../../hooks/useTags';
+import { useCatalogChanges } from '../../hooks/useCatalogChanges';
 import { Button, Modal, ConfirmModal } from '../../components/common';
 import styles from './TagListPage.module.css';
 const defaultFormData = {
@@ -24,6 +25,7 @@ const colorPresets = [
 ];
 export const TagListPage = () => {
     const { data: tags, isLoading, error } = useTags();
+    useCatalogChanges();
     const createTag = useCreateTag();
     const updateTag = useUpdateTag();
     const deleteTag = useDeleteTag();
@@ -1,5 +1,6 @@
 import React, { useState, useRef, useEffect } from 'react';
 import { useTags, useCreateTag, useUpdateTag, useDeleteTag } from '../../hooks/useTags';
+import { useCatalogChanges } from '../../hooks/useCatalogChanges';
 import { Button, Modal, ConfirmModal } from '../../components/common';
 import type { Tag, TagCreate, TagUpdate } from '../../types';
 import styles from './TagListPage.module.css';
@@ -42,6 +43,7 @@ const colorPresets = [
 
 export const TagListPage: React.FC = () => {
   const { data: tags, isLoading, error } = useTags();
+  useCatalogChanges();
   const createTag = useCreateTag();
   const updateTag = useUpdateTag();
   const deleteTag = useDeleteTag();
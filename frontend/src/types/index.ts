@@ -6,6 +6,7 @@ export interface Tag {
   color: string | null;
   display_order: number;
   is_active: boolean;
+  faq_count: number;
   created_at: string;
   updated_at: string;
 }
@@ -44,6 +45,7 @@ export interface QuestionVariantCreate {
 export interface FaqListItem {
   id: number;
   question: string;
+  answer_text: string | null;
   usage_frequency: number;
   question_count: number;
   is_active: boolean;
@@ -54,6 +56,7 @@ export interface FaqListItem {
 
 export interface FaqDetail extends FaqListItem {
   answer: string;
+  answer_html: string | null;
   created_by: string | null;
   updated_by: string | null;
   question_variants: QuestionVariant[];